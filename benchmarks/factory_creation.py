@@ -0,0 +1,47 @@
+"""Compare per-call OrderFactory.create_order with the create_orders batch API.
+
+Run from the repository root:
+
+    python -m benchmarks.factory_creation --count 1000000
+"""
+import argparse
+import time
+
+from models.customer import Customer
+from patterns.order_factory import OrderFactory
+
+
+def per_call(order_type, customers):
+    return [OrderFactory.create_order(order_type, customer) for customer in customers]
+
+
+def batch(order_type, customers):
+    return OrderFactory.create_orders(order_type, customers)
+
+
+def timed(create, order_type, customers, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        create(order_type, customers)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    customers = [Customer(f"customer-{i}") for i in range(args.count)]
+    print(f"{args.count} creations, best of {args.repeat}")
+    for order_type in ("bulk", "Bulk"):
+        single = timed(per_call, order_type, customers, args.repeat)
+        batched = timed(batch, order_type, customers, args.repeat)
+        print(f"type={order_type!r:8} per-call {args.count / single:12,.0f}/s   "
+              f"batch {args.count / batched:12,.0f}/s   speedup {single / batched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
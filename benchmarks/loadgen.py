@@ -0,0 +1,320 @@
+"""Drive the full order stack with simulated customers and report sustained throughput.
+
+Run from the repository root:
+
+    python -m benchmarks.loadgen --orders 100000 --workers 8 --mode thread
+    python -m benchmarks.loadgen --rate 2000 --bulk-ratio 0.3 --storage log --dispatch async
+    python -m benchmarks.loadgen --mode process --workers 4 --output load.json
+
+Every order goes through Menu, OrderFactory, Order/BulkOrder, a subscribed
+KitchenObserver and the Database, as in main.py. With --rate, orders are
+scheduled at that arrival rate and latency is measured from each order's
+scheduled arrival, so falling behind the target shows up as queueing delay.
+Kitchen output goes to --kitchen-output (the null device by default).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from models.customer import Customer
+from models.dish import Dish
+from models.menu import Menu
+from notifier.kitchen_notifier import KitchenObserver
+from notifier.output_sink import KitchenOutputSink
+from patterns.database import Database
+from patterns.dispatcher import NotificationDispatcher
+from patterns.event_bus import EVENT_BUS
+from patterns.observer import OrderSubject
+from patterns.order_factory import OrderFactory
+from patterns.storage import LogStorage, MemoryStorage, SQLiteStorage
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+MODES = ("thread", "process", "asyncio")
+STORAGES = ("memory", "log", "sqlite")
+DISPATCHES = ("sync", "async")
+DISTRIBUTIONS = ("uniform", "geometric")
+MENU = [
+    ("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80),
+    ("Soup", 60), ("Steak", 320), ("Pasta", 140), ("Tea", 30),
+]
+
+
+class LoadConfig:
+    def __init__(self, orders: int = 10_000, workers: int = 4, mode: str = "thread", rate: float = 0.0,
+                 customers: int = 1_000, bulk_ratio: float = 0.2, dish_count=(1, 5),
+                 distribution: str = "uniform", storage: str = "memory", path: str = None,
+                 dispatch: str = "sync", kitchen_output: str = os.devnull, seed: int = 0):
+        if orders < 1 or workers < 1 or customers < 1:
+            raise ValueError("orders, workers and customers must be positive")
+        if mode not in MODES:
+            raise ValueError(f"Unknown concurrency mode: {mode!r}")
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown storage: {storage!r}")
+        if dispatch not in DISPATCHES:
+            raise ValueError(f"Unknown dispatch mode: {dispatch!r}")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown dish count distribution: {distribution!r}")
+        if not 0 <= bulk_ratio <= 1:
+            raise ValueError("bulk_ratio must be between 0 and 1")
+        low, high = dish_count
+        if not 1 <= low <= high:
+            raise ValueError("dish_count must be a (min, max) pair with 1 <= min <= max")
+        self.orders = orders
+        self.workers = workers
+        self.mode = mode
+        self.rate = rate
+        self.customers = customers
+        self.bulk_ratio = bulk_ratio
+        self.dish_count = (low, high)
+        self.distribution = distribution
+        self.storage = storage
+        self.path = path
+        self.dispatch = dispatch
+        self.kitchen_output = kitchen_output
+        self.seed = seed
+
+
+def order_specs(config: LoadConfig, worker: int):
+    """Yield (index, customer name, order type, dish positions) for every order this worker places."""
+    rng = random.Random(config.seed * 1_000_003 + worker)
+    low, high = config.dish_count
+    for index in range(worker, config.orders, config.workers):
+        if config.distribution == "uniform":
+            count = rng.randint(low, high)
+        else:
+            count = low
+            while count < high and rng.random() < 0.5:
+                count += 1
+        kind = "bulk" if rng.random() < config.bulk_ratio else "standard"
+        dishes = [rng.randrange(len(MENU)) for _ in range(count)]
+        yield index, f"customer-{rng.randrange(config.customers)}", kind, dishes
+
+
+def build_menu() -> Menu:
+    menu = Menu()
+    for name, price in MENU:
+        menu.add_dish(Dish.intern(name, price))
+    return menu
+
+
+def place_order(db: Database, dishes, customer: str, kind: str, picks):
+    order = OrderFactory.create_order(kind, Customer(customer))
+    if kind == "bulk":
+        order.add_dishes(dishes[pick] for pick in picks)
+    else:
+        for pick in picks:
+            order.add_dish(dishes[pick])
+    order.calculate_total()
+    db.add_order(order)
+
+
+class _Stack:
+    """The Database, kitchen observer and dispatcher shared by the workers of one process."""
+
+    def __init__(self, config: LoadConfig, directory: str, name: str):
+        self._previous = Database._instance, OrderSubject._default_dispatcher
+        Database._instance = None
+        self.db = Database(_storage(config, directory, name))
+        self.output = open(config.kitchen_output, "a")
+        self.kitchen = KitchenObserver(KitchenOutputSink(self.output, buffer_size=1 << 16))
+        self.subscription = EVENT_BUS.subscribe(self.kitchen)
+        self.dispatcher = NotificationDispatcher() if config.dispatch == "async" else None
+        OrderSubject.use_dispatcher(self.dispatcher)
+        self.dishes = build_menu().list_dishes()
+
+    def close(self) -> int:
+        self.db.flush()
+        stored = len(self.db.storage)
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        EVENT_BUS.unsubscribe(self.subscription)
+        self.kitchen.flush()
+        self.output.close()
+        self.db.close()
+        Database._instance, dispatcher = self._previous
+        OrderSubject.use_dispatcher(dispatcher)
+        return stored
+
+
+def _storage(config, directory, name):
+    if config.storage == "log":
+        return LogStorage(os.path.join(directory, f"{name}.log"))
+    if config.storage == "sqlite":
+        return SQLiteStorage(os.path.join(directory, f"{name}.sqlite"))
+    return MemoryStorage()
+
+
+def _run_worker(config, stack, worker, start):
+    latencies = []
+    clock = time.time
+    for index, customer, kind, picks in order_specs(config, worker):
+        arrival = start + index / config.rate if config.rate else clock()
+        delay = arrival - clock()
+        if delay > 0:
+            time.sleep(delay)
+        place_order(stack.db, stack.dishes, customer, kind, picks)
+        latencies.append(clock() - arrival)
+    return latencies
+
+
+async def _run_task(config, stack, worker, start):
+    latencies = []
+    clock = time.time
+    for index, customer, kind, picks in order_specs(config, worker):
+        if config.rate:
+            arrival = start + index / config.rate
+            delay = arrival - clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            # Yield so the other simulated customers interleave with this one.
+            await asyncio.sleep(0)
+            arrival = clock()
+        place_order(stack.db, stack.dishes, customer, kind, picks)
+        latencies.append(clock() - arrival)
+    return latencies
+
+
+def _run_process(config, directory, worker, start):
+    # A forked worker inherits the parent's subscriptions; it only feeds its own kitchen.
+    EVENT_BUS.clear()
+    baseline = _peak_rss_kib()
+    stack = _Stack(config, directory, f"orders-{worker}")
+    latencies = _run_worker(config, stack, worker, start)
+    stored = stack.close()
+    return latencies, stored, _growth(baseline, _peak_rss_kib())
+
+
+def run_load(config: LoadConfig) -> dict:
+    directory = config.path or tempfile.mkdtemp(prefix="loadgen-")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        baseline = _peak_rss_kib()
+        started = time.perf_counter()
+        start = time.time() + 0.01
+        if config.mode == "process":
+            with ProcessPoolExecutor(config.workers) as pool:
+                futures = [pool.submit(_run_process, config, directory, worker, start)
+                           for worker in range(config.workers)]
+                results = [future.result() for future in futures]
+            latencies = [latency for result in results for latency in result[0]]
+            stored = sum(result[1] for result in results)
+            growths = [result[2] for result in results]
+            memory = None if None in growths else sum(growths)
+        else:
+            stack = _Stack(config, directory, "orders")
+            try:
+                if config.mode == "thread":
+                    with ThreadPoolExecutor(config.workers) as pool:
+                        futures = [pool.submit(_run_worker, config, stack, worker, start)
+                                   for worker in range(config.workers)]
+                        latencies = [latency for future in futures for latency in future.result()]
+                else:
+                    latencies = asyncio.run(_gather(config, stack, start))
+            finally:
+                stored = stack.close()
+            memory = _growth(baseline, _peak_rss_kib())
+        elapsed = time.perf_counter() - started
+    finally:
+        if config.path is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    latencies.sort()
+    return {
+        "mode": config.mode,
+        "workers": config.workers,
+        "storage": config.storage,
+        "dispatch": config.dispatch,
+        "orders": len(latencies),
+        "stored": stored,
+        "target_rate": config.rate,
+        "elapsed": elapsed,
+        "orders_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.50) * 1000,
+            "p90": _percentile(latencies, 0.90) * 1000,
+            "p99": _percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+        "peak_rss_growth_kib": memory,
+    }
+
+
+async def _gather(config, stack, start):
+    results = await asyncio.gather(*(_run_task(config, stack, worker, start) for worker in range(config.workers)))
+    return [latency for result in results for latency in result]
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _peak_rss_kib():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _growth(before, after):
+    return None if before is None or after is None else after - before
+
+
+def format_report(report: dict) -> str:
+    latency = report["latency_ms"]
+    memory = report["peak_rss_growth_kib"]
+    return "\n".join([
+        f"mode {report['mode']} x{report['workers']}, storage {report['storage']}, dispatch {report['dispatch']}",
+        f"orders   {report['orders']:,} placed, {report['stored']:,} stored in {report['elapsed']:.2f}s",
+        f"rate     {report['orders_per_sec']:,.0f} orders/s (target {report['target_rate'] or 'unlimited'})",
+        f"latency  p50 {latency['p50']:.3f} ms  p90 {latency['p90']:.3f} ms  "
+        f"p99 {latency['p99']:.3f} ms  max {latency['max']:.3f} ms",
+        f"memory   peak RSS growth {'n/a' if memory is None else f'{memory:,} KiB'}",
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=MODES, default="thread")
+    parser.add_argument("--rate", type=float, default=0.0, help="target arrivals per second (default: unlimited)")
+    parser.add_argument("--customers", type=int, default=1_000, help="number of distinct customers")
+    parser.add_argument("--bulk-ratio", type=float, default=0.2, help="share of bulk orders")
+    parser.add_argument("--dish-count", type=int, nargs=2, default=[1, 5], metavar=("MIN", "MAX"))
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform",
+                        help="how the number of dishes per order is drawn between MIN and MAX")
+    parser.add_argument("--storage", choices=STORAGES, default="memory")
+    parser.add_argument("--path", help="directory for log/sqlite storage (default: a temporary directory)")
+    parser.add_argument("--dispatch", choices=DISPATCHES, default="sync",
+                        help="deliver kitchen notifications inline or through a NotificationDispatcher")
+    parser.add_argument("--kitchen-output", default=os.devnull, help="file that receives kitchen output")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(args.orders, args.workers, args.mode, args.rate, args.customers, args.bulk_ratio,
+                        tuple(args.dish_count), args.distribution, args.storage, args.path, args.dispatch,
+                        args.kitchen_output, args.seed)
+    report = run_load(config)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
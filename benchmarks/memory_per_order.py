@@ -0,0 +1,91 @@
+"""Compare bytes per retained order for the dict-backed and slotted models.
+
+Run from the repository root:
+
+    python -m benchmarks.memory_per_order --orders 100000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+
+MENU = [("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80)]
+
+
+class LegacyDish:
+    """Dish as it was before __slots__: a plain dict-backed object."""
+
+    def __init__(self, name, price):
+        self.name = name
+        self.price = price
+
+
+class LegacyCustomer:
+    def __init__(self, name):
+        self.name = name
+
+
+class LegacyOrder:
+    """Order as it was before __slots__, with an eagerly allocated observer list."""
+
+    def __init__(self, customer):
+        self._observers = []
+        self.customer = customer
+        self.dishes = []
+        self._subtotal = 0
+
+    def add_dish(self, dish):
+        self.dishes.append(dish)
+        self._subtotal += dish.price
+
+
+def build_legacy(count, dishes_per_order):
+    orders = []
+    for i in range(count):
+        order = LegacyOrder(LegacyCustomer(f"customer-{i}"))
+        for j in range(dishes_per_order):
+            order.add_dish(LegacyDish(*MENU[j % len(MENU)]))
+        orders.append(order)
+    return orders
+
+
+def build_slotted(count, dishes_per_order):
+    orders = []
+    for i in range(count):
+        order = Order(Customer(f"customer-{i}"))
+        for j in range(dishes_per_order):
+            order.add_dish(Dish.intern(*MENU[j % len(MENU)]))
+        orders.append(order)
+    return orders
+
+
+def bytes_per_order(build, count, dishes_per_order):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    orders = build(count, dishes_per_order)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del orders
+    return (after - before) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--dishes", type=int, default=3, help="dishes per order")
+    args = parser.parse_args(argv)
+
+    legacy = bytes_per_order(build_legacy, args.orders, args.dishes)
+    slotted = bytes_per_order(build_slotted, args.orders, args.dishes)
+    print(f"{args.orders} orders x {args.dishes} dishes")
+    print(f"dict-backed, fresh dishes:  {legacy:8.1f} bytes/order")
+    print(f"slotted, interned dishes:   {slotted:8.1f} bytes/order")
+    print(f"saving:                     {100 * (1 - slotted / legacy):7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
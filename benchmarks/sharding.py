@@ -0,0 +1,99 @@
+"""Measure how write throughput scales with the number of Database shards.
+
+Run from the repository root:
+
+    python -m benchmarks.sharding --orders 200000 --shards 1 2 4 8
+    python -m benchmarks.sharding --storage log
+
+Each run adds the same pre-built orders through a ShardedDatabase and waits
+for every shard to flush them; the in-process Database is the baseline. The
+coordinator rate is how fast add_orders itself returned, which bounds the
+sharded throughput however many cores the shards get.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+from patterns.sharding import ShardedDatabase
+from patterns.storage import LogStorage
+
+DISHES = [("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80)]
+
+
+class LogStorageFactory:
+    """Picklable factory giving every shard its own log file in `directory`."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, shard: int) -> LogStorage:
+        return LogStorage(os.path.join(self.directory, f"shard-{shard}.log"), group_size=512)
+
+
+def build_orders(count: int) -> list[Order]:
+    dishes = [Dish.intern(name, price) for name, price in DISHES]
+    orders = []
+    for i in range(count):
+        order = (BulkOrder if i % 4 == 0 else Order)(Customer(f"customer-{i % 10_000}"))
+        order.add_dishes(dishes[:1 + i % len(dishes)])
+        orders.append(order)
+    return orders
+
+
+def single_process(orders, storage) -> float:
+    previous = Database._instance
+    Database._instance = None
+    try:
+        db = Database(storage)
+        started = time.perf_counter()
+        db.add_orders(orders)
+        db.flush()
+        return time.perf_counter() - started
+    finally:
+        Database._instance = previous
+
+
+def sharded(orders, shards, storage_factory, batch_size) -> tuple[float, float]:
+    """Seconds until add_orders returned, and until every shard had flushed."""
+    with ShardedDatabase(shards, storage_factory, batch_size) as db:
+        started = time.perf_counter()
+        db.add_orders(orders)
+        added = time.perf_counter() - started
+        db.flush()
+        elapsed = time.perf_counter() - started
+        assert db.count() == len(orders)
+    return added, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--storage", choices=("memory", "log"), default="memory")
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args(argv)
+
+    orders = build_orders(args.orders)
+    with tempfile.TemporaryDirectory() as directory:
+        def factory(run):
+            # Every run writes fresh logs; reopening an earlier run's would recover its orders.
+            return LogStorageFactory(os.path.join(directory, run)) if args.storage == "log" else None
+
+        baseline_factory = factory("in-process")
+        baseline = single_process(orders, baseline_factory(0) if baseline_factory else None)
+        print(f"{'in-process':>10} {args.orders / baseline:>12,.0f} orders/s")
+        for shards in args.shards:
+            added, elapsed = sharded(orders, shards, factory(f"{shards}-shards"), args.batch_size)
+            print(f"{shards:>4} shards {args.orders / elapsed:>12,.0f} orders/s  {baseline / elapsed:>5.2f}x in-process"
+                  f"  (coordinator {args.orders / added:,.0f} orders/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Micro and macro benchmarks for the order pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.15
+
+Each case is run at every size (10 up to 1M items by default) and reports
+ops/sec, p50/p99 latency per operation and peak traced memory. With
+--baseline the run exits with status 1 if any case got slower than the
+threshold allows.
+"""
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from models.customer import Customer
+from models.dish import Dish
+from models.menu import Menu
+from models.order import Order
+from notifier.kitchen_notifier import KitchenObserver
+from notifier.output_sink import KitchenOutputSink
+from patterns.database import Database
+from patterns.event_bus import EventBus
+from patterns.observer import KitchenNotifier
+from patterns.order_factory import OrderFactory
+
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+# Upper bound on the work one timed pass does, in items touched, so that
+# operations which are O(size) per call do not run for hours at 1M.
+WORK_BUDGET = 2_000_000
+SAMPLE_OPS = 10_000
+
+CASES = {}
+
+
+def case(name):
+    def register(build):
+        CASES[name] = build
+        return build
+    return register
+
+
+def _fresh_database() -> Database:
+    Database._instance = None
+    return Database.get_instance()
+
+
+def _dishes(size):
+    return [Dish(f"dish-{i}", 1 + i % 100) for i in range(size)]
+
+
+def _sample(cost_per_op):
+    return max(1, min(SAMPLE_OPS, WORK_BUDGET // max(cost_per_op, 1)))
+
+
+class NullNotifier(KitchenNotifier):
+    def notify(self, order):
+        pass
+
+    def notify_added(self, order, items):
+        pass
+
+
+@case("order.add_dish")
+def bench_add_dish(size):
+    order = Order(Customer("bench"))
+    dishes = iter(_dishes(size))
+    return lambda: order.add_dish(next(dishes)), size
+
+
+@case("order.calculate_total")
+def bench_calculate_total(size):
+    order = Order(Customer("bench"))
+    for dish in _dishes(size):
+        order.add_dish(dish)
+    return order.calculate_total, SAMPLE_OPS
+
+
+@case("menu.contains_dish")
+def bench_contains_dish(size):
+    menu = Menu()
+    dishes = _dishes(size)
+    menu.add_dishes(dishes)
+    probes = [Dish(dishes[i * 7919 % size].name, dishes[i * 7919 % size].price) for i in range(min(size, 1024))]
+    counter = iter(range(1 << 62))
+    return lambda: menu.contains_dish(probes[next(counter) % len(probes)]), SAMPLE_OPS
+
+
+@case("subject.notify_all")
+def bench_notify_all(size):
+    order = Order(Customer("bench"))
+    for _ in range(size):
+        order.attach(NullNotifier())
+    added = ((Dish("Pizza", 150), 1),)
+    return lambda: order.notify_all(order, added), _sample(size)
+
+
+@case("bus.publish")
+def bench_bus_publish(size):
+    """One subscriber per customer; each publish reaches only its customer's subscriber."""
+    bus = EventBus()
+    notifiers = [NullNotifier() for _ in range(size)]
+    for i, notifier in enumerate(notifiers):
+        bus.subscribe(notifier, customer=f"customer-{i}")
+    order = Order(Customer("customer-0"))
+    added = ((Dish("Pizza", 150), 1),)
+
+    def publish():
+        bus.publish(order, added)
+
+    publish.notifiers = notifiers  # the bus only holds weak references
+    return publish, SAMPLE_OPS
+
+
+@case("database.add_order")
+def bench_add_order(size):
+    db = _fresh_database()
+    orders = iter([Order(Customer(f"customer-{i % 1000}")) for i in range(size)])
+    return lambda: db.add_order(next(orders)), size
+
+
+@case("database.list_orders")
+def bench_list_orders(size):
+    db = _fresh_database()
+    db.add_orders(Order(Customer(f"customer-{i % 1000}")) for i in range(size))
+    db.flush()
+    return db.list_orders, _sample(size)
+
+
+@case("e2e.main_flow")
+def bench_main_flow(size):
+    """Replays the main.py flow: menu lookup, order entry with a kitchen observer, storage, report."""
+    menu = Menu()
+    for name, price in [("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80)]:
+        menu.add_dish(Dish.intern(name, price))
+    kitchen = KitchenObserver(KitchenOutputSink(io.StringIO(), buffer_size=1 << 16))
+    db = _fresh_database()
+    counter = iter(range(size))
+
+    def one_order():
+        i = next(counter)
+        bulk = i % 2
+        order = OrderFactory.create_order("bulk" if bulk else "standard", Customer(f"customer-{i}"))
+        order.attach(kitchen)
+        if bulk:
+            order.add_dishes([Dish.intern("Burger", 120), Dish.intern("Salad", 80), Dish.intern("Pizza", 150)])
+        else:
+            pizza = Dish.intern("Pizza", 150)
+            if menu.contains_dish(pizza):
+                order.add_dish(pizza)
+            order.add_dish(Dish.intern("Sushi", 200))
+        order.calculate_total()
+        db.add_order(order)
+
+    return one_order, size
+
+
+def run_case(build, size, measure_memory=True):
+    gc.collect()
+    operation, ops = build(size)
+    latencies = []
+    clock = time.perf_counter_ns
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(ops):
+            started = clock()
+            operation()
+            latencies.append(clock() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    latencies.sort()
+    total = sum(latencies) or 1
+    result = {
+        "ops": ops,
+        "ops_per_sec": ops * 1e9 / total,
+        "p50_ns": latencies[len(latencies) // 2],
+        "p99_ns": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+    if measure_memory:
+        del operation
+        gc.collect()
+        tracemalloc.start()
+        operation, ops = build(size)
+        for _ in range(ops):
+            operation()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_suite(case_names=None, sizes=DEFAULT_SIZES, measure_memory=True, log=None):
+    results = {}
+    for name in case_names or CASES:
+        results[name] = {}
+        for size in sizes:
+            result = run_case(CASES[name], size, measure_memory)
+            results[name][str(size)] = result
+            if log is not None:
+                log(format_result(name, size, result))
+    Database._instance = None
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every case/size whose throughput fell more than `threshold` below the baseline."""
+    regressions = []
+    for name, sizes in current["results"].items():
+        for size, result in sizes.items():
+            before = baseline.get("results", {}).get(name, {}).get(size)
+            if before is None:
+                continue
+            if result["ops_per_sec"] < before["ops_per_sec"] * (1 - threshold):
+                change = result["ops_per_sec"] / before["ops_per_sec"] - 1
+                regressions.append(
+                    f"{name} @ {size}: {before['ops_per_sec']:,.0f} -> {result['ops_per_sec']:,.0f} ops/s ({change:+.1%})"
+                )
+    return regressions
+
+
+def format_result(name, size, result) -> str:
+    line = (f"{name:24} {size:>9} {result['ops_per_sec']:>14,.0f} ops/s  "
+            f"p50 {result['p50_ns']:>10,} ns  p99 {result['p99_ns']:>10,} ns")
+    if "peak_bytes" in result:
+        line += f"  peak {result['peak_bytes'] / 1024:>10,.0f} KiB"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative throughput drop before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.cases, args.sizes, not args.no_memory, log=print)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(report, json.load(baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,29 @@
 from models.customer import Customer
 from models.order import Order
+from patterns.pricing import PRICING, OrderTypeDiscount
 
 
 class BulkOrder(Order):
+    __slots__ = ("_discount_percentage",)
+
     def __init__(self, customer: Customer):
         super().__init__(customer)
         self.discount_percentage = 10
 
-    def calculate_total(self) -> float:
-        base_total = sum(dish.price for dish in self.dishes)
-        discount = base_total * (self.discount_percentage / 100)
-        return base_total - discount
+    @property
+    def discount_percentage(self) -> float:
+        return self._discount_percentage
+
+    @discount_percentage.setter
+    def discount_percentage(self, value: float):
+        self._discount_percentage = value
+        self._version += 1
+        self._subtotal_changed()
 
     def __repr__(self):
-        return f"BulkOrder(customer={self.customer}, dishes={self.dishes}, discount={self.discount_percentage}%)"
+        return f"BulkOrder(customer={self.customer}, items=[{self._items_repr()}], discount={self.discount_percentage}%)"
+
+
+# The bulk discount is the default pricing rule: each bulk order's own discount_percentage.
+BULK_DISCOUNT = OrderTypeDiscount(BulkOrder)
+PRICING.add_rule(BULK_DISCOUNT)
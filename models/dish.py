@@ -1,10 +1,37 @@
+import weakref
+
+
 class Dish:
+    __slots__ = ("_name", "_price", "__weakref__")
+
+    _pool = weakref.WeakValueDictionary()
+
+    @classmethod
+    def intern(cls, name: str, price: float) -> "Dish":
+        """Return the shared instance for (name, price), creating it on first use."""
+        key = (name, price)
+        dish = cls._pool.get(key)
+        if dish is None:
+            dish = cls._pool[key] = cls(name, price)
+        return dish
+
     def __init__(self, name: str, price: float):
-        self.name = name
-        self.price = price
+        self._name = name
+        self._price = price
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def price(self) -> float:
+        return self._price
 
     def __eq__(self, other):
         return isinstance(other, Dish) and self.name == other.name and self.price == other.price
 
+    def __hash__(self):
+        return hash((self._name, self._price))
+
     def __repr__(self):
         return f"Dish(name={self.name!r}, price={self.price})"
@@ -1,17 +1,126 @@
-from typing import List
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Iterable
 
 from .dish import Dish
 
 
+class MenuSnapshot(Sequence):
+    """Immutable version of a menu; shared by every reader until the menu changes."""
+
+    __slots__ = ("version", "_dishes", "_index", "_by_name", "_prices", "_by_price")
+
+    def __init__(self, version: int, dishes: Iterable[Dish]):
+        self.version = version
+        self._dishes = tuple(dishes)
+        self._index = frozenset(self._dishes)
+        by_name = {}
+        for dish in self._dishes:
+            by_name.setdefault(dish.name, []).append(dish)
+        self._by_name = {name: tuple(found) for name, found in by_name.items()}
+        # Sorting is stable, so dishes with equal prices keep their menu order.
+        self._by_price = tuple(sorted(self._dishes, key=lambda dish: dish.price))
+        self._prices = tuple(dish.price for dish in self._by_price)
+
+    def __len__(self) -> int:
+        return len(self._dishes)
+
+    def __getitem__(self, index):
+        return self._dishes[index]
+
+    def __iter__(self):
+        return iter(self._dishes)
+
+    def __contains__(self, dish) -> bool:
+        return self.contains_dish(dish)
+
+    def __eq__(self, other):
+        if isinstance(other, MenuSnapshot):
+            return self._dishes == other._dishes
+        if isinstance(other, (list, tuple)):
+            return list(self._dishes) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"MenuSnapshot(version={self.version}, dishes={list(self._dishes)})"
+
+    def contains_dish(self, dish: Dish) -> bool:
+        return isinstance(dish, Dish) and dish in self._index
+
+    def find_by_name(self, name: str) -> list[Dish]:
+        return list(self._by_name.get(name, ()))
+
+    def dishes_in_price_range(self, low: float, high: float) -> list[Dish]:
+        start = bisect.bisect_left(self._prices, low)
+        end = bisect.bisect_right(self._prices, high)
+        return list(self._by_price[start:end])
+
+    def cheapest(self, n: int) -> list[Dish]:
+        return list(self._by_price[:max(n, 0)])
+
+
 class Menu:
+    """A menu published as immutable, versioned MenuSnapshots.
+
+    Reads go to the current snapshot without copying. Every change builds a
+    new snapshot with the next version and swaps it in atomically, so readers
+    holding an older snapshot keep a consistent view.
+    """
+
     def __init__(self):
-        self._dishes: List[Dish] = []
+        self._snapshot = MenuSnapshot(0, ())
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> MenuSnapshot:
+        return self._snapshot
 
     def add_dish(self, dish: Dish):
-        self._dishes.append(dish)
+        self.add_dishes((dish,))
+
+    def add_dishes(self, dishes: Iterable[Dish]):
+        with self._lock:
+            self._publish(self._snapshot._dishes + tuple(dishes))
+
+    def remove_dish(self, dish: Dish):
+        with self._lock:
+            dishes = list(self._snapshot._dishes)
+            if dish not in self._snapshot._index:
+                raise ValueError(f"{dish!r} is not on the menu")
+            dishes.remove(dish)
+            self._publish(dishes)
+
+    def reprice(self, dish: Dish, price: float) -> Dish:
+        """Replace `dish` with the same dish at `price`; orders keep the dishes they were priced with."""
+        repriced = Dish.intern(dish.name, price)
+        with self._lock:
+            dishes = list(self._snapshot._dishes)
+            if dish not in self._snapshot._index:
+                raise ValueError(f"{dish!r} is not on the menu")
+            dishes[dishes.index(dish)] = repriced
+            self._publish(dishes)
+        return repriced
 
     def contains_dish(self, dish: Dish) -> bool:
-        return dish in self._dishes
+        return self._snapshot.contains_dish(dish)
+
+    def find_by_name(self, name: str) -> list[Dish]:
+        return self._snapshot.find_by_name(name)
+
+    def dishes_in_price_range(self, low: float, high: float) -> list[Dish]:
+        return self._snapshot.dishes_in_price_range(low, high)
+
+    def cheapest(self, n: int) -> list[Dish]:
+        return self._snapshot.cheapest(n)
+
+    def list_dishes(self) -> MenuSnapshot:
+        return self._snapshot
 
-    def list_dishes(self) -> list[Dish]:
-        return list(self._dishes)
+    def _publish(self, dishes):
+        self._snapshot = MenuSnapshot(self._snapshot.version + 1, dishes)
@@ -1,20 +1,186 @@
+import math
+from collections.abc import Sequence
+from itertools import repeat
+from time import perf_counter
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from patterns.metrics import METRICS
 from patterns.observer import OrderSubject
+from patterns.pricing import PRICING, CompiledRules
 from .customer import Customer
 from .dish import Dish
 
 
+class DishesView(Sequence):
+    """Read-only, lazily expanded view of an order's dishes, one entry per unit."""
+
+    __slots__ = ("_order",)
+
+    def __init__(self, order: "Order"):
+        self._order = order
+
+    def __len__(self) -> int:
+        return self._order._units
+
+    def __iter__(self):
+        for dish, quantity in self._order._items.items():
+            yield from repeat(dish, quantity)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        units = len(self)
+        if index < 0:
+            index += units
+        if not 0 <= index < units:
+            raise IndexError("dish index out of range")
+        for dish, quantity in self._order._items.items():
+            if index < quantity:
+                return dish
+            index -= quantity
+
+    def __eq__(self, other):
+        if not isinstance(other, (DishesView, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class Order(OrderSubject):
+    __slots__ = ("customer", "menu_version", "_items", "_units", "_subtotal", "_version", "_total", "_priced_rules")
+
+    # When enabled, every calculate_total() call cross-checks the running
+    # subtotal against a full recompute over the line items.
+    verify_totals = False
+
     def __init__(self, customer: Customer):
         super().__init__()
         self.customer = customer
-        self.dishes: list[Dish] = []
+        # Version of the Menu the order was priced against, when known.
+        self.menu_version = None
+        self._items: dict[Dish, int] = {}
+        self._units = 0
+        self._subtotal = 0
+        self._version = 0
+        # The order is priced with the rules active when it was placed or last
+        # changed, so later rule changes (or a happy hour ending) never reprice it.
+        self._total = None
+        self._priced_rules = PRICING.compiled()
+
+    @property
+    def pricing_rules(self) -> CompiledRules:
+        """The compiled pricing rules this order's total comes from."""
+        return self._priced_rules
+
+    @property
+    def dishes(self) -> DishesView:
+        return DishesView(self)
 
-    def add_dish(self, dish: Dish):
-        self.dishes.append(dish)
-        self.notify_all(self)
+    @property
+    def line_items(self) -> list[tuple[Dish, int]]:
+        return list(self._items.items())
+
+    @property
+    def quantities(self) -> Mapping[Dish, int]:
+        """Read-only dish -> quantity mapping of the line items, without copying."""
+        return MappingProxyType(self._items)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every change to the order's contents, for cache invalidation."""
+        return self._version
+
+    @property
+    def subtotal(self) -> float:
+        return self._subtotal
+
+    def quantity_of(self, dish: Dish) -> int:
+        return self._items.get(dish, 0)
+
+    def add_dish(self, dish: Dish, qty: int = 1):
+        started = METRICS.enabled and perf_counter()
+        self._add(dish, qty)
+        self._subtotal_changed()
+        self.notify_all(self, ((dish, qty),))
+        if started:
+            METRICS.observe("order.add_dish", started)
+
+    def add_dishes(self, dishes: Iterable[Dish]):
+        added = {}
+        for dish in dishes:
+            added[dish] = added.get(dish, 0) + 1
+        if not added:
+            return
+        for dish, qty in added.items():
+            self._add(dish, qty)
+        self._subtotal_changed()
+        self.notify_all(self, tuple(added.items()))
+
+    def restore_items(self, items: Iterable[tuple[Dish, int]]):
+        """Add line items without notifying observers, for orders rebuilt from storage."""
+        for dish, qty in items:
+            self._add(dish, qty)
+        self._subtotal_changed()
+
+    def remove_dish(self, dish: Dish, qty: int = 1):
+        self._check_quantity(qty)
+        current = self._items.get(dish, 0)
+        if current < qty:
+            raise ValueError(f"Order has {current} of {dish!r}, cannot remove {qty}")
+        if current == qty:
+            del self._items[dish]
+        else:
+            self._items[dish] = current - qty
+        self._units -= qty
+        self._subtotal = self._subtotal - dish.price * qty if self._items else 0
+        self._version += 1
+        self._subtotal_changed()
 
     def calculate_total(self) -> float:
-        return sum(dish.price for dish in self.dishes)
+        started = METRICS.enabled and perf_counter()
+        total = self._running_total()
+        if Order.verify_totals:
+            self._verify_total(total)
+        if started:
+            METRICS.observe("order.calculate_total", started)
+        return total
+
+    def _add(self, dish: Dish, qty: int):
+        self._check_quantity(qty)
+        self._items[dish] = self._items.get(dish, 0) + qty
+        self._units += qty
+        self._subtotal += dish.price * qty
+        self._version += 1
+
+    @staticmethod
+    def _check_quantity(qty: int):
+        if not isinstance(qty, int) or qty < 1:
+            raise ValueError(f"Quantity must be a positive integer, got {qty!r}")
+
+    def _subtotal_changed(self):
+        self._total = None
+        self._priced_rules = PRICING.compiled()
+
+    def _running_total(self) -> float:
+        if self._total is None:
+            self._total = self._priced_rules.price(self, self._subtotal)
+        return self._total
+
+    def _full_total(self) -> float:
+        return self._priced_rules.price(self)
+
+    def _verify_total(self, total: float):
+        expected = self._full_total()
+        if not math.isclose(total, expected, rel_tol=1e-9, abs_tol=1e-9):
+            raise AssertionError(f"Cached total {total} does not match recomputed total {expected}")
+
+    def _items_repr(self) -> str:
+        return ", ".join(f"{dish!r} x{qty}" for dish, qty in self._items.items())
 
     def __repr__(self):
-        return f"Order(customer={self.customer}, dishes={self.dishes})"
+        return f"Order(customer={self.customer}, items=[{self._items_repr()}])"
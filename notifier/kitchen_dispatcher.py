@@ -0,0 +1,415 @@
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+import time
+from abc import abstractmethod
+from collections import deque
+
+from patterns.dispatcher import DispatchQueueFull
+from patterns.observer import KitchenNotifier
+
+_STOP = object()
+
+
+class Station:
+    """A kitchen station such as the grill, with its own bounded ticket queue.
+
+    `service_time` is the time in seconds to prepare one unit, either a
+    constant or a callable taking the Dish. `cooks` parts are prepared at once.
+    """
+
+    def __init__(self, name: str, dishes=(), service_time=1.0, max_queue: int = 32, cooks: int = 1):
+        if max_queue < 1:
+            raise ValueError("Queue size must be positive")
+        if cooks < 1:
+            raise ValueError("Station needs at least one cook")
+        self.name = name
+        self.dishes = frozenset(dish if isinstance(dish, str) else dish.name for dish in dishes)
+        self.service_time = service_time
+        self.max_queue = max_queue
+        self.cooks = cooks
+
+    def service(self, items) -> float:
+        if callable(self.service_time):
+            return sum(self.service_time(dish) * qty for dish, qty in items)
+        return self.service_time * sum(qty for _, qty in items)
+
+    def __repr__(self):
+        return f"Station(name={self.name!r}, cooks={self.cooks}, max_queue={self.max_queue})"
+
+
+class StationStats:
+    def __init__(self, station: Station):
+        self.station = station
+        self.served = 0
+        self.busy = 0.0
+        self.blocked = 0
+        self.depth = 0
+        self.max_depth = 0
+        self._depth_area = 0.0
+        self._depth_since = None
+
+    def set_depth(self, now: float, depth: int):
+        if self._depth_since is not None:
+            self._depth_area += self.depth * (now - self._depth_since)
+        self._depth_since = now
+        self.depth = depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def summary(self, now: float, elapsed: float) -> dict:
+        area = self._depth_area
+        if self._depth_since is not None:
+            area += self.depth * max(0.0, now - self._depth_since)
+        return {
+            "served": self.served,
+            "utilization": self.busy / (elapsed * self.station.cooks) if elapsed else 0.0,
+            "avg_queue_depth": area / elapsed if elapsed else 0.0,
+            "max_queue_depth": self.max_depth,
+            "blocked": self.blocked,
+        }
+
+
+class Ticket:
+    __slots__ = ("order", "arrived", "remaining", "latency", "error")
+
+    def __init__(self, order, arrived: float, parts: int):
+        self.order = order
+        self.arrived = arrived
+        self.remaining = parts
+        self.latency = None
+        self.error = None
+
+    @property
+    def done(self) -> bool:
+        return self.remaining == 0
+
+
+class Kitchen(KitchenNotifier):
+    """Observer that splits order events into tickets for the kitchen stations.
+
+    Each added dish goes to the station that lists it, or to the first station.
+    A ticket is done once every station has prepared its part; its latency runs
+    from the order event to that moment. A part whose service time cannot be
+    computed is recorded in `errors` and on the ticket, which never completes,
+    and the station moves on. Subclasses decide how stations run.
+    """
+
+    def __init__(self, stations, clock):
+        stations = list(stations)
+        if not stations:
+            raise ValueError("Kitchen needs at least one station")
+        self.stations = {station.name: station for station in stations}
+        if len(self.stations) != len(stations):
+            raise ValueError("Station names must be unique")
+        self._route = {dish: station for station in stations for dish in station.dishes}
+        self._default = stations[0]
+        self._stats = {station.name: StationStats(station) for station in stations}
+        self._latencies = []
+        self.errors = []
+        self._clock = clock
+        self._started = None
+        self._last = None
+        self._lock = threading.Lock()
+
+    def notify(self, order):
+        self.notify_added(order, order.line_items)
+
+    def notify_added(self, order, items):
+        if items:
+            self.submit(order, items)
+
+    def submit(self, order, items) -> Ticket:
+        now = self._clock()
+        ticket, parts = self._ticket(order, items, now)
+        for station, part in parts.items():
+            self._enqueue(station, ticket, part, now)
+        return ticket
+
+    def split(self, items) -> dict:
+        parts = {}
+        for dish, qty in items:
+            station = self._route.get(dish.name, self._default)
+            parts.setdefault(station, []).append((dish, qty))
+        return parts
+
+    def report(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            now = self._last if self._last is not None else self._clock()
+            elapsed = now - self._started if self._started is not None else 0.0
+            return {
+                "elapsed": elapsed,
+                "tickets": len(latencies),
+                "latency": {
+                    "mean": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "p50": _percentile(latencies, 0.50),
+                    "p95": _percentile(latencies, 0.95),
+                    "p99": _percentile(latencies, 0.99),
+                    "max": latencies[-1] if latencies else 0.0,
+                },
+                "stations": {name: stats.summary(now, elapsed) for name, stats in self._stats.items()},
+            }
+
+    def _ticket(self, order, items, now):
+        parts = self.split(items)
+        with self._lock:
+            if self._started is None:
+                self._started = now
+        return Ticket(order, now, len(parts)), parts
+
+    @abstractmethod
+    def _enqueue(self, station, ticket, part, now):
+        pass
+
+    def _finish(self, station, ticket, started, now):
+        with self._lock:
+            stats = self._stats[station.name]
+            stats.served += 1
+            stats.busy += now - started
+            ticket.remaining -= 1
+            if ticket.remaining == 0:
+                ticket.latency = now - ticket.arrived
+                self._latencies.append(ticket.latency)
+            self._last = now if self._last is None else max(self._last, now)
+
+    def _fail(self, ticket, error):
+        with self._lock:
+            ticket.error = error
+            self.errors.append((ticket, error))
+
+
+class ThreadedKitchen(Kitchen):
+    """Runs every cook as a thread that sleeps for the service time.
+
+    Service times are multiplied by `time_scale`, and the report is in real
+    seconds. A full station queue blocks the caller, or raises
+    DispatchQueueFull when `block` is False.
+    """
+
+    def __init__(self, stations, time_scale: float = 1.0, block: bool = True):
+        super().__init__(stations, time.perf_counter)
+        self.time_scale = time_scale
+        self.block = block
+        self._closed = False
+        self._queues = {name: queue.Queue(maxsize=station.max_queue) for name, station in self.stations.items()}
+        self._threads = [
+            threading.Thread(target=self._cook, args=(station, self._queues[name]), daemon=True)
+            for name, station in self.stations.items()
+            for _ in range(station.cooks)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _enqueue(self, station, ticket, part, now):
+        if self._closed:
+            raise RuntimeError("Kitchen is closed")
+        q = self._queues[station.name]
+        try:
+            q.put_nowait((ticket, part))
+        except queue.Full:
+            with self._lock:
+                self._stats[station.name].blocked += 1
+            if not self.block:
+                raise DispatchQueueFull(f"{station.name} queue is full") from None
+            q.put((ticket, part))
+        with self._lock:
+            self._stats[station.name].set_depth(self._clock(), q.qsize())
+
+    def drain(self):
+        """Block until every queued ticket part has been prepared."""
+        for q in self._queues.values():
+            q.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for name, station in self.stations.items():
+            for _ in range(station.cooks):
+                self._queues[name].put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _cook(self, station, q):
+        while True:
+            item = q.get()
+            try:
+                if item is _STOP:
+                    return
+                ticket, part = item
+                started = self._clock()
+                with self._lock:
+                    self._stats[station.name].set_depth(started, q.qsize())
+                try:
+                    service = station.service(part)
+                except Exception as error:
+                    self._fail(ticket, error)
+                    continue
+                time.sleep(service * self.time_scale)
+                self._finish(station, ticket, started, self._clock())
+            finally:
+                q.task_done()
+
+
+class AsyncKitchen(Kitchen):
+    """Runs every cook as an asyncio task inside the running event loop.
+
+    Use `async with` or `await start()` first. `submit_async` waits for room
+    in a full station queue; synchronous order events raise DispatchQueueFull.
+    """
+
+    def __init__(self, stations, time_scale: float = 1.0):
+        super().__init__(stations, time.perf_counter)
+        self.time_scale = time_scale
+        self._queues = {}
+        self._tasks = []
+
+    async def start(self):
+        for name, station in self.stations.items():
+            q = self._queues[name] = asyncio.Queue(maxsize=station.max_queue)
+            self._tasks += [asyncio.create_task(self._cook(station, q)) for _ in range(station.cooks)]
+
+    async def submit_async(self, order, items) -> Ticket:
+        now = self._clock()
+        ticket, parts = self._ticket(order, items, now)
+        for station, part in parts.items():
+            q = self._queues[station.name]
+            if q.full():
+                with self._lock:
+                    self._stats[station.name].blocked += 1
+            await q.put((ticket, part))
+            self._depth_changed(station, q)
+        return ticket
+
+    def _enqueue(self, station, ticket, part, now):
+        q = self._queues[station.name]
+        try:
+            q.put_nowait((ticket, part))
+        except asyncio.QueueFull:
+            with self._lock:
+                self._stats[station.name].blocked += 1
+            raise DispatchQueueFull(f"{station.name} queue is full") from None
+        self._depth_changed(station, q)
+
+    async def drain(self):
+        for q in self._queues.values():
+            await q.join()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _depth_changed(self, station, q):
+        with self._lock:
+            self._stats[station.name].set_depth(self._clock(), q.qsize())
+
+    async def _cook(self, station, q):
+        while True:
+            ticket, part = await q.get()
+            try:
+                started = self._clock()
+                self._depth_changed(station, q)
+                try:
+                    service = station.service(part)
+                except Exception as error:
+                    self._fail(ticket, error)
+                    continue
+                await asyncio.sleep(service * self.time_scale)
+                self._finish(station, ticket, started, self._clock())
+            finally:
+                q.task_done()
+
+
+class SimulatedKitchen(Kitchen):
+    """Discrete-event simulation of the kitchen on a virtual clock; nothing sleeps.
+
+    `submit(..., at=t)` delivers an event at virtual time `t`, which must not go
+    backwards. Parts arriving at a full station queue are held back until a
+    slot frees, the same as a blocked producer in real time.
+    """
+
+    def __init__(self, stations):
+        self.now = 0.0
+        super().__init__(stations, lambda: self.now)
+        self._events = []
+        self._sequence = itertools.count()
+        self._free = {name: station.cooks for name, station in self.stations.items()}
+        self._waiting = {name: deque() for name in self.stations}
+        self._held = {name: deque() for name in self.stations}
+
+    def submit(self, order, items, at: float = None) -> Ticket:
+        if at is not None:
+            if at < self.now:
+                raise ValueError(f"Cannot submit at {at}; the simulation is already at {self.now}")
+            self.run(until=at)
+        return super().submit(order, items)
+
+    def run(self, until: float = None):
+        """Process events up to virtual time `until`, or until the kitchen is idle."""
+        events = self._events
+        while events and (until is None or events[0][0] <= until):
+            now, _, station, ticket, part, started = heapq.heappop(events)
+            self.now = now
+            self._finish(station, ticket, started, now)
+            self._free[station.name] += 1
+            self._advance(station)
+            self._stats[station.name].set_depth(now, len(self._waiting[station.name]))
+        if until is not None:
+            self.now = max(self.now, until)
+
+    drain = run
+
+    def _enqueue(self, station, ticket, part, now):
+        name = station.name
+        if self._free[name]:
+            self._start(station, ticket, part)
+        elif len(self._waiting[name]) < station.max_queue:
+            self._waiting[name].append((ticket, part))
+            self._stats[name].set_depth(now, len(self._waiting[name]))
+        else:
+            self._stats[name].blocked += 1
+            self._held[name].append((ticket, part))
+
+    def _advance(self, station):
+        # A part that fails to start leaves its cook free for the next one.
+        name = station.name
+        waiting, held = self._waiting[name], self._held[name]
+        while True:
+            if waiting and self._free[name]:
+                self._start(station, *waiting.popleft())
+            elif held and len(waiting) < station.max_queue:
+                waiting.append(held.popleft())
+            else:
+                return
+
+    def _start(self, station, ticket, part):
+        try:
+            done = self.now + station.service(part)
+        except Exception as error:
+            self._fail(ticket, error)
+            return
+        self._free[station.name] -= 1
+        heapq.heappush(self._events, (done, next(self._sequence), station, ticket, part, self.now))
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
@@ -1,13 +1,60 @@
+import threading
+import weakref
+from functools import singledispatchmethod
+
+from models.bulk_order import BulkOrder
+from models.order import Order
+from notifier.output_sink import KitchenOutputSink
 from patterns.observer import KitchenNotifier
 
 
 class KitchenObserver(KitchenNotifier):
+    async_capable = True
+
+    def __init__(self, sink: KitchenOutputSink = None):
+        self.sink = sink if sink is not None else KitchenOutputSink()
+        self._fragments = {}
+        self._rendered = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
     def notify(self, order):
-        dishes_str = ", ".join([f"{dish.name} (${dish.price})" for dish in order.dishes])
+        self.notify_added(order, ())
+
+    def notify_added(self, order, items):
+        rendered = self._items(order, items)
+        self.sink.write(f"{self._header(order)}\nItems: {rendered}\n")
+
+    def flush(self):
+        self.sink.flush()
+
+    @singledispatchmethod
+    def _header(self, order: Order) -> str:
+        return f"Kitchen notified of new order: Standard Order for {order.customer.name}"
+
+    @_header.register
+    def _(self, order: BulkOrder) -> str:
+        return f"Kitchen notified of new order: Bulk Order for {order.customer.name} with {order.discount_percentage}% discount"
 
-        if hasattr(order, 'discount_percentage'):
-            print(f"Kitchen notified of new order: Bulk Order for {order.customer.name} with {order.discount_percentage}% discount")
-        else:
-            print(f"Kitchen notified of new order: Standard Order for {order.customer.name}")
+    def _items(self, order, added) -> str:
+        # Extend the order's cached item line only when it was rendered at the
+        # version just before this change (each added line bumps the version
+        # once) and every added dish is a new line; otherwise render every line
+        # again, which is O(distinct dishes).
+        version = order.version
+        with self._lock:
+            cached = self._rendered.get(order)
+            if (cached is not None and added
+                    and cached[0] == version - len(added)
+                    and all(order.quantity_of(dish) == qty for dish, qty in added)):
+                new_items = ", ".join(self._line(dish, qty) for dish, qty in added)
+                text = f"{cached[1]}, {new_items}" if cached[1] else new_items
+            else:
+                text = ", ".join(self._line(dish, qty) for dish, qty in order.line_items)
+            self._rendered[order] = (version, text)
+            return text
 
-        print(f"Items: {dishes_str}")
+    def _line(self, dish, qty) -> str:
+        fragment = self._fragments.get(dish)
+        if fragment is None:
+            fragment = self._fragments[dish] = f"{dish.name} (${dish.price})"
+        return fragment if qty == 1 else f"{fragment} x{qty}"
@@ -0,0 +1,55 @@
+import sys
+import threading
+from typing import Optional, TextIO
+
+
+class KitchenOutputSink:
+    """Buffers kitchen output and writes it to a stream in larger chunks.
+
+    The buffer is flushed once it holds at least `buffer_size` characters or,
+    from a timer thread, `flush_interval` seconds after the first write it
+    holds. With the defaults every write goes straight through. A sink without an explicit
+    stream writes to whatever `sys.stdout` is at flush time.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = 0, flush_interval: Optional[float] = None):
+        self._stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def stream(self) -> TextIO:
+        return self._stream if self._stream is not None else sys.stdout
+
+    def write(self, text: str):
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self.buffer_size or self.flush_interval == 0:
+                self._flush_locked()
+            elif self.flush_interval is not None and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    close = flush
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        stream = self.stream
+        stream.write("".join(self._buffer))
+        stream.flush()
+        self._buffer.clear()
+        self._buffered = 0
@@ -0,0 +1,182 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import AsyncIterator, Iterable, Optional
+
+from models.order import Order
+from patterns.database import Database
+from patterns.metrics import METRICS
+
+
+class AsyncDatabase:
+    """asyncio facade over the Database that never blocks the event loop.
+
+    Concurrent add_order calls are coalesced: a writer task collects pending
+    orders for up to `max_wait` seconds or until `max_batch` are queued, then
+    adds and flushes them as one batch on a worker thread, so a LogStorage
+    pays one fsync per batch. Each caller resumes only once its batch has
+    been committed, and gets the commit error if it failed.
+
+    A caller cancelled while its order is still queued drops the order; once
+    its batch has started committing the order is stored regardless.
+    """
+
+    def __init__(self, database: Optional[Database] = None, max_batch: int = 256, max_wait: float = 0.002):
+        if max_batch < 1:
+            raise ValueError("Batch size must be positive")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.database = database if database is not None else Database.get_instance()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.committed = 0
+        # One worker keeps commits in arrival order and reads behind them.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-database")
+        self._pending = deque()
+        self._queued = 0
+        # Created with each writer task so it belongs to the loop running it.
+        self._full = None
+        self._writer = None
+        self._closed = False
+
+    async def add_order(self, order: Order):
+        await self.add_orders((order,))
+
+    async def add_orders(self, orders: Iterable[Order]):
+        """Queue the orders as one unit of the next batch and wait until they are committed."""
+        self._check_open()
+        orders = list(orders)
+        if not orders:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((orders, future))
+        self._queued += len(orders)
+        if self._writer is None:
+            self._full = asyncio.Event()
+            self._writer = asyncio.create_task(self._write_loop())
+        if self._queued >= self.max_batch:
+            self._full.set()
+        await future
+
+    async def iter_orders(self, chunk_size: int = 256, **filters) -> AsyncIterator[Order]:
+        """Yield the orders Database.iter_orders would, fetching `chunk_size` at a time off the loop."""
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        self._check_open()
+        loop = asyncio.get_running_loop()
+        cursor = None
+        while True:
+            page, cursor = await loop.run_in_executor(
+                self._executor, partial(self.database.query_page, chunk_size, cursor, **filters))
+            for order in page:
+                yield order
+            if cursor is None:
+                return
+
+    async def list_orders(self, **filters) -> list[Order]:
+        return [order async for order in self.iter_orders(**filters)]
+
+    async def flush(self):
+        """Wait until every order queued so far has been committed."""
+        writer = self._writer
+        if writer is not None:
+            await asyncio.shield(writer)
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.database.flush)
+        self._executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "committed": self.committed,
+            "queued": self._queued,
+        }
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while self._pending:
+                if self.max_wait and self._queued < self.max_batch:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), self.max_wait)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._take_batch()
+                if not batch:
+                    continue
+                orders = [order for queued, _ in batch for order in queued]
+                try:
+                    await loop.run_in_executor(self._executor, self._commit, orders)
+                except Exception as error:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(error)
+                else:
+                    self.batches += 1
+                    self.committed += len(orders)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+                batch = []
+        except asyncio.CancelledError:
+            self._abandon(batch, None)
+            raise
+        except Exception as error:
+            # Delivered to every waiting caller, so the task itself ends quietly.
+            self._abandon(batch, error)
+        finally:
+            self._pending.clear()
+            self._queued = 0
+            self._writer = None
+
+    def _abandon(self, batch: list, error: Optional[BaseException]):
+        """Cancel the callers left waiting by a stopped writer, or fail them with its error."""
+        for _, future in batch + list(self._pending):
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    def _take_batch(self) -> list:
+        batch, size = [], 0
+        while self._pending and size < self.max_batch:
+            orders, future = self._pending[0]
+            if batch and size + len(orders) > self.max_batch:
+                break
+            self._pending.popleft()
+            self._queued -= len(orders)
+            # Callers cancelled before their batch was taken give up their orders.
+            if not future.cancelled():
+                batch.append((orders, future))
+                size += len(orders)
+        return batch
+
+    def _commit(self, orders: list[Order]):
+        started = METRICS.enabled and perf_counter()
+        self.database.add_orders(orders)
+        self.database.flush()
+        if started:
+            METRICS.observe("async_database.commit", started)
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("Async database is closed")
@@ -0,0 +1,154 @@
+from typing import Iterable
+
+from models.dish import Dish
+from models.order import Order
+from patterns.order_factory import OrderFactory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class _Column:
+    """Append-only NumPy column that grows its buffer by doubling."""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._grow(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self._size + len(values)
+        if end > len(self._data):
+            self._grow(end)
+        self._data[self._size:end] = values
+        self._size = end
+
+    @property
+    def values(self):
+        return self._data[:self._size]
+
+    def _grow(self, needed: int):
+        capacity = max(len(self._data), 1)
+        while capacity < needed:
+            capacity *= 2
+        data = np.empty(capacity, dtype=self._data.dtype)
+        data[:self._size] = self._data[:self._size]
+        self._data = data
+
+
+class ColumnarOrderStore:
+    """Column-oriented copy of stored orders for vectorized analytics.
+
+    Each order is captured as it was when appended, together with the line
+    and order discounts the pricing rules gave it then, so totals follow the
+    same formula as calculate_total.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("ColumnarOrderStore requires numpy")
+        self.order_ids = _Column(np.int64)
+        self.customer_ids = _Column(np.int64)
+        self.order_types = _Column(np.int8)
+        self.discounts = _Column(np.float64)
+        self.item_orders = _Column(np.int64)
+        self.item_dish_ids = _Column(np.int64)
+        self.item_quantities = _Column(np.int64)
+        self.item_prices = _Column(np.float64)
+        self.item_discounts = _Column(np.float64)
+        self.customers = []
+        self.dishes = []
+        self.type_names = []
+        self._customer_ids = {}
+        self._dish_ids = {}
+        self._type_codes = {}
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def append(self, order: Order):
+        row = len(self.order_ids)
+        self.order_ids.append(row)
+        self.customer_ids.append(self._intern(self._customer_ids, self.customers, order.customer.name))
+        self.order_types.append(self._intern(self._type_codes, self.type_names, OrderFactory.type_name(type(order))))
+        rules = order.pricing_rules
+        self.discounts.append(rules.order_percent(order))
+        items = order.line_items
+        if items:
+            self.item_orders.extend([row] * len(items))
+            self.item_dish_ids.extend([self._intern(self._dish_ids, self.dishes, dish) for dish, _ in items])
+            self.item_quantities.extend([qty for _, qty in items])
+            self.item_prices.extend([dish.price for dish, _ in items])
+            self.item_discounts.extend([rules.line_percent(dish.name, qty) for dish, qty in items])
+
+    def extend(self, orders: Iterable[Order]):
+        for order in orders:
+            self.append(order)
+
+    def order_totals(self):
+        subtotals = np.bincount(self.item_orders.values, weights=self._line_amounts(), minlength=len(self))
+        return subtotals - subtotals * (self.discounts.values / 100)
+
+    def total_revenue(self) -> float:
+        return float(self.order_totals().sum())
+
+    def average_ticket(self) -> float:
+        return self.total_revenue() / len(self) if len(self) else 0.0
+
+    def revenue_by_dish(self) -> dict[Dish, float]:
+        revenue = self._dish_revenue()
+        return {dish: float(revenue[dish_id]) for dish_id, dish in enumerate(self.dishes)}
+
+    def units_by_dish(self) -> dict[Dish, int]:
+        units = self._dish_units()
+        return {dish: int(units[dish_id]) for dish_id, dish in enumerate(self.dishes)}
+
+    def revenue_by_order_type(self) -> dict[str, float]:
+        revenue = np.bincount(self.order_types.values, weights=self.order_totals(), minlength=len(self.type_names))
+        return {name: float(revenue[code]) for code, name in enumerate(self.type_names)}
+
+    def top_dishes(self, k: int, by: str = "revenue") -> list[tuple[Dish, float]]:
+        if by == "revenue":
+            values = self._dish_revenue()
+        elif by == "quantity":
+            values = self._dish_units()
+        else:
+            raise ValueError(f"Unknown ranking: {by!r}")
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        top = np.argpartition(-values, k - 1)[:k]
+        top = top[np.argsort(-values[top], kind="stable")]
+        return [(self.dishes[dish_id], values[dish_id].item()) for dish_id in top]
+
+    def _line_amounts(self):
+        amounts = self.item_prices.values * self.item_quantities.values
+        return amounts - amounts * (self.item_discounts.values / 100)
+
+    def _dish_revenue(self):
+        amounts = self._line_amounts()
+        rates = self.discounts.values[self.item_orders.values] / 100
+        return np.bincount(self.item_dish_ids.values, weights=amounts - amounts * rates, minlength=len(self.dishes))
+
+    def _dish_units(self):
+        return np.bincount(self.item_dish_ids.values, weights=self.item_quantities.values,
+                           minlength=len(self.dishes)).astype(np.int64)
+
+    @staticmethod
+    def _intern(ids: dict, values: list, key) -> int:
+        index = ids.get(key)
+        if index is None:
+            index = ids[key] = len(values)
+            values.append(key)
+        return index
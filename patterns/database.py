@@ -1,23 +1,286 @@
+import bisect
+import itertools
+import math
+import threading
+from collections import deque
+from concurrent.futures import Future
+from operator import itemgetter
+from time import perf_counter
+from typing import Iterable, Iterator, Optional
+
 from models.order import Order
+from patterns.columnar import ColumnarOrderStore
+from patterns.metrics import METRICS
+from patterns.snapshot import write_snapshot_in_background
+from patterns.storage import MemoryStorage, OrderStorage
+
+
+class _TotalIndex:
+    """Order totals in blocks of consecutive positions, each sorted by total once it fills.
+
+    Appending never moves earlier entries, and a range query walks the blocks
+    from a position onwards, so a page costs the blocks it passes rather than
+    the whole range.
+    """
+
+    BLOCK = 1024
+
+    def __init__(self):
+        # (sorted totals, positions in the same order) for every full block
+        self._blocks = []
+        self._tail = []
+
+    def append(self, total: float):
+        self._tail.append(total)
+        if len(self._tail) == self.BLOCK:
+            start = len(self._blocks) * self.BLOCK
+            ranked = sorted(range(self.BLOCK), key=self._tail.__getitem__)
+            self._blocks.append(([self._tail[i] for i in ranked], [start + i for i in ranked]))
+            self._tail = []
+
+    def positions(self, min_total: Optional[float], max_total: Optional[float], after: int = -1) -> Iterator[int]:
+        """Positions after `after` whose total lies in [min_total, max_total], in insertion order."""
+        low = -math.inf if min_total is None else min_total
+        high = math.inf if max_total is None else max_total
+        size = self.BLOCK
+        blocks, tail, full = self._blocks, self._tail, len(self._blocks)
+        for block in range((after + 1) // size, full):
+            totals, positions = blocks[block]
+            start = bisect.bisect_left(totals, low)
+            end = bisect.bisect_right(totals, high)
+            if start == end:
+                continue
+            matches = range(block * size, (block + 1) * size) if end - start == size else sorted(positions[start:end])
+            for position in matches:
+                if position > after:
+                    yield position
+        base = full * size
+        for offset in range(max(after + 1 - base, 0), len(tail)):
+            if low <= tail[offset] <= high:
+                yield base + offset
 
 
 class Database:
+    """Singleton order store that is safe to share between threads.
+
+    add_order only appends to a buffer owned by the calling thread. Buffers
+    are merged into the storage backend and the indexes, in arrival order,
+    whenever one reaches `merge_threshold` orders, before every read and, from
+    a timer thread, `merge_interval` seconds after the first buffered order,
+    so a durable storage sees every order soon after it is added.
+    """
+
     _instance = None
+    _instance_lock = threading.RLock()
 
-    def __init__(self):
-        if Database._instance is not None:
-            raise Exception("This class is a singleton!")
-        self.orders = []
-        Database._instance = self
+    def __init__(self, storage: OrderStorage = None, merge_threshold: int = 64, columnar: bool = False,
+                 merge_interval: Optional[float] = 0.05):
+        with Database._instance_lock:
+            if Database._instance is not None:
+                raise Exception("This class is a singleton!")
+            self.storage = storage if storage is not None else MemoryStorage()
+            self.merge_threshold = merge_threshold
+            self.merge_interval = merge_interval
+            self._merge_timer = None
+            self._sequence = itertools.count()
+            self._local = threading.local()
+            self._buffers = []
+            self._merge_lock = threading.Lock()
+            self._by_customer = {}
+            self._by_type = {}
+            self._totals = _TotalIndex()
+            self._customer_of = []
+            self._type_of = []
+            self._total_of = []
+            # Optional NumPy copy of every order for vectorized analytics.
+            self._columns = ColumnarOrderStore() if columnar else None
+            # Orders already in the storage are indexed on the first query, so
+            # opening a large store does not hydrate every order up front.
+            self._indexed = 0
+            Database._instance = self
 
     @staticmethod
     def get_instance():
-        if Database._instance is None:
-            Database()
-        return Database._instance
+        instance = Database._instance
+        if instance is None:
+            with Database._instance_lock:
+                if Database._instance is None:
+                    Database()
+                instance = Database._instance
+        return instance
+
+    @property
+    def orders(self) -> list[Order]:
+        self._merge()
+        return self.storage.as_list()
 
     def add_order(self, order: Order):
-        self.orders.append(order)
+        started = METRICS.enabled and perf_counter()
+        buffer = self._buffer()
+        buffer.append((next(self._sequence), order))
+        if len(buffer) >= self.merge_threshold:
+            self._merge()
+        elif self._merge_timer is None and self.merge_interval is not None:
+            self._schedule_merge()
+        if started:
+            METRICS.observe("database.add_order", started)
+
+    def add_orders(self, orders: Iterable[Order]):
+        buffer = self._buffer()
+        buffer.extend(zip(self._sequence, orders))
+        if len(buffer) >= self.merge_threshold:
+            self._merge()
+        elif buffer and self._merge_timer is None and self.merge_interval is not None:
+            self._schedule_merge()
 
     def list_orders(self):
-        return list(self.orders)
+        self._merge()
+        return list(self.storage)
+
+    def iter_orders(self, customer: Optional[str] = None, order_type: Optional[type] = None,
+                    min_total: Optional[float] = None, max_total: Optional[float] = None,
+                    after: int = -1) -> Iterator[Order]:
+        """Lazily yield matching orders in insertion order.
+
+        `order_type` matches the exact class, so `Order` does not match bulk
+        orders. Totals are indexed as they were when the order was stored.
+        `after` skips every order up to and including that position.
+        Without filters the storage is streamed directly.
+        """
+        if customer is None and order_type is None and min_total is None and max_total is None:
+            self._merge()
+            if after < 0:
+                yield from self.storage
+            else:
+                for position in range(after + 1, len(self.storage)):
+                    yield self.storage.get(position)
+            return
+        self._merge(index_all=True)
+        for position in self._positions(customer, order_type, min_total, max_total, after):
+            yield self.storage.get(position)
+
+    def find_positions(self, customer: Optional[str] = None, order_type: Optional[type] = None,
+                       min_total: Optional[float] = None, max_total: Optional[float] = None,
+                       after: int = -1) -> Iterator[int]:
+        """Storage positions of the orders iter_orders would yield, in insertion order."""
+        self._merge(index_all=True)
+        return self._positions(customer, order_type, min_total, max_total, after)
+
+    def query_page(self, limit: int = 100, cursor: Optional[int] = None, **filters) -> tuple[list[Order], Optional[int]]:
+        """Return up to `limit` matching orders and the cursor for the next page (None when exhausted).
+
+        Like iter_orders, unfiltered pages read the storage without indexing it.
+        """
+        if limit < 1:
+            raise ValueError("Page limit must be positive")
+        after = -1 if cursor is None else cursor
+        if all(value is None for value in filters.values()):
+            self._merge()
+            positions = iter(range(after + 1, len(self.storage)))
+        else:
+            self._merge(index_all=True)
+            positions = self._positions(after=after, **filters)
+        page = []
+        for position in positions:
+            page.append(position)
+            if len(page) == limit:
+                break
+        next_cursor = page[-1] if len(page) == limit and next(positions, None) is not None else None
+        return [self.storage.get(position) for position in page], next_cursor
+
+    def analytics(self) -> ColumnarOrderStore:
+        if self._columns is None:
+            raise RuntimeError("Columnar analytics are disabled; create the Database with columnar=True")
+        self._merge(index_all=True)
+        return self._columns
+
+    def snapshot(self, path) -> Future:
+        """Write a binary snapshot of the orders stored so far from a background thread.
+
+        add_order keeps working while the snapshot is written; orders added
+        after this call are not part of it. The future resolves to the number
+        of orders written once the snapshot file has been atomically replaced.
+        """
+        self._merge()
+        return write_snapshot_in_background(path, self.storage, len(self.storage))
+
+    def flush(self):
+        self._merge()
+        self.storage.flush()
+
+    def close(self):
+        self._merge()
+        self.storage.close()
+
+    def _buffer(self) -> deque:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = deque()
+            with self._merge_lock:
+                self._buffers.append((threading.current_thread(), buffer))
+        return buffer
+
+    def _schedule_merge(self):
+        with self._merge_lock:
+            if self._merge_timer is None:
+                self._merge_timer = threading.Timer(self.merge_interval, self._merge)
+                self._merge_timer.daemon = True
+                self._merge_timer.start()
+
+    def _merge(self, index_all: bool = False):
+        with self._merge_lock:
+            # Orders buffered from here on arm a new timer.
+            if self._merge_timer is not None:
+                self._merge_timer.cancel()
+                self._merge_timer = None
+            pending = []
+            for _, buffer in self._buffers:
+                # Only the owning thread appends and only merges pop, so draining
+                # the length seen here never races with new appends.
+                for _ in range(len(buffer)):
+                    pending.append(buffer.popleft())
+            self._buffers = [(thread, buffer) for thread, buffer in self._buffers if buffer or thread.is_alive()]
+            if pending:
+                pending.sort(key=itemgetter(0))
+                orders = [order for _, order in pending]
+                caught_up = self._indexed == len(self.storage)
+                self.storage.extend(orders)
+                if caught_up:
+                    for order in orders:
+                        self._index(order)
+            if index_all:
+                while self._indexed < len(self.storage):
+                    self._index(self.storage.get(self._indexed))
+
+    def _index(self, order: Order):
+        position = self._indexed
+        self._indexed += 1
+        total = order.calculate_total()
+        self._by_customer.setdefault(order.customer.name, []).append(position)
+        self._by_type.setdefault(type(order), []).append(position)
+        self._totals.append(total)
+        self._customer_of.append(order.customer.name)
+        self._type_of.append(type(order))
+        self._total_of.append(total)
+        if self._columns is not None:
+            self._columns.append(order)
+
+    def _positions(self, customer=None, order_type=None, min_total=None, max_total=None, after=-1) -> Iterator[int]:
+        candidates = []
+        if customer is not None:
+            candidates.append(self._by_customer.get(customer, []))
+        if order_type is not None:
+            candidates.append(self._by_type.get(order_type, []))
+        if not candidates:
+            if min_total is None and max_total is None:
+                return iter(range(after + 1, self._indexed))
+            return self._totals.positions(min_total, max_total, after)
+        driver = min(candidates, key=len)
+        first = bisect.bisect_right(driver, after)
+        return (
+            position for position in (driver[i] for i in range(first, len(driver)))
+            if (customer is None or self._customer_of[position] == customer)
+            and (order_type is None or self._type_of[position] is order_type)
+            and (min_total is None or self._total_of[position] >= min_total)
+            and (max_total is None or self._total_of[position] <= max_total)
+        )
@@ -0,0 +1,108 @@
+import queue
+import threading
+
+from patterns.metrics import METRICS
+
+_STOP = object()
+
+
+class DispatchQueueFull(Exception):
+    pass
+
+
+class NotificationDispatcher:
+    """Delivers observer notifications from worker threads through bounded queues.
+
+    Every order is pinned to one worker, so notifications for the same order are
+    delivered in the order they were raised.
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    RAISE = "raise"
+    POLICIES = (BLOCK, DROP_OLDEST, RAISE)
+
+    def __init__(self, workers: int = 1, max_queue: int = 1024, policy: str = BLOCK):
+        if workers < 1:
+            raise ValueError("Dispatcher needs at least one worker")
+        if max_queue < 1:
+            raise ValueError("Queue size must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown backpressure policy: {policy!r}")
+        self.policy = policy
+        self.dropped = 0
+        self.errors = []
+        self._closed = False
+        self._queues = [queue.Queue(maxsize=max_queue) for _ in range(workers)]
+        self._threads = [threading.Thread(target=self._run, args=(q,), daemon=True) for q in self._queues]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, order, observers, added):
+        if self._closed:
+            raise RuntimeError("Dispatcher is closed")
+        q = self._queues[(id(order) >> 4) % len(self._queues)]
+        item = (order, tuple(observers), added)
+        if self.policy == self.BLOCK:
+            q.put(item)
+        elif self.policy == self.RAISE:
+            try:
+                q.put_nowait(item)
+            except queue.Full:
+                raise DispatchQueueFull("Notification queue is full") from None
+        else:
+            self._put_dropping_oldest(q, item)
+
+    def _put_dropping_oldest(self, q, item):
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                continue
+            q.task_done()
+            self.dropped += 1
+
+    def drain(self):
+        """Block until every queued notification has been delivered."""
+        for q in self._queues:
+            q.join()
+
+    flush = drain
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for q in self._queues:
+            q.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self, q):
+        while True:
+            item = q.get()
+            try:
+                if item is _STOP:
+                    return
+                order, observers, added = item
+                for obs in observers:
+                    try:
+                        if METRICS.enabled:
+                            METRICS.deliver(obs, order, added)
+                        else:
+                            obs.notify_added(order, added)
+                    except Exception as error:
+                        self.errors.append((obs, error))
+            finally:
+                q.task_done()
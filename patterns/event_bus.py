@@ -0,0 +1,143 @@
+import itertools
+import threading
+import weakref
+from time import perf_counter
+from typing import Optional
+
+from patterns.metrics import METRICS
+
+
+class Subscription:
+    __slots__ = ("id", "observer", "order_type", "customer", "dish")
+
+    def __init__(self, id, observer, order_type, customer, dish):
+        self.id = id
+        self.observer = observer
+        self.order_type = order_type
+        self.customer = customer
+        self.dish = dish
+
+    def matches(self, order, dishes):
+        return (
+            (self.order_type is None or type(order) is self.order_type)
+            and (self.customer is None or order.customer.name == self.customer)
+            and (self.dish is None or self.dish in dishes)
+        )
+
+
+class EventBus:
+    """Central hub that delivers order notifications to subscribed observers.
+
+    Each subscription is indexed under its most selective filter (customer,
+    then dish, then order type), so publishing only looks at the buckets the
+    order can match. Subscribers are held by weak reference and disappear once
+    the observer is garbage collected. Buckets are tuples replaced on every
+    change, so publishing never takes the lock.
+    """
+
+    def __init__(self):
+        # Reentrant because a weakref callback can fire while the lock is held.
+        self._lock = threading.RLock()
+        self._ids = itertools.count()
+        self._by_customer = {}
+        self._by_dish = {}
+        self._by_type = {}
+        self._wildcard = ()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def subscribe(self, observer, order_type: Optional[type] = None, customer: Optional[str] = None,
+                  dish=None) -> Subscription:
+        """Deliver notifications that match every given filter to `observer`.
+
+        `order_type` matches the exact class, `customer` the customer name and
+        `dish` (a Dish or a dish name) the dishes added by the notification.
+        """
+        if dish is not None and not isinstance(dish, str):
+            dish = dish.name
+        with self._lock:
+            subscription = Subscription(next(self._ids), None, order_type, customer, dish)
+            subscription.observer = weakref.ref(observer, lambda _: self.unsubscribe(subscription))
+            index, key = self._bucket_of(subscription)
+            if index is None:
+                self._wildcard += (subscription,)
+            else:
+                index[key] = index.get(key, ()) + (subscription,)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            index, key = self._bucket_of(subscription)
+            bucket = self._wildcard if index is None else index.get(key, ())
+            if subscription not in bucket:
+                return
+            bucket = tuple(entry for entry in bucket if entry is not subscription)
+            if index is None:
+                self._wildcard = bucket
+            elif bucket:
+                index[key] = bucket
+            else:
+                del index[key]
+            self._count -= 1
+
+    def subscribers(self, order, added=()) -> list:
+        """Return the live observers subscribed to a notification, in subscription order."""
+        if not self._count:
+            return []
+        dishes = {dish.name for dish, _ in added}
+        candidates = list(self._wildcard)
+        candidates.extend(self._by_customer.get(order.customer.name, ()))
+        candidates.extend(self._by_type.get(type(order), ()))
+        for name in dishes:
+            candidates.extend(self._by_dish.get(name, ()))
+        if len(candidates) > 1:
+            candidates.sort(key=lambda subscription: subscription.id)
+        observers = []
+        for subscription in candidates:
+            if subscription.matches(order, dishes):
+                observer = subscription.observer()
+                if observer is not None:
+                    observers.append(observer)
+        return observers
+
+    def publish(self, order, added=(), observers=None, dispatcher=None):
+        """Deliver a notification to `observers` attached to the order and to every matching subscriber."""
+        subscribed = self.subscribers(order, added) if self._count else ()
+        if not observers and not subscribed:
+            return
+        started = METRICS.enabled and perf_counter()
+        deferred = []
+        for obs in itertools.chain(observers or (), subscribed):
+            if dispatcher is not None and obs.async_capable:
+                deferred.append(obs)
+            elif started:
+                METRICS.deliver(obs, order, added)
+            else:
+                obs.notify_added(order, added)
+        if deferred:
+            dispatcher.submit(order, deferred, added)
+        if started:
+            METRICS.observe("subject.notify_all", started)
+
+    def clear(self):
+        with self._lock:
+            self._by_customer.clear()
+            self._by_dish.clear()
+            self._by_type.clear()
+            self._wildcard = ()
+            self._count = 0
+
+    def _bucket_of(self, subscription):
+        if subscription.customer is not None:
+            return self._by_customer, subscription.customer
+        if subscription.dish is not None:
+            return self._by_dish, subscription.dish
+        if subscription.order_type is not None:
+            return self._by_type, subscription.order_type
+        return None, None
+
+
+EVENT_BUS = EventBus()
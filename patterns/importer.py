@@ -0,0 +1,247 @@
+import csv
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+from models.bulk_order import BulkOrder
+from models.menu import Menu
+from models.order import Order
+from patterns.database import Database
+from patterns.order_factory import OrderFactory
+from patterns.serialization import order_from_record
+
+CSV_COLUMNS = ("order_id", "type", "customer", "dish", "quantity")
+
+# Dish name -> list of prices, installed once per worker process.
+_prices = None
+
+
+class ImportProgress:
+    def __init__(self, max_errors: int = 100):
+        self.lines = 0
+        self.orders = 0
+        self.rejected = 0
+        self.errors = []
+        self.max_errors = max_errors
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def orders_per_second(self) -> float:
+        return self.orders / self.elapsed if self.elapsed else 0.0
+
+    def _record_errors(self, errors):
+        self.rejected += len(errors)
+        room = self.max_errors - len(self.errors)
+        if room > 0:
+            self.errors.extend(errors[:room])
+
+    def __repr__(self):
+        return (f"ImportProgress(lines={self.lines}, orders={self.orders}, rejected={self.rejected}, "
+                f"elapsed={self.elapsed:.2f}s, orders_per_second={self.orders_per_second:.0f})")
+
+
+class OrderImporter:
+    """Streams orders from CSV or JSONL files into the Database.
+
+    The file is read in chunks of `chunk_size` lines; chunks are parsed and
+    validated in a process pool, dish names are priced from `menu`, and the
+    resulting orders are committed with Database.add_orders in file order. At
+    most `max_pending` chunks are in flight, so memory does not depend on the
+    file size. `workers=0` parses in the calling process.
+
+    JSONL lines look like {"type": "bulk", "customer": "Ann", "discount": 15,
+    "items": [["Pizza", 2], ["Salad", 1]]}. CSV files have a header with
+    order_id, type, customer, dish, quantity and an optional discount column,
+    one row per line item with the rows of an order kept together.
+    """
+
+    def __init__(self, menu: Menu, db: Database = None, workers: Optional[int] = None, chunk_size: int = 1000,
+                 max_pending: Optional[int] = None, progress: Callable[[ImportProgress], None] = None):
+        self.db = db if db is not None else Database.get_instance()
+        self.workers = os.cpu_count() if workers is None else workers
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending if max_pending is not None else 2 * max(self.workers, 1)
+        self.progress = progress
+        snapshot = menu.snapshot()
+        self.menu_version = snapshot.version
+        self._prices = {}
+        for dish in snapshot:
+            self._prices.setdefault(dish.name, []).append(dish.price)
+
+    def import_file(self, path, format: Optional[str] = None) -> ImportProgress:
+        format = format or os.path.splitext(str(path))[1].lstrip(".").lower()
+        if format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported import format: {format!r}")
+        report = ImportProgress()
+        with open(path, newline="") as source:
+            chunks = _csv_chunks(source, self.chunk_size) if format == "csv" else _line_chunks(source, self.chunk_size)
+            for records, errors, lines in self._parse(format, chunks):
+                self.db.add_orders(self._order(record) for record in records)
+                report.lines += lines
+                report.orders += len(records)
+                report._record_errors(errors)
+                report.elapsed = time.perf_counter() - report.started
+                if self.progress is not None:
+                    self.progress(report)
+        self.db.flush()
+        report.elapsed = time.perf_counter() - report.started
+        return report
+
+    def _order(self, record: dict) -> Order:
+        order = order_from_record(record)
+        order.menu_version = self.menu_version
+        return order
+
+    def _parse(self, format, chunks) -> Iterator[tuple]:
+        if self.workers == 0:
+            _install_prices(self._prices)
+            for chunk in chunks:
+                yield _parse_chunk(format, *chunk)
+            return
+        with ProcessPoolExecutor(self.workers, initializer=_install_prices, initargs=(self._prices,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_parse_chunk, format, *chunk))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def _line_chunks(source, chunk_size: int) -> Iterator[tuple]:
+    line_number = 1
+    while True:
+        lines = list(islice(source, chunk_size))
+        if not lines:
+            return
+        yield (lines, line_number, None)
+        line_number += len(lines)
+
+
+def _csv_chunks(source, chunk_size: int) -> Iterator[tuple]:
+    header = next(csv.reader([source.readline()]), [])
+    missing = [column for column in CSV_COLUMNS if column not in header]
+    if missing:
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+    line_number = 2
+    lines = []
+    boundary_id = None
+    for line in source:
+        # Once a chunk is full, keep reading until the order id changes so the
+        # rows of one order never end up in different chunks.
+        if boundary_id is not None and _order_id(line) != boundary_id:
+            yield (lines, line_number, header)
+            line_number += len(lines)
+            lines = []
+            boundary_id = None
+        lines.append(line)
+        if boundary_id is None and len(lines) >= chunk_size:
+            boundary_id = _order_id(line)
+    if lines:
+        yield (lines, line_number, header)
+
+
+def _order_id(line: str) -> str:
+    return next(csv.reader([line]), [""])[0]
+
+
+def _install_prices(prices):
+    global _prices
+    _prices = prices
+
+
+def _parse_chunk(format: str, lines: list, first_line: int, header: Optional[list]) -> tuple:
+    records = []
+    errors = []
+    if format == "jsonl":
+        for offset, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                records.append(_validate_json(json.loads(line)))
+            except (ValueError, TypeError, KeyError) as error:
+                errors.append(f"line {first_line + offset}: {error}")
+    else:
+        groups = []
+        for offset, values in enumerate(csv.reader(lines)):
+            if not values:
+                continue
+            row = dict(zip(header, values))
+            if groups and row.get("order_id") == groups[-1][1][0].get("order_id"):
+                groups[-1][1].append(row)
+            else:
+                groups.append((offset, [row]))
+        for offset, rows in groups:
+            first = rows[0]
+            try:
+                record = _new_record(first.get("type"), first.get("customer"), first.get("discount") or None)
+                for row in rows:
+                    record["items"].append(_priced_item(row.get("dish"), _csv_quantity(row.get("quantity"))))
+            except (ValueError, TypeError) as error:
+                errors.append(f"line {first_line + offset}: order {first.get('order_id')!r}: {error}")
+                continue
+            records.append(record)
+    return records, errors, len(lines)
+
+
+def _validate_json(data) -> dict:
+    if not isinstance(data, dict):
+        raise ValueError("record must be a JSON object")
+    record = _new_record(data.get("type"), data.get("customer"), data.get("discount"))
+    for entry in data.get("items", ()):
+        name, quantity = (entry, 1) if isinstance(entry, str) else entry
+        record["items"].append(_priced_item(name, quantity))
+    return record
+
+
+def _new_record(order_type, customer, discount) -> dict:
+    order_class = OrderFactory.registered_class(order_type) if isinstance(order_type, str) else None
+    if order_class is None:
+        raise ValueError(f"unknown order type {order_type!r}")
+    if not isinstance(customer, str) or not customer.strip():
+        raise ValueError(f"customer must be a non-empty string, got {customer!r}")
+    record = {"type": OrderFactory.type_name(order_class), "customer": customer, "items": []}
+    if discount is not None:
+        if not issubclass(order_class, BulkOrder):
+            raise ValueError(f"{order_type!r} orders cannot have a discount")
+        record["discount"] = _discount(discount)
+    return record
+
+
+def _discount(value) -> float:
+    # JSON discounts are numbers and CSV discounts numeric strings; `true` is neither.
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"discount must be a number, got {value!r}")
+    try:
+        discount = float(value)
+    except ValueError:
+        raise ValueError(f"discount must be a number, got {value!r}") from None
+    if not 0 <= discount <= 100:
+        raise ValueError(f"discount must be between 0 and 100, got {value!r}")
+    return discount
+
+
+def _priced_item(name: str, quantity) -> list:
+    prices = _prices.get(name)
+    if prices is None:
+        raise ValueError(f"dish {name!r} is not on the menu")
+    if len(set(prices)) > 1:
+        raise ValueError(f"dish {name!r} has several prices on the menu")
+    # bool is an int subclass, but `true` is not a quantity.
+    if not isinstance(quantity, int) or isinstance(quantity, bool):
+        raise ValueError(f"quantity must be a whole number, got {quantity!r}")
+    if quantity < 1:
+        raise ValueError(f"quantity must be positive, got {quantity}")
+    return [name, prices[0], quantity]
+
+
+def _csv_quantity(text):
+    if text is None or not re.fullmatch(r"\s*[+-]?\d+\s*", text):
+        return text
+    return int(text)
@@ -0,0 +1,171 @@
+import bisect
+import cProfile
+import json
+import math
+import pstats
+import random
+import threading
+from time import perf_counter
+from typing import Callable, Optional
+
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2,
+           0.1, 0.25, 0.5, 1.0, math.inf)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> list[int]:
+        total = 0
+        result = []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+class SlowNotification:
+    def __init__(self, observer: str, seconds: float, order, stats: Optional[pstats.Stats]):
+        self.observer = observer
+        self.seconds = seconds
+        self.order = order
+        self.stats = stats
+
+    def __repr__(self):
+        return f"SlowNotification(observer={self.observer!r}, seconds={self.seconds:.6f})"
+
+
+class MetricsRegistry:
+    """Counters and latency histograms for the order pipeline's hot paths.
+
+    Call sites check `enabled` before reading the clock, so a disabled
+    registry costs one attribute lookup per call. Histograms are keyed by
+    call site and, for observer deliveries, by the observer class.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._profiler = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def observe(self, site: str, started: float, observer: str = ""):
+        self.record(site, perf_counter() - started, observer)
+
+    def record(self, site: str, seconds: float, observer: str = ""):
+        key = (site, observer)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.add(seconds)
+
+    def profile_notifications(self, callback: Optional[Callable[[SlowNotification], None]],
+                              threshold: float = 0.01, sample_rate: float = 0.01, profile: bool = True):
+        """Report sampled observer notifications slower than `threshold` seconds to `callback`.
+
+        With `profile`, sampled notifications run under cProfile and the
+        report carries the pstats.Stats of the slow call. Pass None to remove
+        the hook.
+        """
+        self._profiler = None if callback is None else (callback, threshold, sample_rate, profile)
+
+    def deliver(self, observer, order, added):
+        name = type(observer).__name__
+        profiler = self._profiler
+        if profiler is not None and random.random() < profiler[2]:
+            self._deliver_sampled(observer, name, order, added, profiler)
+            return
+        started = perf_counter()
+        try:
+            observer.notify_added(order, added)
+        finally:
+            self.observe("observer.notify", started, name)
+
+    def _deliver_sampled(self, observer, name, order, added, profiler):
+        callback, threshold, _, profile = profiler
+        profile_run = cProfile.Profile() if profile else None
+        started = perf_counter()
+        try:
+            if profile_run is not None:
+                try:
+                    profile_run.enable()
+                except ValueError:
+                    # Another profiler is already active in this thread.
+                    profile_run = None
+            observer.notify_added(order, added)
+        finally:
+            if profile_run is not None:
+                profile_run.disable()
+            seconds = perf_counter() - started
+            self.record("observer.notify", seconds, name)
+        if seconds >= threshold:
+            stats = pstats.Stats(profile_run) if profile_run is not None else None
+            callback(SlowNotification(name, seconds, order, stats))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            items = sorted(self._histograms.items())
+            return {
+                "enabled": self.enabled,
+                "buckets": [str(bound) for bound in BUCKETS],
+                "sites": [
+                    {"site": site, "observer": observer, "count": histogram.count, "sum": histogram.sum,
+                     "cumulative": histogram.cumulative()}
+                    for (site, observer), histogram in items
+                ],
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix: str = "restaurant") -> str:
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per instrumented site.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        for entry in snapshot["sites"]:
+            lines.append(f"{prefix}_calls_total{{{_labels(entry)}}} {entry['count']}")
+        lines += [
+            f"# HELP {prefix}_call_seconds Latency per instrumented site.",
+            f"# TYPE {prefix}_call_seconds histogram",
+        ]
+        for entry in snapshot["sites"]:
+            labels = _labels(entry)
+            for bound, count in zip(BUCKETS, entry["cumulative"]):
+                le = "+Inf" if bound == math.inf else repr(bound)
+                lines.append(f'{prefix}_call_seconds_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{prefix}_call_seconds_sum{{{labels}}} {entry['sum']!r}")
+            lines.append(f"{prefix}_call_seconds_count{{{labels}}} {entry['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(entry) -> str:
+    labels = f'site="{entry["site"]}"'
+    if entry["observer"]:
+        labels += f',observer="{entry["observer"]}"'
+    return labels
+
+
+METRICS = MetricsRegistry()
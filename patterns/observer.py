@@ -1,22 +1,82 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from patterns.event_bus import EVENT_BUS
 
 
 class KitchenNotifier(ABC):
+    # Async-capable notifiers may be called from a dispatcher worker thread
+    # instead of the thread that changed the order.
+    async_capable = False
+
     @abstractmethod
     def notify(self, order):
         pass
 
+    def notify_added(self, order, items):
+        # `items` holds only the (dish, quantity) pairs added since the previous notification.
+        self.notify(order)
+
 
 class OrderSubject:
+    __slots__ = ("_observers", "_batch_depth", "_pending", "_dispatcher", "__weakref__")
+
+    _default_dispatcher = None
+
     def __init__(self):
-        self._observers = []
+        # Allocated on first attach; most stored orders never get an observer.
+        self._observers = None
+        self._batch_depth = 0
+        self._pending = None
+        self._dispatcher = None
+
+    @classmethod
+    def use_dispatcher(cls, dispatcher):
+        """Route async-capable observers of every order through `dispatcher` (None restores sync delivery)."""
+        OrderSubject._default_dispatcher = dispatcher
+
+    @property
+    def dispatcher(self):
+        return self._dispatcher or OrderSubject._default_dispatcher
+
+    @dispatcher.setter
+    def dispatcher(self, dispatcher):
+        self._dispatcher = dispatcher
 
     def attach(self, observer: KitchenNotifier):
+        if self._observers is None:
+            self._observers = []
         self._observers.append(observer)
 
     def detach(self, observer: KitchenNotifier):
+        if self._observers is None:
+            raise ValueError("Observer is not attached")
         self._observers.remove(observer)
 
-    def notify_all(self, order):
-        for obs in self._observers:
-            obs.notify(order)
+    @contextmanager
+    def batch(self):
+        """Defer notifications and send a single coalesced one when the outermost batch ends."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending is not None:
+                order, added = self._pending
+                self._pending = None
+                self._dispatch(order, tuple(added.items()))
+
+    def notify_all(self, order, added=()):
+        if self._batch_depth:
+            if self._pending is None:
+                self._pending = (order, {})
+            pending = self._pending[1]
+            for dish, qty in added:
+                pending[dish] = pending.get(dish, 0) + qty
+            return
+        self._dispatch(order, tuple(added))
+
+    def _dispatch(self, order, added):
+        # Per-order observers are delivered first, then matching bus subscribers.
+        if self._observers or len(EVENT_BUS):
+            EVENT_BUS.publish(order, added, self._observers, self.dispatcher)
@@ -1,18 +1,70 @@
+from time import perf_counter
+from typing import Iterable, Optional
+
 from models.bulk_order import BulkOrder
 from models.customer import Customer
 from models.order import Order
+from patterns.metrics import METRICS
 
 
 class OrderFactory:
+    # Keys are stored lower-case, so callers passing an already normalized
+    # type hit the registry directly without a lower() call.
+    _registry = {"standard": Order, "bulk": BulkOrder}
+    _names = {Order: "standard", BulkOrder: "bulk"}
+
+    @classmethod
+    def register(cls, name: str, order_class: type):
+        if not isinstance(order_class, type) or not issubclass(order_class, Order):
+            raise TypeError("Order class must be a subclass of Order")
+        key = name.lower()
+        cls._registry[key] = order_class
+        cls._names.setdefault(order_class, key)
+
+    @classmethod
+    def type_name(cls, order_class: type) -> str:
+        """Registered name of the order class, or of its nearest registered base class."""
+        name = cls._names.get(order_class)
+        if name is not None:
+            return name
+        for base in order_class.__mro__[1:]:
+            name = cls._names.get(base)
+            if name is not None:
+                return name
+        raise TypeError(f"{order_class.__name__} is not an order class")
+
+    @classmethod
+    def registered_class(cls, type: str) -> Optional[type]:
+        """The order class registered under `type`, or None; unlike create_order there is no default."""
+        return cls._registry.get(type) or cls._registry.get(type.lower())
+
     @staticmethod
     def create_order(type: str, customer: Customer) -> Order:
         if customer is None:
             raise ValueError("Customer cannot be None")
 
+        started = METRICS.enabled and perf_counter()
+        order = OrderFactory._resolve(type)(customer)
+        if started:
+            METRICS.observe("factory.create_order", started)
+        return order
+
+    @staticmethod
+    def create_orders(type: str, customers: Iterable[Customer]) -> list[Order]:
+        order_class = OrderFactory._resolve(type)
+        orders = []
+        for customer in customers:
+            if customer is None:
+                raise ValueError("Customer cannot be None")
+            orders.append(order_class(customer))
+        return orders
+
+    @staticmethod
+    def _resolve(type: str) -> type:
         if type is None:
             raise AttributeError("Order type cannot be None")
 
-        if type.lower() == "bulk":
-            return BulkOrder(customer)
-        else:
-            return Order(customer)
+        order_class = OrderFactory._registry.get(type)
+        if order_class is None:
+            order_class = OrderFactory._registry.get(type.lower(), Order)
+        return order_class
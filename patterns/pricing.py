@@ -0,0 +1,255 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, time, timedelta
+from typing import Callable, Iterable, Optional
+
+
+class PricingRule(ABC):
+    """A declarative discount, optionally limited to a daily `window` of (start, end) times."""
+
+    def __init__(self, window: Optional[tuple[time, time]] = None):
+        self.window = window
+
+    def active(self, now: datetime) -> bool:
+        if self.window is None:
+            return True
+        start, end = self.window
+        current = now.time()
+        if start <= end:
+            return start <= current < end
+        # The window runs past midnight.
+        return current >= start or current < end
+
+    def next_change(self, now: datetime) -> Optional[datetime]:
+        if self.window is None:
+            return None
+        changes = []
+        for moment in self.window:
+            change = now.replace(hour=moment.hour, minute=moment.minute, second=moment.second,
+                                 microsecond=moment.microsecond)
+            if change <= now:
+                change += timedelta(days=1)
+            changes.append(change)
+        return min(changes)
+
+    @abstractmethod
+    def _compile(self, rules: "CompiledRules"):
+        pass
+
+
+class OrderDiscount(PricingRule):
+    """Percent off every order."""
+
+    def __init__(self, percent: float, window=None):
+        super().__init__(window)
+        self.percent = percent
+
+    def _compile(self, rules):
+        rules._everyone += self.percent
+
+
+class CustomerDiscount(PricingRule):
+    """Percent off every order of one customer."""
+
+    def __init__(self, customer: str, percent: float, window=None):
+        super().__init__(window)
+        self.customer = customer
+        self.percent = percent
+
+    def _compile(self, rules):
+        rules._by_customer[self.customer] = rules._by_customer.get(self.customer, 0) + self.percent
+
+
+class OrderTypeDiscount(PricingRule):
+    """Percent off orders of `order_type`; without a percent, the order's own `discount_percentage`.
+
+    Subclasses inherit the rules of their nearest ancestor that has any.
+    """
+
+    def __init__(self, order_type: type, percent: Optional[float] = None, window=None):
+        super().__init__(window)
+        self.order_type = order_type
+        self.percent = percent
+
+    def _compile(self, rules):
+        fixed, own = rules._by_type.get(self.order_type, (0, False))
+        if self.percent is None:
+            rules._by_type[self.order_type] = (fixed, True)
+        else:
+            rules._by_type[self.order_type] = (fixed + self.percent, own)
+
+
+class DishDiscount(PricingRule):
+    """Percent off every line of one dish, matched by name so repricing keeps the promotion."""
+
+    def __init__(self, dish, percent: float, window=None):
+        super().__init__(window)
+        self.dish = dish if isinstance(dish, str) else dish.name
+        self.percent = percent
+
+    def _compile(self, rules):
+        rules._line_tiers.setdefault(self.dish, []).append((1, self.percent))
+
+
+class QuantityTier(PricingRule):
+    """Percent off by quantity; `tiers` maps a minimum quantity to a percent and the highest tier reached applies.
+
+    With a dish the quantity is that dish's line, otherwise the units in the whole order.
+    """
+
+    def __init__(self, tiers: dict[int, float], dish=None, window=None):
+        super().__init__(window)
+        self.tiers = dict(tiers)
+        self.dish = dish if dish is None or isinstance(dish, str) else dish.name
+
+    def _compile(self, rules):
+        entries = rules._unit_tiers if self.dish is None else rules._line_tiers.setdefault(self.dish, [])
+        entries.extend(self.tiers.items())
+
+
+class CompiledRules:
+    """Lookup tables for one set of active rules.
+
+    Every line gets the best discount among its dish's rules, looked up in a
+    quantity threshold table. Order discounts (everyone, customer, order type
+    and the best units tier) add up, capped at 100%, and apply to the sum of
+    the discounted lines.
+    """
+
+    def __init__(self, rules: Iterable[PricingRule]):
+        self._everyone = 0
+        self._by_customer = {}
+        self._by_type = {}
+        self._line_tiers = {}
+        self._unit_tiers = []
+        # Order class -> rules of the nearest class in its MRO, filled on first use.
+        self._type_rules = {}
+        for rule in rules:
+            rule._compile(self)
+        self._line_tables = {name: _threshold_table(tiers) for name, tiers in self._line_tiers.items()}
+        self._unit_table = _threshold_table(self._unit_tiers) if self._unit_tiers else None
+
+    def line_percent(self, name: str, qty: int) -> float:
+        table = self._line_tables.get(name)
+        return 0 if table is None else _lookup(table, qty)
+
+    def order_percent(self, order) -> float:
+        percent = self._everyone
+        if self._by_customer:
+            percent += self._by_customer.get(order.customer.name, 0)
+        cls = type(order)
+        try:
+            typed = self._type_rules[cls]
+        except KeyError:
+            typed = self._type_rules[cls] = next(
+                (self._by_type[base] for base in cls.__mro__ if base in self._by_type), None)
+        if typed is not None:
+            fixed, own = typed
+            percent += (fixed + order.discount_percentage) if own else fixed
+        if self._unit_table is not None:
+            percent += _lookup(self._unit_table, len(order.dishes))
+        return min(percent, 100)
+
+    def subtotal(self, items) -> float:
+        tables = self._line_tables
+        total = 0
+        for dish, qty in items:
+            amount = dish.price * qty
+            table = tables.get(dish.name) if tables else None
+            if table is not None:
+                percent = _lookup(table, qty)
+                if percent:
+                    amount -= amount * (percent / 100)
+            total += amount
+        return total
+
+    def price(self, order, subtotal: Optional[float] = None) -> float:
+        """Price `order` in time linear in its line items; a known undiscounted `subtotal` skips the lines when no dish rules exist."""
+        if subtotal is None or self._line_tables:
+            subtotal = self.subtotal(order.quantities.items())
+        percent = self.order_percent(order)
+        if not percent:
+            return subtotal
+        return subtotal - subtotal * (percent / 100)
+
+
+class PricingEngine:
+    """Holds the pricing rules and the compiled tables for the rules active now.
+
+    Tables are rebuilt when the rules change or a rule's time window opens or
+    closes. Orders price themselves through the global PRICING engine.
+    """
+
+    def __init__(self, rules: Iterable[PricingRule] = (), clock: Callable[[], datetime] = datetime.now):
+        self._rules = list(rules)
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._compiled = None
+        self._expires = None
+
+    @property
+    def rules(self) -> tuple[PricingRule, ...]:
+        return tuple(self._rules)
+
+    def add_rule(self, rule: PricingRule):
+        with self._lock:
+            self._rules.append(rule)
+            self._compiled = None
+
+    def remove_rule(self, rule: PricingRule):
+        with self._lock:
+            self._rules.remove(rule)
+            self._compiled = None
+
+    def set_rules(self, rules: Iterable[PricingRule]):
+        with self._lock:
+            self._rules = list(rules)
+            self._compiled = None
+
+    def compiled(self) -> CompiledRules:
+        compiled = self._compiled
+        if compiled is None or (self._expires is not None and self.clock() >= self._expires):
+            compiled = self._compile()
+        return compiled
+
+    def price(self, order) -> float:
+        return self.compiled().price(order)
+
+    def price_batch(self, orders: Iterable) -> list[float]:
+        """Price many orders against one compiled rule set.
+
+        Vectorized pricing of stored orders is ColumnarOrderStore.order_totals,
+        which keeps the discounts each order was given in NumPy columns.
+        """
+        rules = self.compiled()
+        return [rules.price(order) for order in orders]
+
+    def _compile(self) -> CompiledRules:
+        with self._lock:
+            now = self.clock()
+            compiled = CompiledRules(rule for rule in self._rules if rule.active(now))
+            changes = [change for change in (rule.next_change(now) for rule in self._rules) if change is not None]
+            self._expires = min(changes, default=None)
+            self._compiled = compiled
+            return compiled
+
+
+def _threshold_table(tiers) -> tuple[list, list]:
+    thresholds, best = [], []
+    for minimum, percent in sorted(tiers):
+        if thresholds and thresholds[-1] == minimum:
+            best[-1] = max(best[-1], percent)
+        else:
+            thresholds.append(minimum)
+            best.append(max(percent, best[-1]) if best else percent)
+    return thresholds, best
+
+
+def _lookup(table, qty) -> float:
+    thresholds, best = table
+    position = bisect.bisect_right(thresholds, qty) - 1
+    return best[position] if position >= 0 else 0
+
+
+PRICING = PricingEngine()
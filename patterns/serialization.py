@@ -0,0 +1,49 @@
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.order_factory import OrderFactory
+
+
+def order_to_record(order: Order) -> dict:
+    record = {
+        "type": OrderFactory.type_name(type(order)),
+        "customer": order.customer.name,
+        "items": [[dish.name, dish.price, qty] for dish, qty in order.line_items],
+    }
+    if isinstance(order, BulkOrder):
+        record["discount"] = order.discount_percentage
+    if order.menu_version is not None:
+        record["menu_version"] = order.menu_version
+    return record
+
+
+def order_from_record(record: dict) -> Order:
+    order = OrderFactory.create_order(record["type"], Customer(record["customer"]))
+    if "discount" in record and isinstance(order, BulkOrder):
+        order.discount_percentage = record["discount"]
+    order.menu_version = record.get("menu_version")
+    # Records written before line items carry one [name, price] entry per unit.
+    order.restore_items((Dish.intern(name, price), quantity[0] if quantity else 1)
+                        for name, price, *quantity in record.get("items", record.get("dishes", ())))
+    return order
+
+
+def order_to_row(order: Order) -> tuple:
+    """Compact positional form of order_to_record, for batches sent between processes.
+
+    (type, customer, discount or None, menu_version, ((dish name, price, quantity), ...))
+    """
+    return (OrderFactory.type_name(type(order)), order.customer.name,
+            order.discount_percentage if isinstance(order, BulkOrder) else None, order.menu_version,
+            tuple([(dish.name, dish.price, qty) for dish, qty in order.quantities.items()]))
+
+
+def order_from_row(row: tuple) -> Order:
+    order_type, customer, discount, menu_version, lines = row
+    order = OrderFactory.create_order(order_type, Customer(customer))
+    if discount is not None and isinstance(order, BulkOrder):
+        order.discount_percentage = discount
+    order.menu_version = menu_version
+    order.restore_items((Dish.intern(name, price), qty) for name, price, qty in lines)
+    return order
@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import multiprocessing
+import threading
+import zlib
+from array import array
+from operator import itemgetter
+from typing import Callable, Iterable, Optional
+
+from models.order import Order
+from patterns.database import Database
+from patterns.event_bus import EVENT_BUS
+from patterns.observer import OrderSubject
+from patterns.order_factory import OrderFactory
+from patterns.serialization import order_from_row, order_to_row
+from patterns.storage import OrderStorage
+
+
+class ShardError(RuntimeError):
+    pass
+
+
+class ShardedDatabase:
+    """Coordinator for orders partitioned by customer across worker processes.
+
+    Each shard process owns its own Database. Orders are routed by the CRC32
+    of the customer name and sent in batches of `batch_size` per shard over a
+    pipe, so there is no round-trip per order. Orders travel as compact
+    order_to_row tuples, encoded before the coordinator's lock is taken, so
+    concurrent writers only serialize on routing. Reads flush the
+    pending batches, fan out to the shards and merge the results back into
+    insertion order. `storage_factory(shard_index)` builds each shard's
+    storage in the shard process, so it must be picklable; by default shards
+    keep their orders in memory.
+
+    Orders a shard recovers from durable storage keep their order within the
+    shard and come before every order added since; sequence numbers are not
+    stored, so recovered orders of different shards interleave by position.
+    """
+
+    def __init__(self, shards: int = 4, storage_factory: Optional[Callable[[int], OrderStorage]] = None,
+                 batch_size: int = 512, start_method: Optional[str] = None):
+        if shards < 1:
+            raise ValueError("Sharded database needs at least one shard")
+        if batch_size < 1:
+            raise ValueError("Batch size must be positive")
+        context = multiprocessing.get_context(start_method)
+        self.batch_size = batch_size
+        self._connections = []
+        self._processes = []
+        for index in range(shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_serve_shard, args=(child, index, storage_factory), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        recovered = []
+        for index, (status, payload) in enumerate([connection.recv() for connection in self._connections]):
+            if status != "ok":
+                self._stop()
+                raise ShardError(f"Shard {index} failed to start: {payload}")
+            recovered.append(payload)
+        self._pending = [[] for _ in range(shards)]
+        self._sequence = itertools.count(max(recovered))
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def shards(self) -> int:
+        return len(self._connections)
+
+    def shard_of(self, customer: str) -> int:
+        return zlib.crc32(customer.encode()) % len(self._connections)
+
+    def add_order(self, order: Order):
+        self.add_orders((order,))
+
+    def add_orders(self, orders: Iterable[Order]):
+        rows = [order_to_row(order) for order in orders]
+        shards = len(self._connections)
+        with self._lock:
+            self._check_open()
+            for row in rows:
+                # Same routing as shard_of; row[1] is the customer name.
+                shard = zlib.crc32(row[1].encode()) % shards
+                pending = self._pending[shard]
+                pending.append((next(self._sequence), row))
+                if len(pending) >= self.batch_size:
+                    self._send_locked(shard)
+
+    def flush(self):
+        """Wait until every shard has stored and flushed the orders added so far."""
+        self._fan_out(("flush",))
+
+    def list_orders(self) -> list[Order]:
+        return list(self.iter_orders())
+
+    def iter_orders(self, customer: Optional[str] = None, order_type: Optional[type] = None,
+                    min_total: Optional[float] = None, max_total: Optional[float] = None) -> Iterable[Order]:
+        """Matching orders from every shard, merged into insertion order; a customer filter asks one shard."""
+        request = ("query", customer, order_type, min_total, max_total)
+        shards = None if customer is None else [self.shard_of(customer)]
+        results = self._fan_out(request, shards)
+        for _, row in heapq.merge(*results, key=itemgetter(0)):
+            yield order_from_row(row)
+
+    def count(self) -> int:
+        return sum(stats["orders"] for stats in self._fan_out(("stats",)))
+
+    def aggregate(self) -> dict:
+        """Order count, revenue and revenue per order type, computed by the shards in parallel."""
+        result = {"orders": 0, "revenue": 0.0, "revenue_by_type": {}}
+        for stats in self._fan_out(("stats",)):
+            result["orders"] += stats["orders"]
+            result["revenue"] += stats["revenue"]
+            for name, revenue in stats["revenue_by_type"].items():
+                result["revenue_by_type"][name] = result["revenue_by_type"].get(name, 0.0) + revenue
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            for shard in range(len(self._connections)):
+                self._send_locked(shard)
+            self._stop()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fan_out(self, request, shards=None) -> list:
+        with self._lock:
+            self._check_open()
+            shards = range(len(self._connections)) if shards is None else shards
+            for shard in shards:
+                self._send_locked(shard)
+                self._connections[shard].send(request)
+            replies = [(shard, self._connections[shard].recv()) for shard in shards]
+        results = []
+        for shard, (status, payload) in replies:
+            if status != "ok":
+                raise ShardError(f"Shard {shard} failed: {payload}")
+            results.append(payload)
+        return results
+
+    def _send_locked(self, shard: int):
+        if self._pending[shard]:
+            self._connections[shard].send(("add", self._pending[shard]))
+            self._pending[shard] = []
+
+    def _stop(self):
+        for connection in self._connections:
+            try:
+                connection.send(("close",))
+            except OSError:
+                pass
+        for connection in self._connections:
+            try:
+                connection.recv()
+            except EOFError:
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join()
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("Sharded database is closed")
+
+
+def _serve_shard(connection, index, storage_factory):
+    # A forked shard inherits the coordinator's singleton, subscribers and
+    # dispatcher; the orders it rebuilds must not reach any of them.
+    Database._instance = None
+    EVENT_BUS.clear()
+    OrderSubject.use_dispatcher(None)
+    try:
+        db = Database(storage_factory(index) if storage_factory is not None else None)
+    except Exception as error:
+        connection.send(("error", repr(error)))
+        connection.recv()
+        connection.close()
+        return
+    # Orders recovered from the storage take the first sequence numbers.
+    sequences = array("Q", range(len(db.storage)))
+    connection.send(("ok", len(sequences)))
+    failure = None
+    while True:
+        message = connection.recv()
+        kind = message[0]
+        if kind == "add":
+            if failure is None:
+                try:
+                    db.add_orders(order_from_row(row) for _, row in message[1])
+                    sequences.extend(sequence for sequence, _ in message[1])
+                except Exception as error:
+                    failure = repr(error)
+            continue
+        if kind == "close":
+            db.close()
+            connection.send(("ok", None))
+            connection.close()
+            return
+        if failure is not None:
+            connection.send(("error", failure))
+            continue
+        try:
+            connection.send(("ok", _handle(db, sequences, message)))
+        except Exception as error:
+            connection.send(("error", repr(error)))
+
+
+def _handle(db, sequences, message):
+    kind = message[0]
+    if kind == "flush":
+        db.flush()
+        return None
+    if kind == "query":
+        _, customer, order_type, min_total, max_total = message
+        if customer is None and order_type is None and min_total is None and max_total is None:
+            return [(sequences[position], order_to_row(order)) for position, order in enumerate(db.iter_orders())]
+        positions = db.find_positions(customer, order_type, min_total, max_total)
+        return [(sequences[position], order_to_row(db.storage.get(position))) for position in positions]
+    if kind == "stats":
+        revenue_by_type = {}
+        for order in db.iter_orders():
+            name = OrderFactory.type_name(type(order))
+            revenue_by_type[name] = revenue_by_type.get(name, 0.0) + order.calculate_total()
+        return {"orders": len(sequences), "revenue": sum(revenue_by_type.values()),
+                "revenue_by_type": revenue_by_type}
+    raise ValueError(f"Unknown shard request: {kind!r}")
@@ -0,0 +1,215 @@
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.order_factory import OrderFactory
+from patterns.storage import MemoryStorage, OrderStorage
+
+# Layout, all little-endian:
+#   header | type names | customer names | dish names | dish prices | orders | items
+# A string table is (count + 1) u64 end offsets followed by the UTF-8 bytes.
+# Orders and items are fixed-width records, so any order can be located by index.
+# Version 2 order records end with the menu version; version 1 files are still read.
+MAGIC = b"ORDSNAP2"
+MAGIC_V1 = b"ORDSNAP1"
+HEADER = struct.Struct("<8s6Q")
+PRICE = struct.Struct("<dB7x")
+ORDER = struct.Struct("<HBxIdQIQ")
+ORDER_V1 = struct.Struct("<HBxIdQI")
+ITEM = struct.Struct("<II")
+OFFSET = struct.Struct("<Q")
+
+_INT_VALUE = 1
+_MENU_VERSION = 2
+
+
+def write_snapshot(path, orders: Iterable[Order]) -> int:
+    """Write `orders` to `path` atomically and return how many were written."""
+    types, customers, dishes = {}, {}, {}
+    order_records = bytearray()
+    item_records = bytearray()
+    count = 0
+    item_count = 0
+    for order in orders:
+        type_id = _intern(types, OrderFactory.type_name(type(order)))
+        customer_id = _intern(customers, order.customer.name)
+        discount = order.discount_percentage if isinstance(order, BulkOrder) else 0
+        flags = _INT_VALUE if isinstance(discount, int) else 0
+        if order.menu_version is not None:
+            flags |= _MENU_VERSION
+        items = order.line_items
+        order_records += ORDER.pack(type_id, flags, customer_id, discount, item_count, len(items),
+                                    order.menu_version or 0)
+        for dish, qty in items:
+            item_records += ITEM.pack(_intern(dishes, dish), qty)
+        item_count += len(items)
+        count += 1
+
+    prices = bytearray()
+    for dish in dishes:
+        prices += PRICE.pack(dish.price, _INT_VALUE if isinstance(dish.price, int) else 0)
+    sections = [
+        _string_table(types),
+        _string_table(customers),
+        _string_table(dish.name for dish in dishes),
+        bytes(prices),
+        bytes(order_records),
+        bytes(item_records),
+    ]
+    header = HEADER.pack(MAGIC, len(types), len(customers), len(dishes), count, item_count, 0)
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as snapshot:
+        snapshot.write(header)
+        for section in sections:
+            snapshot.write(section)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(os.path.dirname(os.path.abspath(path)))
+    return count
+
+
+def write_snapshot_in_background(path, storage: OrderStorage, count: int) -> Future:
+    """Snapshot the first `count` orders of `storage` from a background thread.
+
+    Storage is append-only, so writers can keep adding orders meanwhile; the
+    snapshot holds the orders as they are when the thread reaches them.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(write_snapshot(path, (storage.get(position) for position in range(count))))
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, name="snapshot-writer", daemon=True).start()
+    return future
+
+
+class SnapshotStorage(OrderStorage):
+    """Read-only snapshot base plus a writable tail for orders added after restore.
+
+    The snapshot is memory-mapped and only the header is read on open; an
+    order is hydrated from its fixed-width record each time it is accessed.
+    """
+
+    def __init__(self, path, tail: OrderStorage = None):
+        self.path = path
+        self.tail = tail if tail is not None else MemoryStorage()
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, type_count, customer_count, dish_count, order_count, item_count, _ = HEADER.unpack_from(self._map, 0)
+        if magic not in (MAGIC, MAGIC_V1):
+            raise ValueError(f"{path} is not an order snapshot")
+        self._record = ORDER if magic == MAGIC else ORDER_V1
+        self._count = order_count
+        offset = HEADER.size
+        self._types, offset = self._table_at(offset, type_count)
+        self._customers, offset = self._table_at(offset, customer_count)
+        self._dish_names, offset = self._table_at(offset, dish_count)
+        self._prices = offset
+        self._orders = self._prices + dish_count * PRICE.size
+        self._items = self._orders + order_count * self._record.size
+        self._customer = lru_cache(maxsize=4096)(self._customer)
+        self._dish = lru_cache(maxsize=None)(self._dish)
+
+    def append(self, order: Order):
+        self.tail.append(order)
+
+    def extend(self, orders: Iterable[Order]):
+        self.tail.extend(orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        for position in range(self._count):
+            yield self._hydrate(position)
+        yield from self.tail
+
+    def __len__(self) -> int:
+        return self._count + len(self.tail)
+
+    def get(self, position: int) -> Order:
+        if position < 0:
+            position += len(self)
+        if 0 <= position < self._count:
+            return self._hydrate(position)
+        if position < 0:
+            raise IndexError("order position out of range")
+        return self.tail.get(position - self._count)
+
+    def flush(self):
+        self.tail.flush()
+
+    def close(self):
+        self.tail.close()
+        self._map.close()
+        self._file.close()
+
+    def _hydrate(self, position: int) -> Order:
+        type_id, flags, customer_id, discount, item_start, item_count, *menu_version = self._record.unpack_from(
+            self._map, self._orders + position * self._record.size)
+        order = OrderFactory.create_order(self._string(self._types, type_id), Customer(self._customer(customer_id)))
+        if isinstance(order, BulkOrder):
+            order.discount_percentage = int(discount) if flags & _INT_VALUE else discount
+        if flags & _MENU_VERSION:
+            order.menu_version = menu_version[0]
+        order.restore_items((self._dish(dish_id), qty) for dish_id, qty in ITEM.iter_unpack(
+            self._map[self._items + item_start * ITEM.size:self._items + (item_start + item_count) * ITEM.size]))
+        return order
+
+    def _customer(self, customer_id: int) -> str:
+        return self._string(self._customers, customer_id)
+
+    def _dish(self, dish_id: int) -> Dish:
+        price, flags = PRICE.unpack_from(self._map, self._prices + dish_id * PRICE.size)
+        return Dish.intern(self._string(self._dish_names, dish_id), int(price) if flags & _INT_VALUE else price)
+
+    def _table_at(self, offset: int, count: int) -> tuple:
+        ends = offset
+        data = ends + (count + 1) * OFFSET.size
+        size = OFFSET.unpack_from(self._map, ends + count * OFFSET.size)[0]
+        return (ends, data), data + size
+
+    def _string(self, table, index: int) -> str:
+        ends, data = table
+        start = OFFSET.unpack_from(self._map, ends + index * OFFSET.size)[0]
+        end = OFFSET.unpack_from(self._map, ends + (index + 1) * OFFSET.size)[0]
+        return self._map[data + start:data + end].decode()
+
+
+def _intern(ids: dict, key) -> int:
+    index = ids.get(key)
+    if index is None:
+        index = ids[key] = len(ids)
+    return index
+
+
+def _string_table(strings) -> bytes:
+    offsets = bytearray(OFFSET.pack(0))
+    blob = bytearray()
+    for string in strings:
+        blob += string.encode()
+        offsets += OFFSET.pack(len(blob))
+    return bytes(offsets + blob)
+
+
+def _fsync_directory(directory: str):
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
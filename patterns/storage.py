@@ -0,0 +1,260 @@
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from models.order import Order
+from patterns.serialization import order_from_record, order_to_record
+
+
+class OrderStorage(ABC):
+    @abstractmethod
+    def append(self, order: Order):
+        pass
+
+    def extend(self, orders: Iterable[Order]):
+        for order in orders:
+            self.append(order)
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Order]:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def get(self, position: int) -> Order:
+        pass
+
+    def as_list(self) -> list[Order]:
+        return list(self)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class MemoryStorage(OrderStorage):
+    def __init__(self):
+        self.orders = []
+
+    def append(self, order: Order):
+        self.orders.append(order)
+
+    def extend(self, orders: Iterable[Order]):
+        self.orders.extend(orders)
+
+    def __iter__(self) -> Iterator[Order]:
+        return iter(self.orders)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def get(self, position: int) -> Order:
+        return self.orders[position]
+
+    def as_list(self) -> list[Order]:
+        return self.orders
+
+
+class LogStorage(OrderStorage):
+    """Append-only JSON-lines log on disk with group commit.
+
+    Appended orders are buffered and written with a single fsync once
+    `group_size` orders are pending or, from a timer thread, `commit_interval`
+    seconds after the first of them; flush() commits whatever is left. On open, a
+    truncated or unreadable last record (a crash mid-write) is cut off.
+    """
+
+    def __init__(self, path, group_size: int = 64, commit_interval: Optional[float] = None):
+        self.path = path
+        self.group_size = group_size
+        self.commit_interval = commit_interval
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self._offsets = array("Q")
+        self._end = 0
+        self._recover()
+        self._file = open(path, "ab")
+
+    def _recover(self):
+        if not os.path.exists(self.path):
+            return
+        good_offset = 0
+        damaged = False
+        with open(self.path, "rb") as log:
+            for line in log:
+                if damaged:
+                    raise ValueError(f"Corrupt record {len(self._offsets)} in order log {self.path}")
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("truncated record")
+                    json.loads(line)
+                except ValueError:
+                    damaged = True
+                    continue
+                self._offsets.append(good_offset)
+                good_offset += len(line)
+        if good_offset != os.path.getsize(self.path):
+            with open(self.path, "r+b") as log:
+                log.truncate(good_offset)
+        self._end = good_offset
+
+    def append(self, order: Order):
+        self.extend((order,))
+
+    def extend(self, orders: Iterable[Order]):
+        encoded = [self._encode(order) for order in orders]
+        with self._lock:
+            for record in encoded:
+                self._offsets.append(self._end)
+                self._end += len(record)
+            self._pending.extend(encoded)
+            if len(self._pending) >= self.group_size or self.commit_interval == 0:
+                self._commit_locked()
+            elif self.commit_interval is not None and self._timer is None and self._pending:
+                self._timer = threading.Timer(self.commit_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._commit_locked()
+
+    commit = flush
+
+    def close(self):
+        with self._lock:
+            self._commit_locked()
+            self._file.close()
+
+    def __iter__(self) -> Iterator[Order]:
+        self.flush()
+        with open(self.path, "rb") as log:
+            for line in log:
+                yield order_from_record(json.loads(line))
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def get(self, position: int) -> Order:
+        with self._lock:
+            if position < 0:
+                position += len(self._offsets)
+            start = self._offsets[position]
+            end = self._offsets[position + 1] if position + 1 < len(self._offsets) else self._end
+            self._commit_locked()
+        with open(self.path, "rb") as log:
+            log.seek(start)
+            return order_from_record(json.loads(log.read(end - start)))
+
+    def _commit_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        self._file.write(b"".join(self._pending))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending.clear()
+
+    @staticmethod
+    def _encode(order: Order) -> bytes:
+        return json.dumps(order_to_record(order), separators=(",", ":")).encode() + b"\n"
+
+
+class SQLiteStorage(OrderStorage):
+    """SQLite-backed storage that inserts buffered orders with executemany."""
+
+    def __init__(self, path, batch_size: int = 256):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS orders ("
+            "id INTEGER PRIMARY KEY, type TEXT NOT NULL, customer TEXT NOT NULL, "
+            "discount NUMERIC, dishes TEXT NOT NULL, menu_version INTEGER)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(orders)")}
+        if "menu_version" not in columns:
+            # Databases created before orders recorded their menu version.
+            self._connection.execute("ALTER TABLE orders ADD COLUMN menu_version INTEGER")
+        self._connection.commit()
+        self._committed = self._connection.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def append(self, order: Order):
+        self.extend((order,))
+
+    def extend(self, orders: Iterable[Order]):
+        rows = [self._row(order) for order in orders]
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._commit_locked()
+
+    def flush(self):
+        with self._lock:
+            self._commit_locked()
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+    def __iter__(self) -> Iterator[Order]:
+        self.flush()
+        cursor = self._connection.execute("SELECT type, customer, discount, dishes, menu_version FROM orders ORDER BY id")
+        for row in cursor:
+            yield self._order(row)
+
+    def __len__(self) -> int:
+        return self._committed + len(self._pending)
+
+    def get(self, position: int) -> Order:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("order position out of range")
+        self.flush()
+        # Rows are only ever appended, so row ids are consecutive from 1.
+        row = self._connection.execute(
+            "SELECT type, customer, discount, dishes, menu_version FROM orders WHERE id = ?", (position + 1,)
+        ).fetchone()
+        return self._order(row)
+
+    def _commit_locked(self):
+        if not self._pending:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO orders (type, customer, discount, dishes, menu_version) VALUES (?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._committed += len(self._pending)
+        self._pending.clear()
+
+    @staticmethod
+    def _row(order: Order) -> tuple:
+        record = order_to_record(order)
+        return (record["type"], record["customer"], record.get("discount"), json.dumps(record["items"]),
+                record.get("menu_version"))
+
+    @staticmethod
+    def _order(row) -> Order:
+        order_type, customer, discount, items, menu_version = row
+        record = {"type": order_type, "customer": customer, "items": json.loads(items)}
+        if discount is not None:
+            record["discount"] = discount
+        if menu_version is not None:
+            record["menu_version"] = menu_version
+        return order_from_record(record)
@@ -0,0 +1,262 @@
+import json
+import os
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional
+
+from models.order import Order
+from patterns.serialization import order_from_record, order_to_record
+from patterns.storage import OrderStorage
+
+# Cold records are a few dozen bytes of JSON each, too small for zlib to find
+# repeats in; priming it with the shared record syntax roughly halves them.
+_ZDICT = b'{"type":"bulk","discount":10,{"type":"standard","customer":"","items":[["'
+
+# Approximate heap bytes of a live order and of each of its line items, as
+# measured with tracemalloc; they drive the `max_hot_bytes` budget.
+ORDER_BYTES = 448
+LINE_BYTES = 32
+
+
+class ColdTier(ABC):
+    @abstractmethod
+    def put(self, position: int, data: bytes):
+        pass
+
+    @abstractmethod
+    def get(self, position: int) -> bytes:
+        pass
+
+    @abstractmethod
+    def __contains__(self, position: int) -> bool:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryColdTier(ColdTier):
+    def __init__(self):
+        self._records = {}
+        self._nbytes = 0
+
+    def put(self, position: int, data: bytes):
+        previous = self._records.get(position)
+        if previous is not None:
+            self._nbytes -= len(previous)
+        self._records[position] = data
+        self._nbytes += len(data)
+
+    def get(self, position: int) -> bytes:
+        return self._records[position]
+
+    def __contains__(self, position: int) -> bool:
+        return position in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+
+class DiskColdTier(ColdTier):
+    """Scratch file of evicted records, truncated on open.
+
+    Records are only appended; an order evicted again after it changed leaves
+    its old bytes behind as garbage until the tier is closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w+b")
+        self._extents = {}
+        self._end = 0
+
+    def put(self, position: int, data: bytes):
+        self._file.seek(self._end)
+        self._file.write(data)
+        self._extents[position] = (self._end, len(data))
+        self._end += len(data)
+
+    def get(self, position: int) -> bytes:
+        offset, length = self._extents[position]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def __contains__(self, position: int) -> bool:
+        return position in self._extents
+
+    def __len__(self) -> int:
+        return len(self._extents)
+
+    @property
+    def nbytes(self) -> int:
+        return self._end
+
+    def close(self):
+        self._file.close()
+        os.remove(self.path)
+
+
+class TieredStorage(OrderStorage):
+    """Keeps at most `max_hot` orders as live objects and the rest serialized in a cold tier.
+
+    `max_hot_bytes` also bounds the approximate memory of the hot orders, so
+    a few very large orders cannot exceed it; an order's size is estimated
+    from its line items when it enters the hot tier.
+
+    Under the "lru" policy a lookup refreshes an order; under "age" orders are
+    evicted in insertion order. With `max_age`, hot orders idle (lru) or stored
+    (age) for longer than that many seconds are evicted as well. Orders for
+    which `keep(order)` is true, such as open orders, are never evicted.
+
+    `cold` is a ColdTier, a path for a DiskColdTier, or None for compressed
+    records in memory. get() moves a cold order back into the hot tier;
+    iteration rehydrates cold orders without promoting them, so a full scan
+    does not flush the hot tier. Rehydrated orders are new objects without
+    the observers of the original.
+    """
+
+    LRU = "lru"
+    AGE = "age"
+    POLICIES = (LRU, AGE)
+
+    def __init__(self, max_hot: int = 10_000, policy: str = LRU, max_age: Optional[float] = None,
+                 cold=None, keep: Optional[Callable[[Order], bool]] = None, max_hot_bytes: Optional[int] = None):
+        if max_hot < 0:
+            raise ValueError("max_hot must not be negative")
+        if max_hot_bytes is not None and max_hot_bytes < 0:
+            raise ValueError("max_hot_bytes must not be negative")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy!r}")
+        self.max_hot = max_hot
+        self.max_hot_bytes = max_hot_bytes
+        self.policy = policy
+        self.max_age = max_age
+        self.keep = keep
+        if cold is None:
+            cold = MemoryColdTier()
+        elif not isinstance(cold, ColdTier):
+            cold = DiskColdTier(cold)
+        self.cold = cold
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # position -> (order, stamp, order version when it was last written to the cold tier, estimated bytes)
+        self._hot = OrderedDict()
+        self._hot_bytes = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def append(self, order: Order):
+        self.extend((order,))
+
+    def extend(self, orders: Iterable[Order]):
+        now = time.monotonic()
+        with self._lock:
+            for order in orders:
+                cost = self._cost(order)
+                self._hot[self._count] = (order, now, None, cost)
+                self._hot_bytes += cost
+                self._count += 1
+            self._evict_locked(now)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, position: int) -> Order:
+        now = time.monotonic()
+        with self._lock:
+            if position < 0:
+                position += self._count
+            if not 0 <= position < self._count:
+                raise IndexError("order position out of range")
+            entry = self._hot.get(position)
+            if entry is not None:
+                self.hits += 1
+                if self.policy == self.LRU:
+                    self._hot[position] = (entry[0], now, entry[2], entry[3])
+                    self._hot.move_to_end(position)
+                return entry[0]
+            self.misses += 1
+            order = self._decode(self.cold.get(position))
+            cost = self._cost(order)
+            self._hot[position] = (order, now, order.version, cost)
+            self._hot_bytes += cost
+            self._evict_locked(now)
+            return order
+
+    def __iter__(self) -> Iterator[Order]:
+        for position in range(self._count):
+            with self._lock:
+                entry = self._hot.get(position)
+                if entry is not None:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    data = self.cold.get(position)
+            yield entry[0] if entry is not None else self._decode(data)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hot": len(self._hot),
+                "hot_bytes": self._hot_bytes,
+                "cold": self._count - len(self._hot),
+                "cold_bytes": self.cold.nbytes,
+            }
+
+    def close(self):
+        self.cold.close()
+
+    def _evict_locked(self, now: float):
+        hot = self._hot
+        expires = None if self.max_age is None else now - self.max_age
+        skipped = 0
+        while hot and skipped < len(hot):
+            position, (order, stamp, cold_version, cost) = next(iter(hot.items()))
+            if (len(hot) <= self.max_hot and (self.max_hot_bytes is None or self._hot_bytes <= self.max_hot_bytes)
+                    and (expires is None or stamp > expires)):
+                return
+            if self.keep is not None and self.keep(order):
+                hot.move_to_end(position)
+                skipped += 1
+                continue
+            del hot[position]
+            self._hot_bytes -= cost
+            # A rehydrated order that did not change still matches its cold record.
+            if cold_version is None or order.version != cold_version:
+                self.cold.put(position, self._encode(order))
+            self.evictions += 1
+
+    @staticmethod
+    def _cost(order: Order) -> int:
+        return ORDER_BYTES + LINE_BYTES * len(order.quantities)
+
+    @staticmethod
+    def _encode(order: Order) -> bytes:
+        compressor = zlib.compressobj(wbits=-15, zdict=_ZDICT)
+        data = json.dumps(order_to_record(order), separators=(",", ":")).encode()
+        return compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def _decode(data: bytes) -> Order:
+        return order_from_record(json.loads(zlib.decompressobj(wbits=-15, zdict=_ZDICT).decompress(data)))
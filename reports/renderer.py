@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import weakref
+from functools import singledispatchmethod
+from typing import Iterable, TextIO
+
+from models.bulk_order import BulkOrder
+from models.order import Order
+from patterns.serialization import order_to_record
+
+FORMATS = ("text", "csv", "json")
+CSV_HEADER = ("type", "customer", "items", "discount", "total")
+
+
+class OrderRenderer:
+    """Renders orders as text, CSV rows or JSON objects and memoizes the result.
+
+    A cached rendering is reused until the order's version changes; an
+    order's total only changes with its contents, so this covers the total too.
+    """
+
+    def __init__(self):
+        self._cache = {format: weakref.WeakKeyDictionary() for format in FORMATS}
+        self._fragments = {}
+
+    def render(self, order: Order, format: str = "text") -> str:
+        cache = self._cache.get(format)
+        if cache is None:
+            raise ValueError(f"Unknown report format: {format!r}")
+        cached = cache.get(order)
+        if cached is not None and cached[0] == order.version:
+            return cached[1]
+        if format == "text":
+            rendered = self._text(order)
+        elif format == "csv":
+            rendered = self._csv(order)
+        else:
+            rendered = self._json(order)
+        cache[order] = (order.version, rendered)
+        return rendered
+
+    def items(self, order: Order) -> str:
+        return ", ".join(self._line(dish, qty) for dish, qty in order.line_items)
+
+    @singledispatchmethod
+    def _text(self, order: Order) -> str:
+        return f"Order for {order.customer.name}: {self.items(order)}"
+
+    @_text.register
+    def _(self, order: BulkOrder) -> str:
+        return f"Bulk Order for {order.customer.name}: {self.items(order)} with {order.discount_percentage}% discount"
+
+    def _csv(self, order: Order) -> str:
+        record = order_to_record(order)
+        row = io.StringIO()
+        items = "; ".join(f"{name} x{qty}" for name, _, qty in record["items"])
+        csv.writer(row, lineterminator="").writerow(
+            (record["type"], record["customer"], items, record.get("discount", ""), order.calculate_total()))
+        return row.getvalue()
+
+    def _json(self, order: Order) -> str:
+        record = order_to_record(order)
+        record["total"] = order.calculate_total()
+        return json.dumps(record)
+
+    def _line(self, dish, qty) -> str:
+        fragment = self._fragments.get(dish)
+        if fragment is None:
+            fragment = self._fragments[dish] = f"{dish.name} (${dish.price})"
+        return fragment if qty == 1 else f"{fragment} x{qty}"
+
+
+def write_report(orders: Iterable[Order], stream: TextIO, format: str = "text",
+                 renderer: OrderRenderer = None, chunk_size: int = 1000) -> int:
+    """Stream `orders` to `stream`, writing every `chunk_size` orders; returns the number written."""
+    if format not in FORMATS:
+        raise ValueError(f"Unknown report format: {format!r}")
+    renderer = renderer if renderer is not None else OrderRenderer()
+    if format == "text":
+        template = "{number}. {rendered}\n"
+    elif format == "csv":
+        stream.write(",".join(CSV_HEADER) + "\n")
+        template = "{rendered}\n"
+    else:
+        stream.write("[")
+        template = "{separator}\n  {rendered}"
+    chunk = []
+    count = 0
+    for count, order in enumerate(orders, 1):
+        chunk.append(template.format(number=count, rendered=renderer.render(order, format),
+                                     separator="," if count > 1 else ""))
+        if len(chunk) >= chunk_size:
+            stream.write("".join(chunk))
+            chunk.clear()
+    stream.write("".join(chunk))
+    if format == "json":
+        stream.write("\n]\n" if count else "]\n")
+    return count
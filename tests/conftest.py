@@ -0,0 +1,58 @@
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+
+PIZZA = Dish("Pizza", 150)
+TEA = Dish("Tea", 2.5)
+
+
+@pytest.fixture(autouse=True)
+def verify_order_totals():
+    """Cross-check every cached order total against a full recompute."""
+    Order.verify_totals = True
+    yield
+    Order.verify_totals = False
+
+
+@pytest.fixture
+def reset_database():
+    """Start and finish the test without a Database singleton."""
+    Database._instance = None
+    yield
+    Database._instance = None
+
+
+@pytest.fixture
+def db(reset_database):
+    return Database.get_instance()
+
+
+def make_orders(count=10, customers=None):
+    """A repeatable mix of orders: every third is bulk, with whole and fractional discounts and prices.
+
+    Order i belongs to "customer-i", or to "customer-{i % customers}" when `customers` is given.
+    """
+    orders = []
+    for i in range(count):
+        customer = Customer(f"customer-{i if customers is None else i % customers}")
+        if i % 3 == 0:
+            order = BulkOrder(customer)
+            order.discount_percentage = 12.5 if i % 2 else 10
+        else:
+            order = Order(customer)
+        order.add_dish(PIZZA, qty=1 + i % 4)
+        if i % 2:
+            order.add_dish(TEA)
+        orders.append(order)
+    return orders
+
+
+def describe(order):
+    """Everything that must survive storing and restoring an order."""
+    discount = order.discount_percentage if isinstance(order, BulkOrder) else None
+    return (type(order), order.customer.name, order.line_items, repr(discount), order.menu_version,
+            order.calculate_total())
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from patterns.async_database import AsyncDatabase
+from patterns.database import Database
+from patterns.storage import MemoryStorage
+from tests.conftest import make_orders
+
+
+class FailingStorage(MemoryStorage):
+    def extend(self, orders):
+        raise IOError("disk full")
+
+
+def test_concurrent_writes_are_coalesced(db):
+    """Test that concurrent add_order calls commit in batches and resolve after their order is stored."""
+    orders = make_orders(20)
+
+    async def add(facade, order):
+        await facade.add_order(order)
+        assert any(stored is order for stored in db.storage)
+
+    async def scenario():
+        async with AsyncDatabase(db, max_batch=8, max_wait=0.05) as facade:
+            await asyncio.gather(*(add(facade, order) for order in orders))
+            return facade.stats
+
+    stats = asyncio.run(scenario())
+    assert stats == {"batches": 3, "committed": 20, "queued": 0}
+    assert db.list_orders() == orders
+
+
+def test_cancelled_writer_drops_queued_order(db):
+    """Test that a caller cancelled before its batch is taken does not store its order."""
+    kept, dropped = make_orders(2)
+
+    async def scenario():
+        async with AsyncDatabase(db, max_wait=0.05) as facade:
+            waiting = asyncio.create_task(facade.add_order(dropped))
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await facade.add_order(kept)
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+    asyncio.run(scenario())
+    assert db.list_orders() == [kept]
+
+
+def test_commit_errors_reach_every_caller(reset_database):
+    """Test that a failed commit raises in each caller of the batch."""
+    database = Database(FailingStorage())
+
+    async def scenario():
+        facade = AsyncDatabase(database, max_wait=0.01)
+        results = await asyncio.gather(*(facade.add_order(order) for order in make_orders(3)),
+                                       return_exceptions=True)
+        assert facade.stats["committed"] == 0
+        await facade.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert len(results) == 3
+    assert all(isinstance(result, IOError) for result in results)
+
+
+def test_iter_orders_streams_in_chunks(db):
+    """Test that reads stream every matching order in chunks."""
+    orders = make_orders(10, customers=3)
+    db.add_orders(orders)
+
+    async def scenario():
+        async with AsyncDatabase(db) as facade:
+            everything = [order async for order in facade.iter_orders(chunk_size=3)]
+            filtered = await facade.list_orders(chunk_size=2, customer="customer-1", min_total=200)
+            return everything, filtered
+
+    everything, filtered = asyncio.run(scenario())
+    assert everything == orders
+    assert filtered == list(db.iter_orders(customer="customer-1", min_total=200))
+    assert filtered
+
+
+def test_closed_database_rejects_use(db):
+    """Test that a closed async database cannot be used."""
+    first, second = make_orders(2)
+
+    async def scenario():
+        facade = AsyncDatabase(db, max_batch=1)
+        await facade.add_order(first)
+        await facade.close()
+        with pytest.raises(RuntimeError):
+            await facade.add_order(second)
+
+    asyncio.run(scenario())
+    assert db.list_orders() == [first]
+
+
+def test_facade_works_across_event_loops(db):
+    """Test that one facade can be used from successive asyncio.run calls."""
+    first, second = make_orders(2)
+    facade = AsyncDatabase(db, max_wait=0.01)
+
+    asyncio.run(facade.add_order(first))
+    asyncio.run(facade.add_order(second))
+    asyncio.run(facade.close())
+    assert db.list_orders() == [first, second]
+
+
+def test_writer_failure_reaches_waiting_callers(db, monkeypatch):
+    """Test that callers get the error that stopped the writer instead of a cancellation."""
+    facade = AsyncDatabase(db)
+
+    def broken_take_batch():
+        raise RuntimeError("writer bug")
+
+    monkeypatch.setattr(facade, "_take_batch", broken_take_batch)
+
+    async def scenario():
+        results = await asyncio.gather(*(facade.add_order(order) for order in make_orders(2)),
+                                       return_exceptions=True)
+        assert [str(result) for result in results] == ["writer bug", "writer bug"]
+        await facade.flush()
+
+    asyncio.run(scenario())
+    assert db.list_orders() == []
@@ -0,0 +1,41 @@
+import json
+
+from benchmarks import suite
+
+
+def test_every_case_runs_at_small_size():
+    """Test that each benchmark case runs and reports the expected metrics."""
+    report = suite.run_suite(sizes=[10])
+    assert set(report["results"]) == set(suite.CASES)
+    for sizes in report["results"].values():
+        result = sizes["10"]
+        assert result["ops"] > 0
+        assert result["ops_per_sec"] > 0
+        assert result["p50_ns"] <= result["p99_ns"]
+        assert result["peak_bytes"] > 0
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    """Test that only throughput drops larger than the threshold are reported."""
+    baseline = {"results": {"case": {"10": {"ops_per_sec": 1000}, "100": {"ops_per_sec": 1000}}}}
+    current = {"results": {"case": {"10": {"ops_per_sec": 850}, "100": {"ops_per_sec": 700}},
+                           "new_case": {"10": {"ops_per_sec": 1}}}}
+
+    regressions = suite.compare(current, baseline, threshold=0.2)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("case @ 100")
+
+
+def test_main_writes_results_and_fails_on_regression(tmp_path):
+    """Test the command line: JSON output and a non-zero exit on regression."""
+    output = tmp_path / "results.json"
+    assert suite.main(["--cases", "order.calculate_total", "--sizes", "10", "--no-memory",
+                       "--output", str(output)]) == 0
+    results = json.loads(output.read_text())
+    results["results"]["order.calculate_total"]["10"]["ops_per_sec"] *= 1000
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(results))
+
+    assert suite.main(["--cases", "order.calculate_total", "--sizes", "10", "--no-memory",
+                       "--baseline", str(baseline)]) == 1
@@ -0,0 +1,114 @@
+import math
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+
+np = pytest.importorskip("numpy")
+
+from patterns.columnar import ColumnarOrderStore  # noqa: E402
+
+PIZZA = Dish("Pizza", 150)
+SUSHI = Dish("Sushi", 200.5)
+SALAD = Dish("Salad", 80)
+
+
+def make_orders():
+    orders = []
+    for i in range(50):
+        order = BulkOrder(Customer(f"c{i % 7}")) if i % 3 == 0 else Order(Customer(f"c{i % 7}"))
+        if i % 3 == 0:
+            order.discount_percentage = 5 + i % 20
+        order.add_dish(PIZZA, qty=1 + i % 4)
+        if i % 2:
+            order.add_dish(SUSHI)
+        if i % 5 == 0:
+            order.add_dish(SALAD, qty=10)
+        orders.append(order)
+    orders.append(Order(Customer("empty")))
+    return orders
+
+
+def test_order_totals_match_calculate_total():
+    """Test that vectorized totals match calculate_total, bulk discounts included."""
+    store = ColumnarOrderStore()
+    orders = make_orders()
+    store.extend(orders)
+
+    totals = store.order_totals()
+    assert len(totals) == len(orders)
+    for order, total in zip(orders, totals):
+        assert math.isclose(total, order.calculate_total(), rel_tol=1e-12)
+    assert math.isclose(store.total_revenue(), sum(o.calculate_total() for o in orders))
+    assert math.isclose(store.average_ticket(), store.total_revenue() / len(orders))
+
+
+def test_revenue_by_dish_and_type():
+    """Test per-dish and per-type revenue against a per-object computation."""
+    store = ColumnarOrderStore()
+    orders = make_orders()
+    store.extend(orders)
+
+    expected = {}
+    for order in orders:
+        rate = order.discount_percentage / 100 if isinstance(order, BulkOrder) else 0
+        for dish, qty in order.line_items:
+            expected[dish] = expected.get(dish, 0) + dish.price * qty * (1 - rate)
+    revenue = store.revenue_by_dish()
+    assert revenue.keys() == expected.keys()
+    for dish in expected:
+        assert math.isclose(revenue[dish], expected[dish])
+
+    by_type = store.revenue_by_order_type()
+    assert math.isclose(by_type["bulk"], sum(o.calculate_total() for o in orders if isinstance(o, BulkOrder)))
+    assert math.isclose(by_type["standard"], sum(o.calculate_total() for o in orders if type(o) is Order))
+
+
+def test_top_dishes():
+    """Test ranking dishes by revenue and by units sold."""
+    store = ColumnarOrderStore()
+    store.extend(make_orders())
+
+    by_quantity = store.top_dishes(2, by="quantity")
+    assert [dish for dish, _ in by_quantity] == [PIZZA, SALAD]
+    assert by_quantity[0][1] == store.units_by_dish()[PIZZA] == 123
+    assert [dish for dish, _ in store.top_dishes(10)] == sorted(
+        store.revenue_by_dish(), key=store.revenue_by_dish().get, reverse=True)
+    with pytest.raises(ValueError):
+        store.top_dishes(1, by="margin")
+
+
+def test_columns_grow_by_doubling():
+    """Test that columns keep every row across several reallocations."""
+    store = ColumnarOrderStore()
+    for i in range(3000):
+        order = Order(Customer("Grow"))
+        order.add_dish(Dish("Dish", i))
+        store.append(order)
+    assert len(store) == 3000
+    assert store.order_totals()[-1] == 2999
+    assert store.customers == ["Grow"]
+
+
+def test_database_analytics():
+    """Test the columnar store behind Database."""
+    Database._instance = None
+    db = Database(columnar=True)
+    orders = make_orders()
+    for order in orders:
+        db.add_order(order)
+
+    assert math.isclose(db.analytics().total_revenue(), sum(o.calculate_total() for o in orders))
+    Database._instance = None
+
+
+def test_database_analytics_disabled():
+    """Test that analytics must be enabled explicitly."""
+    Database._instance = None
+    with pytest.raises(RuntimeError):
+        Database.get_instance().analytics()
+    Database._instance = None
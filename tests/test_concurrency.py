@@ -0,0 +1,95 @@
+import os
+import threading
+import time
+
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+from patterns.storage import LogStorage
+
+WRITERS = 16
+ORDERS_PER_WRITER = 2000
+
+
+def test_get_instance_race():
+    """Test that concurrent first calls to get_instance create exactly one database."""
+    Database._instance = None
+    barrier = threading.Barrier(WRITERS)
+    instances = []
+    errors = []
+
+    def worker():
+        barrier.wait()
+        try:
+            instances.append(Database.get_instance())
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker) for _ in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(instances) == WRITERS
+    assert all(instance is instances[0] for instance in instances)
+    Database._instance = None
+
+
+def test_concurrent_writers_lose_nothing():
+    """Test that many writer threads neither lose nor duplicate orders."""
+    Database._instance = None
+    db = Database.get_instance()
+    barrier = threading.Barrier(WRITERS)
+
+    def writer(writer_id):
+        barrier.wait()
+        for i in range(ORDERS_PER_WRITER):
+            order = Order(Customer(f"writer-{writer_id}"))
+            order.add_dish(Dish("Dish", i))
+            if i % 10 == 0:
+                db.add_orders([order])
+            else:
+                db.add_order(order)
+
+    threads = [threading.Thread(target=writer, args=(writer_id,)) for writer_id in range(WRITERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    orders = db.list_orders()
+    assert len(orders) == WRITERS * ORDERS_PER_WRITER
+    assert len({id(order) for order in orders}) == len(orders)
+    for writer_id in range(WRITERS):
+        mine = list(db.iter_orders(customer=f"writer-{writer_id}"))
+        assert [order.dishes[0].price for order in mine] == list(range(ORDERS_PER_WRITER))
+    Database._instance = None
+
+
+def test_reads_see_writes_from_other_threads():
+    """Test that buffered orders become visible to readers on other threads."""
+    Database._instance = None
+    db = Database(merge_threshold=1000)
+    thread = threading.Thread(target=lambda: db.add_order(Order(Customer("Alice"))))
+    thread.start()
+    thread.join()
+
+    assert [order.customer.name for order in db.list_orders()] == ["Alice"]
+    Database._instance = None
+
+
+def test_idle_buffers_reach_durable_storage(tmp_path, reset_database):
+    """Test that a buffered order is merged and committed on its own once the intervals pass."""
+    path = tmp_path / "orders.log"
+    db = Database(LogStorage(path, group_size=100, commit_interval=0.02), merge_interval=0.02)
+    db.add_order(Order(Customer("Alice")))
+    deadline = time.monotonic() + 2
+    while os.path.getsize(path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert os.path.getsize(path) > 0
+    assert [order.customer.name for order in LogStorage(path)] == ["Alice"]
+    db.close()
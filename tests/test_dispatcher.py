@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.dispatcher import DispatchQueueFull, NotificationDispatcher
+from patterns.observer import KitchenNotifier, OrderSubject
+
+
+class AsyncRecorder(KitchenNotifier):
+    """An async-capable notifier that records deliveries, optionally waiting on a gate."""
+
+    async_capable = True
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.delivered = []
+        self.threads = set()
+
+    def notify(self, order):
+        pass
+
+    def notify_added(self, order, items):
+        if self.gate is not None:
+            self.gate.wait()
+        self.threads.add(threading.get_ident())
+        self.delivered.append((order, items))
+
+
+class SyncRecorder(AsyncRecorder):
+    """A notifier that must be called in the caller's thread."""
+
+    async_capable = False
+
+
+def test_async_observer_runs_off_caller_thread():
+    """Test that async-capable observers are notified from a worker thread."""
+    with NotificationDispatcher() as dispatcher:
+        order = Order(Customer("Alice"))
+        order.dispatcher = dispatcher
+        notifier = AsyncRecorder()
+        order.attach(notifier)
+
+        order.add_dish(Dish("Pizza", 150))
+        dispatcher.drain()
+
+    assert notifier.delivered == [(order, ((Dish("Pizza", 150), 1),))]
+    assert threading.get_ident() not in notifier.threads
+
+
+def test_sync_observer_stays_on_caller_thread():
+    """Test that observers which are not async-capable are still notified synchronously."""
+    gate = threading.Event()
+    with NotificationDispatcher() as dispatcher:
+        order = Order(Customer("Bob"))
+        order.dispatcher = dispatcher
+        sync_notifier = SyncRecorder()
+        async_notifier = AsyncRecorder(gate)
+        order.attach(sync_notifier)
+        order.attach(async_notifier)
+
+        order.add_dish(Dish("Burger", 120))
+
+        assert sync_notifier.threads == {threading.get_ident()}
+        assert async_notifier.delivered == []
+        gate.set()
+        dispatcher.drain()
+
+    assert len(async_notifier.delivered) == 1
+
+
+def test_per_order_ordering_is_preserved():
+    """Test that notifications for each order arrive in the order they were raised."""
+    with NotificationDispatcher(workers=4) as dispatcher:
+        notifier = AsyncRecorder()
+        orders = [Order(Customer(f"Customer {i}")) for i in range(8)]
+        for order in orders:
+            order.dispatcher = dispatcher
+            order.attach(notifier)
+        for price in range(50):
+            for order in orders:
+                order.add_dish(Dish("Dish", price))
+        dispatcher.drain()
+
+    for order in orders:
+        prices = [items[0][0].price for delivered, items in notifier.delivered if delivered is order]
+        assert prices == list(range(50))
+
+
+def test_raise_policy_rejects_when_full():
+    """Test that the raise policy surfaces a full queue to the caller."""
+    gate = threading.Event()
+    dispatcher = NotificationDispatcher(max_queue=1, policy=NotificationDispatcher.RAISE)
+    order = Order(Customer("Charlie"))
+    order.dispatcher = dispatcher
+    order.attach(AsyncRecorder(gate))
+
+    with pytest.raises(DispatchQueueFull):
+        for _ in range(3):
+            order.add_dish(Dish("Salad", 80))
+
+    gate.set()
+    dispatcher.close()
+
+
+def test_drop_oldest_policy_keeps_newest():
+    """Test that the drop-oldest policy discards queued notifications instead of blocking."""
+    gate = threading.Event()
+    started = threading.Event()
+
+    class FirstBlocks(AsyncRecorder):
+        def notify_added(self, order, items):
+            started.set()
+            super().notify_added(order, items)
+
+    dispatcher = NotificationDispatcher(max_queue=2, policy=NotificationDispatcher.DROP_OLDEST)
+    order = Order(Customer("David"))
+    order.dispatcher = dispatcher
+    notifier = FirstBlocks(gate)
+    order.attach(notifier)
+
+    order.add_dish(Dish("Dish", 0))
+    started.wait(timeout=5)
+    for price in range(1, 6):
+        order.add_dish(Dish("Dish", price))
+    gate.set()
+    dispatcher.close()
+
+    assert [items[0][0].price for _, items in notifier.delivered] == [0, 4, 5]
+    assert dispatcher.dropped == 3
+
+
+def test_observer_errors_are_collected():
+    """Test that a failing async observer does not stop the worker."""
+
+    class Failing(AsyncRecorder):
+        def notify_added(self, order, items):
+            raise RuntimeError("printer jammed")
+
+    with NotificationDispatcher() as dispatcher:
+        order = Order(Customer("Eve"))
+        order.dispatcher = dispatcher
+        recorder = AsyncRecorder()
+        order.attach(Failing())
+        order.attach(recorder)
+        order.add_dish(Dish("Pasta", 130))
+        dispatcher.drain()
+
+    assert len(dispatcher.errors) == 1
+    assert len(recorder.delivered) == 1
+
+
+def test_default_dispatcher_applies_to_all_orders():
+    """Test that use_dispatcher switches every order to async delivery."""
+    dispatcher = NotificationDispatcher()
+    OrderSubject.use_dispatcher(dispatcher)
+    try:
+        order = Order(Customer("Frank"))
+        notifier = AsyncRecorder()
+        order.attach(notifier)
+        order.add_dish(Dish("Steak", 250))
+        dispatcher.drain()
+    finally:
+        OrderSubject.use_dispatcher(None)
+        dispatcher.close()
+
+    assert threading.get_ident() not in notifier.threads
+    assert len(notifier.delivered) == 1
+
+
+def test_invalid_policy():
+    """Test that an unknown backpressure policy is rejected."""
+    with pytest.raises(ValueError):
+        NotificationDispatcher(policy="spill")
@@ -97,3 +97,20 @@ def test_factory_with_none_customer():
     """Test that the factory raises a ValueError when customer is None."""
     with pytest.raises(ValueError, match="Customer cannot be None"):
         OrderFactory.create_order("standard", None)
+
+
+def test_equal_dishes_have_equal_hashes():
+    """Test that equal dishes hash the same, including int and float prices."""
+    assert hash(Dish("Pizza", 150)) == hash(Dish("Pizza", 150))
+    assert hash(Dish("Pizza", 150)) == hash(Dish("Pizza", 150.0))
+    assert len({Dish("Pizza", 150), Dish("Pizza", 150.0), Dish("Pizza", 160)}) == 2
+
+
+def test_menu_contains_non_dish():
+    """Test that menu.contains_dish() returns False for objects that are not dishes."""
+    menu = Menu()
+    menu.add_dish(Dish("Pizza", 150))
+
+    assert not menu.contains_dish("Pizza")
+    assert not menu.contains_dish(["Pizza", 150])
+    assert not menu.contains_dish(None)
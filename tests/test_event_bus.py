@@ -0,0 +1,151 @@
+import gc
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.dispatcher import NotificationDispatcher
+from patterns.event_bus import EVENT_BUS, EventBus
+from patterns.observer import KitchenNotifier
+
+
+class Recorder(KitchenNotifier):
+    """A notifier that records every delivery."""
+
+    def __init__(self):
+        self.delivered = []
+
+    def notify(self, order):
+        pass
+
+    def notify_added(self, order, items):
+        self.delivered.append((order, items))
+
+
+class AsyncRecorder(Recorder):
+    """An async-capable recording notifier."""
+
+    async_capable = True
+
+
+@pytest.fixture
+def bus():
+    yield EVENT_BUS
+    EVENT_BUS.clear()
+
+
+PIZZA = Dish("Pizza", 150)
+SUSHI = Dish("Sushi", 200)
+
+
+def test_subscriber_receives_every_order(bus):
+    """Test that one subscription covers orders it was never attached to."""
+    recorder = Recorder()
+    bus.subscribe(recorder)
+    first, second = Order(Customer("Alice")), BulkOrder(Customer("Bob"))
+
+    first.add_dish(PIZZA)
+    second.add_dish(SUSHI, qty=2)
+
+    assert recorder.delivered == [(first, ((PIZZA, 1),)), (second, ((SUSHI, 2),))]
+
+
+def test_topic_filters(bus):
+    """Test filtering by order type, customer, dish and a combination of them."""
+    bulk_only, alice_only, pizza_only, alice_pizza = Recorder(), Recorder(), Recorder(), Recorder()
+    bus.subscribe(bulk_only, order_type=BulkOrder)
+    bus.subscribe(alice_only, customer="Alice")
+    bus.subscribe(pizza_only, dish=PIZZA)
+    bus.subscribe(alice_pizza, customer="Alice", dish="Pizza")
+    alice, bob = Order(Customer("Alice")), BulkOrder(Customer("Bob"))
+
+    alice.add_dish(SUSHI)
+    alice.add_dish(PIZZA)
+    bob.add_dish(PIZZA)
+
+    assert [order for order, _ in bulk_only.delivered] == [bob]
+    assert [items for _, items in alice_only.delivered] == [((SUSHI, 1),), ((PIZZA, 1),)]
+    assert [order for order, _ in pizza_only.delivered] == [alice, bob]
+    assert alice_pizza.delivered == [(alice, ((PIZZA, 1),))]
+
+
+def test_order_type_matches_exact_class(bus):
+    """Test that an Order subscription does not receive bulk orders."""
+    recorder = Recorder()
+    bus.subscribe(recorder, order_type=Order)
+
+    BulkOrder(Customer("Bob")).add_dish(PIZZA)
+
+    assert recorder.delivered == []
+
+
+def test_subscribers_in_subscription_order():
+    """Test that matching subscribers from different index buckets keep their subscription order."""
+    bus = EventBus()
+    recorders = [Recorder() for _ in range(4)]
+    bus.subscribe(recorders[0], dish=PIZZA)
+    bus.subscribe(recorders[1])
+    bus.subscribe(recorders[2], customer="Alice")
+    bus.subscribe(recorders[3], order_type=Order)
+
+    assert bus.subscribers(Order(Customer("Alice")), ((PIZZA, 1),)) == recorders
+
+
+def test_unsubscribe(bus):
+    """Test that an unsubscribed observer is no longer notified."""
+    recorder = Recorder()
+    subscription = bus.subscribe(recorder, customer="Alice")
+    bus.unsubscribe(subscription)
+    bus.unsubscribe(subscription)
+
+    Order(Customer("Alice")).add_dish(PIZZA)
+
+    assert recorder.delivered == []
+    assert len(bus) == 0
+
+
+def test_discarded_subscriber_is_dropped(bus):
+    """Test that the bus does not keep a discarded observer alive."""
+    bus.subscribe(Recorder(), dish=PIZZA)
+    gc.collect()
+
+    assert len(bus) == 0
+    Order(Customer("Alice")).add_dish(PIZZA)
+
+
+def test_attached_and_subscribed_observers(bus):
+    """Test that per-order observers are notified before bus subscribers."""
+    calls = []
+
+    class Named(KitchenNotifier):
+        def __init__(self, name):
+            self.name = name
+
+        def notify(self, order):
+            calls.append(self.name)
+
+    attached, subscribed = Named("attached"), Named("subscribed")
+    bus.subscribe(subscribed)
+    order = Order(Customer("Alice"))
+    order.attach(attached)
+
+    with order.batch():
+        order.add_dish(PIZZA)
+        order.add_dish(SUSHI)
+
+    assert calls == ["attached", "subscribed"]
+
+
+def test_async_subscribers_use_dispatcher(bus):
+    """Test that async-capable subscribers are delivered through the order's dispatcher."""
+    recorder = AsyncRecorder()
+    bus.subscribe(recorder)
+    with NotificationDispatcher() as dispatcher:
+        order = Order(Customer("Alice"))
+        order.dispatcher = dispatcher
+        order.add_dish(PIZZA)
+        dispatcher.drain()
+
+    assert recorder.delivered == [(order, ((PIZZA, 1),))]
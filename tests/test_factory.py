@@ -2,8 +2,10 @@ import pytest
 
 from models.bulk_order import BulkOrder
 from models.customer import Customer
+from models.dish import Dish
 from models.order import Order
 from patterns.order_factory import OrderFactory
+from patterns.serialization import order_from_record, order_to_record
 
 
 def test_factory_creates_standard_order():
@@ -41,6 +43,12 @@ def test_factory_default_to_standard():
     assert not isinstance(order, BulkOrder)
 
 
+def test_registered_class_has_no_default():
+    """Test that registry lookups are case-insensitive and return None for unknown types."""
+    assert OrderFactory.registered_class("BULK") is BulkOrder
+    assert OrderFactory.registered_class("bluk") is None
+
+
 def test_factory_empty_type():
     """Test that the factory handles empty type string."""
     customer = Customer("Eve")
@@ -54,3 +62,67 @@ def test_factory_none_type():
     customer = Customer("Frank")
     with pytest.raises(AttributeError):
         OrderFactory.create_order(None, customer)
+
+
+class RushOrder(Order):
+    """An order type registered only for these tests."""
+
+
+def test_factory_register_new_type():
+    """Test that new order classes can be registered without editing the factory."""
+    OrderFactory.register("Rush", RushOrder)
+    try:
+        customer = Customer("Grace")
+        assert isinstance(OrderFactory.create_order("rush", customer), RushOrder)
+        assert isinstance(OrderFactory.create_order("RUSH", customer), RushOrder)
+        assert OrderFactory.type_name(RushOrder) == "rush"
+    finally:
+        del OrderFactory._registry["rush"]
+        del OrderFactory._names[RushOrder]
+
+
+class VipOrder(BulkOrder):
+    """A bulk order subclass that is never registered."""
+
+
+def test_type_name_falls_back_to_registered_base_class():
+    """Test that an unregistered subclass is stored as its nearest registered base type."""
+    order = VipOrder(Customer("Heidi"))
+    order.discount_percentage = 20
+    order.add_dish(Dish("Pizza", 150))
+    assert OrderFactory.type_name(VipOrder) == "bulk"
+
+    restored = order_from_record(order_to_record(order))
+    assert type(restored) is BulkOrder
+    assert restored.discount_percentage == 20
+    assert restored.calculate_total() == 120
+
+
+def test_type_name_rejects_non_orders():
+    """Test that classes outside the Order hierarchy have no type name."""
+    with pytest.raises(TypeError):
+        OrderFactory.type_name(Customer)
+
+
+def test_factory_register_rejects_non_orders():
+    """Test that only Order subclasses can be registered."""
+    with pytest.raises(TypeError):
+        OrderFactory.register("customer", Customer)
+
+
+def test_factory_create_orders_batch():
+    """Test that create_orders builds one order per customer."""
+    customers = [Customer(f"Customer {i}") for i in range(5)]
+    orders = OrderFactory.create_orders("Bulk", customers)
+    assert len(orders) == 5
+    assert all(isinstance(order, BulkOrder) for order in orders)
+    assert [order.customer for order in orders] == customers
+
+
+def test_factory_create_orders_validates():
+    """Test that the batch API rejects missing customers and types."""
+    with pytest.raises(ValueError):
+        OrderFactory.create_orders("standard", [Customer("Henry"), None])
+    with pytest.raises(AttributeError):
+        OrderFactory.create_orders(None, [Customer("Ivy")])
+    assert OrderFactory.create_orders("standard", []) == []
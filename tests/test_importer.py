@@ -0,0 +1,168 @@
+import json
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.dish import Dish
+from models.menu import Menu
+from models.order import Order
+from patterns.importer import OrderImporter
+
+
+@pytest.fixture
+def menu():
+    menu = Menu()
+    for name, price in [("Pizza", 150), ("Sushi", 200), ("Salad", 80)]:
+        menu.add_dish(Dish(name, price))
+    return menu
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+
+def test_import_jsonl(tmp_path, menu, db):
+    """Test that JSONL orders are priced from the menu and stored in file order."""
+    path = tmp_path / "orders.jsonl"
+    write_jsonl(path, [
+        {"type": "standard", "customer": "Alice", "items": [["Pizza", 2], "Salad"]},
+        {"type": "BULK", "customer": "Bob", "discount": 20, "items": [["Sushi", 10]]},
+    ])
+
+    report = OrderImporter(menu, db, workers=0).import_file(path)
+
+    assert report.orders == 2
+    assert report.rejected == 0
+    alice, bob = db.list_orders()
+    assert type(alice) is Order
+    assert alice.line_items == [(Dish("Pizza", 150), 2), (Dish("Salad", 80), 1)]
+    assert isinstance(bob, BulkOrder)
+    assert bob.calculate_total() == 1600
+
+
+def test_import_rejects_invalid_records(tmp_path, menu, db):
+    """Test that invalid records are reported and skipped."""
+    path = tmp_path / "orders.jsonl"
+    path.write_text(
+        '{"type": "standard", "customer": "Alice", "items": [["Lobster", 1]]}\n'
+        'not json\n'
+        '{"type": "standard", "customer": "Bob", "items": [["Pizza", 0]]}\n'
+        '{"type": "standard", "items": [["Pizza", 1]]}\n'
+        '{"type": "standard", "customer": "Carol", "items": [["Pizza", 1]]}\n'
+    )
+
+    report = OrderImporter(menu, db, workers=0).import_file(path)
+
+    assert report.orders == 1
+    assert report.rejected == 4
+    assert report.errors[0].startswith("line 1:")
+    assert "Lobster" in report.errors[0]
+    assert [order.customer.name for order in db.list_orders()] == ["Carol"]
+
+
+def test_import_rejects_malformed_record_fields(tmp_path, menu, db):
+    """Test that unknown types, bad customers and out-of-range or misplaced discounts are rejected."""
+    jsonl = tmp_path / "orders.jsonl"
+    write_jsonl(jsonl, [
+        {"type": "bluk", "customer": "Alice", "items": ["Pizza"]},
+        {"type": "standard", "customer": 42, "items": ["Pizza"]},
+        {"type": "standard", "customer": "  ", "items": ["Pizza"]},
+        {"type": "bulk", "customer": "Bob", "discount": 150, "items": ["Pizza"]},
+        {"type": "bulk", "customer": "Carol", "discount": -5, "items": ["Pizza"]},
+        {"type": "bulk", "customer": "Dan", "discount": True, "items": ["Pizza"]},
+        {"type": "standard", "customer": "Erin", "discount": 10, "items": ["Pizza"]},
+        {"type": "Bulk", "customer": "Fay", "discount": 100, "items": ["Pizza"]},
+    ])
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("order_id,type,customer,dish,quantity,discount\n"
+                        "1,bluk,Gus,Pizza,1,\n2,bulk,Hal,Pizza,1,101\n3,bulk,Ivy,Pizza,1,lots\n"
+                        "4,standard,Jo,Pizza,1,5\n5,bulk,Kim,Pizza,1,12.5\n")
+
+    importer = OrderImporter(menu, db, workers=0)
+    from_json = importer.import_file(jsonl)
+    from_csv = importer.import_file(csv_path)
+
+    assert (from_json.orders, from_json.rejected) == (1, 7)
+    assert (from_csv.orders, from_csv.rejected) == (1, 4)
+    assert "'bluk'" in from_json.errors[0] and "'bluk'" in from_csv.errors[0]
+    assert "customer" in from_json.errors[1] and "customer" in from_json.errors[2]
+    assert all("discount" in error for error in from_json.errors[3:] + from_csv.errors[1:])
+    assert [(order.customer.name, order.discount_percentage) for order in db.list_orders()] == [
+        ("Fay", 100), ("Kim", 12.5)]
+
+
+def test_import_csv_keeps_orders_together(tmp_path, menu, db):
+    """Test that CSV rows of one order stay together across chunk boundaries."""
+    rows = ["order_id,type,customer,dish,quantity,discount"]
+    for order_id in range(30):
+        kind = "bulk" if order_id % 3 == 0 else "standard"
+        discount = "15" if kind == "bulk" else ""
+        for dish in ("Pizza", "Sushi", "Salad")[: 1 + order_id % 3]:
+            rows.append(f"{order_id},{kind},Customer {order_id},{dish},{1 + order_id % 4},{discount}")
+    path = tmp_path / "orders.csv"
+    path.write_text("\n".join(rows) + "\n")
+
+    report = OrderImporter(menu, db, workers=0, chunk_size=4).import_file(path)
+
+    orders = db.list_orders()
+    assert report.orders == 30
+    assert [order.customer.name for order in orders] == [f"Customer {i}" for i in range(30)]
+    assert [len(order.line_items) for order in orders] == [1 + i % 3 for i in range(30)]
+    assert orders[3].discount_percentage == 15
+
+
+def test_import_rejects_non_integral_quantities(tmp_path, menu, db):
+    """Test that fractional, boolean and non-numeric quantities are rejected rather than truncated."""
+    jsonl = tmp_path / "orders.jsonl"
+    write_jsonl(jsonl, [
+        {"type": "standard", "customer": "Alice", "items": [["Pizza", 2.7]]},
+        {"type": "standard", "customer": "Bob", "items": [["Pizza", True]]},
+        {"type": "standard", "customer": "Carol", "items": [["Pizza", "2"]]},
+        {"type": "standard", "customer": "Dan", "items": [["Pizza", 2]]},
+    ])
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("order_id,type,customer,dish,quantity\n"
+                        "1,standard,Erin,Pizza,2.7\n2,standard,Fay,Pizza,two\n3,standard,Gus,Pizza, 3 \n")
+
+    importer = OrderImporter(menu, db, workers=0)
+    from_json = importer.import_file(jsonl)
+    from_csv = importer.import_file(csv_path)
+
+    assert (from_json.orders, from_json.rejected) == (1, 3)
+    assert (from_csv.orders, from_csv.rejected) == (1, 2)
+    assert "2.7" in from_json.errors[0] and "2.7" in from_csv.errors[0]
+    assert [(order.customer.name, order.line_items[0][1]) for order in db.list_orders()] == [("Dan", 2), ("Gus", 3)]
+
+
+def test_import_csv_requires_columns(tmp_path, menu, db):
+    """Test that a CSV without the expected header is rejected."""
+    path = tmp_path / "orders.csv"
+    path.write_text("id,customer\n1,Alice\n")
+    with pytest.raises(ValueError):
+        OrderImporter(menu, db, workers=0).import_file(path)
+
+
+def test_import_with_process_pool(tmp_path, menu, db):
+    """Test that parallel parsing commits the same orders in the same order."""
+    path = tmp_path / "orders.jsonl"
+    write_jsonl(path, [
+        {"type": "standard", "customer": f"Customer {i}", "items": [["Pizza", 1 + i % 5]]}
+        for i in range(500)
+    ])
+    updates = []
+
+    report = OrderImporter(menu, db, workers=2, chunk_size=37, progress=lambda r: updates.append(r.orders)).import_file(path)
+
+    assert report.orders == 500
+    assert report.lines == 500
+    assert updates == sorted(updates) and updates[-1] == 500
+    assert [order.customer.name for order in db.list_orders()] == [f"Customer {i}" for i in range(500)]
+    assert report.orders_per_second > 0
+
+
+def test_import_unknown_format(tmp_path, menu, db):
+    """Test that only CSV and JSONL files are accepted."""
+    path = tmp_path / "orders.xml"
+    path.write_text("<orders/>")
+    with pytest.raises(ValueError):
+        OrderImporter(menu, db, workers=0).import_file(path)
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+import pytest
+
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from notifier.kitchen_dispatcher import AsyncKitchen, Kitchen, SimulatedKitchen, Station, ThreadedKitchen
+from patterns.dispatcher import DispatchQueueFull
+
+BURGER = Dish("Burger", 120)
+SALAD = Dish("Salad", 80)
+SUSHI = Dish("Sushi", 200)
+
+
+def stations(**overrides):
+    grill = Station("grill", dishes=[BURGER], service_time=2.0, max_queue=1, **overrides)
+    return [grill, Station("salad", dishes=["Salad"], service_time=1.0)]
+
+
+def test_split_routes_dishes_to_stations():
+    """Test that dishes go to the station that lists them and others to the first station."""
+    kitchen = SimulatedKitchen(stations())
+    parts = kitchen.split([(BURGER, 1), (SALAD, 2), (SUSHI, 1)])
+
+    assert {station.name: part for station, part in parts.items()} == {
+        "grill": [(BURGER, 1), (SUSHI, 1)],
+        "salad": [(SALAD, 2)],
+    }
+
+
+def test_simulation_reports_latency_utilization_and_queue_depth():
+    """Test the simulated kitchen against a hand-computed schedule."""
+    kitchen = SimulatedKitchen(stations())
+    first = kitchen.submit(Order(Customer("A")), [(BURGER, 1), (SALAD, 1)], at=0)
+    second = kitchen.submit(Order(Customer("B")), [(BURGER, 1)], at=0)
+    third = kitchen.submit(Order(Customer("C")), [(BURGER, 1)], at=0)
+    kitchen.run()
+
+    assert (first.latency, second.latency, third.latency) == (2.0, 4.0, 6.0)
+    report = kitchen.report()
+    assert report["elapsed"] == 6.0
+    assert report["tickets"] == 3
+    assert report["latency"]["max"] == 6.0
+    grill, salad = report["stations"]["grill"], report["stations"]["salad"]
+    assert grill == {"served": 3, "utilization": 1.0, "avg_queue_depth": pytest.approx(4 / 6),
+                     "max_queue_depth": 1, "blocked": 1}
+    assert salad["utilization"] == pytest.approx(1 / 6)
+
+
+def test_simulation_receives_order_events():
+    """Test that the kitchen works as an order observer with quantities and batches."""
+    kitchen = SimulatedKitchen(stations())
+    order = Order(Customer("Alice"))
+    order.attach(kitchen)
+
+    order.add_dish(BURGER, qty=2)
+    with order.batch():
+        order.add_dish(SALAD)
+        order.add_dish(SALAD)
+    kitchen.run()
+
+    report = kitchen.report()
+    assert report["tickets"] == 2
+    assert report["stations"]["grill"]["served"] == 1
+    assert report["stations"]["salad"]["served"] == 1
+    assert report["latency"]["max"] == 4.0
+
+
+def test_simulation_rejects_time_travel():
+    """Test that events cannot be submitted in the simulated past."""
+    kitchen = SimulatedKitchen(stations())
+    kitchen.submit(Order(Customer("A")), [(SALAD, 1)], at=5)
+    with pytest.raises(ValueError):
+        kitchen.submit(Order(Customer("B")), [(SALAD, 1)], at=1)
+
+
+def test_threaded_kitchen_prepares_every_ticket():
+    """Test that real-time station workers finish every ticket."""
+    with ThreadedKitchen(stations(cooks=2), time_scale=0.001) as kitchen:
+        for i in range(10):
+            kitchen.submit(Order(Customer(f"customer-{i}")), [(BURGER, 1), (SALAD, 1)])
+        kitchen.drain()
+        report = kitchen.report()
+
+    assert report["tickets"] == 10
+    assert report["stations"]["grill"]["served"] == 10
+    assert 0 < report["stations"]["grill"]["utilization"] <= 1
+    assert report["latency"]["p50"] > 0
+
+
+def test_threaded_kitchen_backpressure():
+    """Test that a full station queue raises when blocking is disabled."""
+    entered, gate = threading.Event(), threading.Event()
+
+    def gated(dish):
+        entered.set()
+        gate.wait()
+        return 0.0
+
+    kitchen = ThreadedKitchen([Station("grill", service_time=gated, max_queue=1)], block=False)
+    try:
+        kitchen.submit(Order(Customer("A")), [(BURGER, 1)])
+        entered.wait()
+        kitchen.submit(Order(Customer("B")), [(BURGER, 1)])
+        with pytest.raises(DispatchQueueFull):
+            kitchen.submit(Order(Customer("C")), [(BURGER, 1)])
+    finally:
+        gate.set()
+        kitchen.drain()
+        kitchen.close()
+    assert kitchen.report()["stations"]["grill"]["blocked"] == 1
+
+
+def flaky(dish):
+    if dish is SUSHI:
+        raise ValueError("no sushi chef")
+    return 1.0
+
+
+def test_service_errors_are_recorded_per_ticket():
+    """Test that a failing service time is recorded on its ticket and every kitchen keeps cooking."""
+    async def run_async():
+        async with AsyncKitchen([Station("main", service_time=flaky)], time_scale=0.001) as kitchen:
+            tickets = [await kitchen.submit_async(Order(Customer("A")), [(dish, 1)]) for dish in (SUSHI, BURGER, SALAD)]
+            await kitchen.drain()
+            return kitchen, tickets
+
+    simulated = SimulatedKitchen([Station("main", service_time=flaky, max_queue=1)])
+    sim_tickets = [simulated.submit(Order(Customer("A")), [(dish, 1)]) for dish in (BURGER, SUSHI, SALAD)]
+    simulated.run()
+    with ThreadedKitchen([Station("main", service_time=flaky)], time_scale=0.001) as threaded:
+        thread_tickets = [threaded.submit(Order(Customer("A")), [(dish, 1)]) for dish in (SUSHI, BURGER, SALAD)]
+        threaded.drain()
+
+    for kitchen, tickets in ((threaded, thread_tickets), asyncio.run(run_async()), (simulated, sim_tickets)):
+        failed = next(ticket for ticket in tickets if ticket.error is not None)
+        assert isinstance(failed.error, ValueError) and not failed.done
+        assert kitchen.errors == [(failed, failed.error)]
+        assert sum(ticket.done for ticket in tickets) == 2
+        assert kitchen.report()["tickets"] == 2
+
+
+def test_kitchen_requires_enqueue():
+    """Test that the base kitchen is abstract."""
+    with pytest.raises(TypeError):
+        Kitchen(stations(), clock=lambda: 0.0)
+
+
+def test_async_kitchen_prepares_every_ticket():
+    """Test the asyncio kitchen with awaited backpressure."""
+    async def scenario():
+        async with AsyncKitchen(stations(), time_scale=0.001) as kitchen:
+            for i in range(5):
+                await kitchen.submit_async(Order(Customer(f"customer-{i}")), [(BURGER, 1), (SALAD, 1)])
+            await kitchen.drain()
+            return kitchen.report()
+
+    report = asyncio.run(scenario())
+    assert report["tickets"] == 5
+    assert report["stations"]["salad"]["served"] == 5
+    assert report["stations"]["grill"]["max_queue_depth"] <= 1
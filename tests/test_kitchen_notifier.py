@@ -0,0 +1,164 @@
+import io
+import time
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from notifier.kitchen_notifier import KitchenObserver
+from notifier.output_sink import KitchenOutputSink
+
+
+def test_standard_order_output():
+    """Test the notification text for a standard order."""
+    stream = io.StringIO()
+    order = Order(Customer("Alice"))
+    order.attach(KitchenObserver(KitchenOutputSink(stream)))
+
+    order.add_dish(Dish("Pizza", 150))
+    order.add_dish(Dish("Sushi", 200))
+
+    assert stream.getvalue() == (
+        "Kitchen notified of new order: Standard Order for Alice\n"
+        "Items: Pizza ($150)\n"
+        "Kitchen notified of new order: Standard Order for Alice\n"
+        "Items: Pizza ($150), Sushi ($200)\n"
+    )
+
+
+def test_bulk_order_output():
+    """Test that bulk orders are detected by type and show their discount."""
+    stream = io.StringIO()
+    order = BulkOrder(Customer("Bob"))
+    order.attach(KitchenObserver(KitchenOutputSink(stream)))
+
+    order.add_dishes([Dish("Burger", 120), Dish("Salad", 80)])
+
+    assert stream.getvalue() == (
+        "Kitchen notified of new order: Bulk Order for Bob with 10% discount\n"
+        "Items: Burger ($120), Salad ($80)\n"
+    )
+
+
+def test_items_rerendered_after_removal():
+    """Test that the cached item line is rebuilt when dishes were removed."""
+    stream = io.StringIO()
+    order = Order(Customer("Charlie"))
+    order.attach(KitchenObserver(KitchenOutputSink(stream)))
+    salad = Dish("Salad", 80)
+
+    order.add_dishes([salad, Dish("Steak", 250)])
+    order.remove_dish(salad)
+    order.add_dish(Dish("Soup", 60))
+
+    assert stream.getvalue().splitlines()[-1] == "Items: Steak ($250), Soup ($60)"
+
+
+def test_dish_fragments_are_cached():
+    """Test that each distinct dish is formatted only once."""
+    observer = KitchenObserver(KitchenOutputSink(io.StringIO()))
+    order = Order(Customer("David"))
+    order.attach(observer)
+
+    order.add_dish(Dish("Pizza", 150))
+    order.add_dish(Dish("Pizza", 150))
+
+    assert observer._fragments == {Dish("Pizza", 150): "Pizza ($150)"}
+
+
+def test_sink_buffers_until_size_reached():
+    """Test that the sink only writes once its buffer size is reached."""
+    stream = io.StringIO()
+    sink = KitchenOutputSink(stream, buffer_size=10)
+
+    sink.write("abc")
+    assert stream.getvalue() == ""
+    sink.write("defghij")
+    assert stream.getvalue() == "abcdefghij"
+
+
+def test_sink_flushes_on_interval():
+    """Test that a zero flush interval writes every write straight through."""
+    stream = io.StringIO()
+    sink = KitchenOutputSink(stream, buffer_size=1000, flush_interval=0)
+
+    sink.write("abc")
+
+    assert stream.getvalue() == "abc"
+
+
+def test_sink_flushes_idle_buffer_after_interval():
+    """Test that buffered output is written once the interval passes, without another write."""
+    stream = io.StringIO()
+    sink = KitchenOutputSink(stream, buffer_size=1 << 20, flush_interval=0.02)
+
+    sink.write("last ticket")
+    assert stream.getvalue() == ""
+    deadline = time.monotonic() + 2
+    while not stream.getvalue() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stream.getvalue() == "last ticket"
+
+
+def test_sink_explicit_flush():
+    """Test that flushing the observer writes buffered notifications."""
+    stream = io.StringIO()
+    observer = KitchenObserver(KitchenOutputSink(stream, buffer_size=1 << 20))
+    order = Order(Customer("Eve"))
+    order.attach(observer)
+
+    order.add_dish(Dish("Pasta", 130))
+    assert stream.getvalue() == ""
+
+    observer.flush()
+    assert "Items: Pasta ($130)" in stream.getvalue()
+
+
+def test_quantities_rendered_once_per_line():
+    """Test that repeated dishes are rendered as one line with a quantity."""
+    stream = io.StringIO()
+    order = Order(Customer("Frank"))
+    order.attach(KitchenObserver(KitchenOutputSink(stream)))
+
+    order.add_dish(Dish("Sandwich", 5), qty=300)
+    order.add_dish(Dish("Juice", 2))
+    order.add_dish(Dish("Juice", 2))
+
+    assert stream.getvalue().splitlines()[1::2] == [
+        "Items: Sandwich ($5) x300",
+        "Items: Sandwich ($5) x300, Juice ($2)",
+        "Items: Sandwich ($5) x300, Juice ($2) x2",
+    ]
+
+
+def test_items_rerendered_after_quantity_reduced():
+    """Test that reducing a quantity invalidates the cached item line."""
+    stream = io.StringIO()
+    order = Order(Customer("Gail"))
+    order.attach(KitchenObserver(KitchenOutputSink(stream)))
+    pizza = Dish("Pizza", 150)
+
+    order.add_dish(pizza, qty=3)
+    order.remove_dish(pizza)
+    order.add_dish(Dish("Soup", 60))
+
+    assert stream.getvalue().splitlines()[-1] == "Items: Pizza ($150) x2, Soup ($60)"
+
+
+def test_items_rerendered_when_unit_counts_line_up():
+    """Test that changes the observer missed are not hidden by a matching unit count."""
+    stream = io.StringIO()
+    observer = KitchenObserver(KitchenOutputSink(stream))
+    order = Order(Customer("Grace"))
+    pizza = Dish("Pizza", 150)
+
+    order.attach(observer)
+    order.add_dish(pizza)
+    order.detach(observer)
+    order.add_dish(Dish("Salad", 80))
+    order.remove_dish(pizza)
+    order.attach(observer)
+    order.add_dish(pizza)
+
+    assert stream.getvalue().splitlines()[-1] == "Items: Salad ($80), Pizza ($150)"
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from benchmarks import loadgen
+from benchmarks.loadgen import LoadConfig, order_specs, run_load
+from patterns.database import Database
+from patterns.event_bus import EVENT_BUS
+from patterns.observer import OrderSubject
+
+
+@pytest.mark.parametrize("mode", ["thread", "asyncio", "process"])
+def test_run_load_places_every_order(mode):
+    """Test that every concurrency mode places and stores all orders."""
+    report = run_load(LoadConfig(orders=60, workers=2, mode=mode))
+
+    assert report["orders"] == report["stored"] == 60
+    assert report["orders_per_sec"] > 0
+    assert 0 <= report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+
+
+def test_run_load_restores_global_state():
+    """Test that a run leaves the singleton, dispatcher and event bus as it found them."""
+    Database._instance = None
+    db = Database.get_instance()
+
+    run_load(LoadConfig(orders=20, workers=2, dispatch="async", storage="log"))
+
+    assert Database.get_instance() is db
+    assert OrderSubject._default_dispatcher is None
+    assert len(EVENT_BUS) == 0
+    Database._instance = None
+
+
+def test_rate_limit_paces_arrivals():
+    """Test that a target rate spreads the orders over the expected time."""
+    report = run_load(LoadConfig(orders=40, workers=2, rate=400))
+
+    assert report["elapsed"] >= 0.09
+    assert report["orders_per_sec"] <= 450
+
+
+def test_order_mix_and_dish_counts():
+    """Test the bulk share and dish count bounds of the generated workload."""
+    config = LoadConfig(orders=2000, workers=1, bulk_ratio=0.25, dish_count=(2, 4), distribution="geometric")
+    specs = list(order_specs(config, 0))
+
+    bulk = sum(kind == "bulk" for _, _, kind, _ in specs)
+    assert 400 < bulk < 600
+    assert all(2 <= len(dishes) <= 4 for _, _, _, dishes in specs)
+    assert specs == list(order_specs(config, 0))
+
+
+def test_invalid_config():
+    """Test that invalid load settings are rejected."""
+    with pytest.raises(ValueError):
+        LoadConfig(mode="fiber")
+    with pytest.raises(ValueError):
+        LoadConfig(dish_count=(3, 1))
+
+
+def test_main_writes_json_and_kitchen_output(tmp_path, capsys):
+    """Test the CLI with redirected kitchen output and a JSON report."""
+    kitchen, output = tmp_path / "kitchen.txt", tmp_path / "load.json"
+
+    assert loadgen.main(["--orders", "10", "--workers", "1", "--kitchen-output", str(kitchen),
+                         "--output", str(output)]) == 0
+
+    assert "orders/s" in capsys.readouterr().out
+    assert json.loads(output.read_text())["stored"] == 10
+    assert kitchen.read_text().count("Kitchen notified") >= 10
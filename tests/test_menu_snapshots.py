@@ -0,0 +1,172 @@
+import threading
+
+import pytest
+
+from models.customer import Customer
+from models.dish import Dish
+from models.menu import Menu, MenuSnapshot
+from models.order import Order
+from patterns.database import Database
+from patterns.importer import OrderImporter
+from patterns.serialization import order_from_record, order_to_record
+from patterns.snapshot import ITEM, MAGIC_V1, ORDER, ORDER_V1, SnapshotStorage, write_snapshot
+from patterns.storage import SQLiteStorage
+
+PIZZA = Dish("Pizza", 150)
+SALAD = Dish("Salad", 80)
+
+
+def make_menu():
+    menu = Menu()
+    menu.add_dishes([PIZZA, SALAD])
+    return menu
+
+
+def test_readers_share_the_snapshot():
+    """Test that reads return the current snapshot without copying it."""
+    menu = make_menu()
+
+    assert menu.list_dishes() is menu.snapshot()
+    assert isinstance(menu.snapshot(), MenuSnapshot)
+    assert menu.list_dishes() == [PIZZA, SALAD]
+    assert PIZZA in menu.snapshot()
+
+
+def test_changes_publish_new_versions():
+    """Test that every change swaps in a new version and leaves old snapshots untouched."""
+    menu = Menu()
+    assert menu.version == 0
+    menu.add_dishes([PIZZA, SALAD])
+    before = menu.snapshot()
+
+    menu.remove_dish(SALAD)
+
+    assert menu.version == before.version + 1
+    assert before == [PIZZA, SALAD]
+    assert menu.list_dishes() == [PIZZA]
+    assert not menu.contains_dish(SALAD)
+
+
+def test_reprice_keeps_position_and_indexes():
+    """Test that repricing replaces the dish and updates every lookup."""
+    menu = make_menu()
+
+    cheaper = menu.reprice(PIZZA, 50)
+
+    assert cheaper == Dish("Pizza", 50)
+    assert menu.list_dishes() == [cheaper, SALAD]
+    assert menu.find_by_name("Pizza") == [cheaper]
+    assert menu.cheapest(1) == [cheaper]
+    assert menu.dishes_in_price_range(100, 200) == []
+    assert not menu.contains_dish(PIZZA)
+
+
+def test_changing_missing_dish_raises():
+    """Test that removing or repricing a dish that is not on the menu raises ValueError."""
+    menu = make_menu()
+    with pytest.raises(ValueError):
+        menu.remove_dish(Dish("Sushi", 200))
+    with pytest.raises(ValueError):
+        menu.reprice(Dish("Pizza", 1), 2)
+    assert menu.version == 1
+
+
+def test_repricing_does_not_change_historical_totals():
+    """Test that orders keep the prices and menu version they were priced against."""
+    menu = make_menu()
+    order = Order(Customer("Alice"))
+    order.menu_version = menu.version
+    order.add_dish(menu.find_by_name("Pizza")[0], qty=2)
+
+    menu.reprice(PIZZA, 500)
+
+    assert order.calculate_total() == 300
+    assert order.menu_version == menu.version - 1
+    restored = order_from_record(order_to_record(order))
+    assert restored.menu_version == order.menu_version
+
+
+def test_durable_backends_keep_menu_version(tmp_path):
+    """Test that SQLite and binary snapshots store the menu version, or None when unset."""
+    stamped, unstamped = Order(Customer("Alice")), Order(Customer("Bob"))
+    stamped.menu_version = 7
+    for order in (stamped, unstamped):
+        order.add_dish(PIZZA)
+
+    sqlite = SQLiteStorage(tmp_path / "orders.db")
+    sqlite.extend([stamped, unstamped])
+    sqlite.close()
+    write_snapshot(tmp_path / "orders.snap", [stamped, unstamped])
+    reopened = SQLiteStorage(tmp_path / "orders.db")
+    snapshot = SnapshotStorage(tmp_path / "orders.snap")
+    try:
+        for storage in (reopened, snapshot):
+            assert [order.menu_version for order in storage] == [7, None]
+            assert storage.get(0).menu_version == 7
+    finally:
+        reopened.close()
+        snapshot.close()
+
+
+def test_version_one_snapshots_are_still_read(tmp_path):
+    """Test that snapshots written before the menu version field open without one."""
+    order = Order(Customer("Alice"))
+    order.menu_version = 3
+    order.add_dish(PIZZA, qty=2)
+    path = tmp_path / "orders.snap"
+    write_snapshot(path, [order])
+
+    # Rewrite the only order record, just before the only item, in the version 1 layout.
+    data = bytearray(path.read_bytes())
+    start = len(data) - ITEM.size - ORDER.size
+    fields = ORDER.unpack_from(data, start)[:-1]
+    data[start:start + ORDER.size] = ORDER_V1.pack(fields[0], fields[1] & 1, *fields[2:])
+    data[:len(MAGIC_V1)] = MAGIC_V1
+    path.write_bytes(bytes(data))
+
+    snapshot = SnapshotStorage(path)
+    try:
+        restored = snapshot.get(0)
+        assert restored.menu_version is None
+        assert restored.line_items == [(PIZZA, 2)]
+    finally:
+        snapshot.close()
+
+
+def test_concurrent_readers_see_whole_versions():
+    """Test that readers racing a writer always see a complete snapshot."""
+    menu = Menu()
+    stop = threading.Event()
+    torn = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = menu.snapshot()
+            if len(snapshot) != snapshot.version:
+                torn.append(snapshot)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(300):
+        menu.add_dish(Dish(f"dish-{i}", i))
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert torn == []
+    assert len(menu.list_dishes()) == 300
+
+
+def test_importer_records_menu_version(tmp_path):
+    """Test that imported orders carry the version of the menu they were priced from."""
+    Database._instance = None
+    db = Database()
+    path = tmp_path / "orders.jsonl"
+    path.write_text('{"type": "standard", "customer": "Ann", "items": [["Pizza", 2]]}\n')
+    menu = make_menu()
+
+    OrderImporter(menu, db=db, workers=0).import_file(path)
+
+    assert db.list_orders()[0].menu_version == menu.version
+    Database._instance = None
@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+
+from models.customer import Customer
+from models.dish import Dish
+from patterns.database import Database
+from patterns.metrics import METRICS
+from patterns.observer import KitchenNotifier
+from patterns.order_factory import OrderFactory
+
+
+class QuickNotifier(KitchenNotifier):
+    """A notifier that returns immediately."""
+
+    def notify(self, order):
+        pass
+
+
+class SlowNotifier(KitchenNotifier):
+    """A notifier that stalls like a jammed printer."""
+
+    def notify(self, order):
+        time.sleep(0.02)
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    METRICS.reset()
+    yield METRICS
+    METRICS.disable()
+    METRICS.profile_notifications(None)
+    METRICS.reset()
+
+
+def run_pipeline():
+    Database._instance = None
+    db = Database.get_instance()
+    order = OrderFactory.create_order("bulk", Customer("Alice"))
+    order.attach(QuickNotifier())
+    order.add_dish(Dish("Pizza", 150))
+    order.calculate_total()
+    db.add_order(order)
+    Database._instance = None
+
+
+def counts(snapshot):
+    return {(entry["site"], entry["observer"]): entry["count"] for entry in snapshot["sites"]}
+
+
+def test_disabled_records_nothing(metrics):
+    """Test that nothing is recorded while instrumentation is off."""
+    run_pipeline()
+    assert metrics.snapshot()["sites"] == []
+
+
+def test_enabled_records_every_site(metrics):
+    """Test that each hot path is counted, with observer deliveries per class."""
+    metrics.enable()
+    run_pipeline()
+
+    assert counts(metrics.snapshot()) == {
+        ("database.add_order", ""): 1,
+        ("factory.create_order", ""): 1,
+        ("observer.notify", "QuickNotifier"): 1,
+        ("order.add_dish", ""): 1,
+        ("order.calculate_total", ""): 1,
+        ("subject.notify_all", ""): 1,
+    }
+
+
+def test_prometheus_exposition(metrics):
+    """Test the Prometheus-style text export."""
+    metrics.enable()
+    run_pipeline()
+    text = metrics.to_prometheus()
+
+    assert "# TYPE restaurant_call_seconds histogram" in text
+    assert 'restaurant_calls_total{site="order.add_dish"} 1' in text
+    assert 'restaurant_call_seconds_bucket{site="observer.notify",observer="QuickNotifier",le="+Inf"} 1' in text
+    assert 'restaurant_call_seconds_count{site="database.add_order"} 1' in text
+
+
+def test_json_snapshot(metrics):
+    """Test that the JSON snapshot has cumulative bucket counts."""
+    metrics.enable()
+    run_pipeline()
+    snapshot = json.loads(metrics.to_json())
+
+    assert snapshot["enabled"] is True
+    for entry in snapshot["sites"]:
+        assert entry["cumulative"][-1] == entry["count"]
+        assert entry["cumulative"] == sorted(entry["cumulative"])
+
+
+def test_slow_notifications_are_attributed(metrics):
+    """Test that the sampling hook reports slow notifications with their notifier and profile."""
+    reports = []
+    metrics.enable()
+    metrics.profile_notifications(reports.append, threshold=0.01, sample_rate=1.0)
+
+    order = OrderFactory.create_order("standard", Customer("Bob"))
+    order.attach(QuickNotifier())
+    order.attach(SlowNotifier())
+    order.add_dish(Dish("Burger", 120))
+
+    assert [report.observer for report in reports] == ["SlowNotifier"]
+    assert reports[0].seconds >= 0.01
+    assert reports[0].order is order
+    assert reports[0].stats is not None
+    assert counts(metrics.snapshot())[("observer.notify", "SlowNotifier")] == 1
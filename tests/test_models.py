@@ -1,3 +1,5 @@
+import pytest
+
 from models.customer import Customer
 from models.dish import Dish
 from models.menu import Menu
@@ -28,3 +30,52 @@ def test_menu_list_dishes():
 def test_customer_creation():
     c = Customer("Bob")
     assert c.name == "Bob"
+
+
+def test_dish_is_read_only():
+    d = Dish("Burger", 100)
+    with pytest.raises(AttributeError):
+        d.price = 90
+
+
+def test_menu_find_by_name():
+    menu = Menu()
+    small = Dish("Pizza", 150)
+    large = Dish("Pizza", 220)
+    menu.add_dish(small)
+    menu.add_dish(Dish("Sushi", 200))
+    menu.add_dish(large)
+    assert menu.find_by_name("Pizza") == [small, large]
+    assert menu.find_by_name("Pasta") == []
+
+
+def test_menu_dishes_in_price_range():
+    menu = Menu()
+    for name, price in [("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80)]:
+        menu.add_dish(Dish(name, price))
+    in_range = menu.dishes_in_price_range(100, 150)
+    assert [dish.name for dish in in_range] == ["Burger", "Pizza"]
+    assert menu.dishes_in_price_range(300, 400) == []
+
+
+def test_menu_cheapest():
+    menu = Menu()
+    for name, price in [("Pizza", 150), ("Sushi", 200), ("Burger", 120), ("Salad", 80)]:
+        menu.add_dish(Dish(name, price))
+    assert [dish.name for dish in menu.cheapest(2)] == ["Salad", "Burger"]
+    assert len(menu.cheapest(10)) == 4
+    assert menu.cheapest(0) == []
+
+
+def test_dish_intern_shares_instances():
+    pizza = Dish.intern("Pizza", 150)
+    assert Dish.intern("Pizza", 150) is pizza
+    assert Dish.intern("Pizza", 160) is not pizza
+    assert pizza == Dish("Pizza", 150)
+
+
+def test_models_use_slots():
+    assert not hasattr(Dish("Pizza", 150), "__dict__")
+    assert not hasattr(Customer("Bob"), "__dict__")
+    with pytest.raises(AttributeError):
+        Customer("Bob").email = "bob@example.com"
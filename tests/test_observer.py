@@ -1,3 +1,5 @@
+import pytest
+
 from models.customer import Customer
 from models.dish import Dish
 from models.order import Order
@@ -91,3 +93,112 @@ def test_kitchen_observer_implementation(capsys):
     captured = capsys.readouterr()
     assert "Kitchen notified of new order" in captured.out
     assert "Frank" in captured.out
+
+
+class RecordingNotifier(KitchenNotifier):
+    """A notifier that records every delta it receives."""
+
+    def __init__(self):
+        self.deltas = []
+
+    def notify(self, order):
+        pass
+
+    def notify_added(self, order, items):
+        self.deltas.append(items)
+
+
+def test_notify_carries_added_dish():
+    """Test that a single add_dish notification carries the new dish."""
+    order = Order(Customer("Gina"))
+    notifier = RecordingNotifier()
+    order.attach(notifier)
+
+    pizza = Dish("Pizza", 150)
+    order.add_dish(pizza)
+
+    assert notifier.deltas == [((pizza, 1),)]
+
+
+def test_add_dishes_notifies_once():
+    """Test that add_dishes sends one notification with all new dishes."""
+    order = Order(Customer("Hugo"))
+    notifier = RecordingNotifier()
+    order.attach(notifier)
+    order.add_dish(Dish("Soup", 60))
+
+    dishes = [Dish("Pizza", 150), Dish("Sushi", 200), Dish("Salad", 80)]
+    order.add_dishes(dishes)
+
+    assert notifier.deltas[1] == tuple((dish, 1) for dish in dishes)
+    assert len(notifier.deltas) == 2
+    assert len(order.dishes) == 4
+    assert order.calculate_total() == 490
+
+
+def test_add_dishes_empty_does_not_notify():
+    """Test that adding no dishes does not notify observers."""
+    order = Order(Customer("Iris"))
+    notifier = MockKitchenNotifier()
+    order.attach(notifier)
+
+    order.add_dishes([])
+
+    assert not notifier.notified
+
+
+def test_batch_coalesces_notifications():
+    """Test that notifications inside a batch are coalesced into one."""
+    order = Order(Customer("Jon"))
+    notifier = RecordingNotifier()
+    order.attach(notifier)
+
+    with order.batch():
+        order.add_dish(Dish("Pizza", 150))
+        with order.batch():
+            order.add_dishes([Dish("Sushi", 200), Dish("Salad", 80)])
+            order.add_dish(Dish("Pizza", 150), qty=2)
+        assert notifier.deltas == []
+
+    assert notifier.deltas == [((Dish("Pizza", 150), 3), (Dish("Sushi", 200), 1), (Dish("Salad", 80), 1))]
+
+
+def test_batch_without_changes_does_not_notify():
+    """Test that an empty batch sends no notification."""
+    order = Order(Customer("Kim"))
+    notifier = MockKitchenNotifier()
+    order.attach(notifier)
+
+    with order.batch():
+        pass
+
+    assert not notifier.notified
+
+
+def test_default_notify_added_calls_notify():
+    """Test that notifiers implementing only notify still receive batched notifications."""
+    order = Order(Customer("Lara"))
+    notifier = MockKitchenNotifier()
+    order.attach(notifier)
+
+    order.add_dishes([Dish("Pizza", 150), Dish("Sushi", 200)])
+
+    assert notifier.notified
+    assert notifier.last_order == order
+
+
+def test_observer_list_allocated_lazily():
+    """Test that orders only allocate an observer list once one is attached."""
+    order = Order(Customer("Mona"))
+    assert order._observers is None
+
+    order.add_dish(Dish("Pizza", 150))
+    order.attach(MockKitchenNotifier())
+    assert len(order._observers) == 1
+
+
+def test_detach_unknown_observer():
+    """Test that detaching an observer that was never attached raises ValueError."""
+    order = Order(Customer("Nick"))
+    with pytest.raises(ValueError):
+        order.detach(MockKitchenNotifier())
@@ -1,3 +1,5 @@
+import pytest
+
 from models.bulk_order import BulkOrder
 from models.customer import Customer
 from models.dish import Dish
@@ -70,3 +72,109 @@ def test_empty_bulk_order_total():
     customer = Customer("Hank")
     order = BulkOrder(customer)
     assert order.calculate_total() == 0
+
+
+def test_order_remove_dish_updates_total():
+    """Test that removing a dish updates the running total."""
+    customer = Customer("Ivy")
+    order = Order(customer)
+    salad = Dish("Salad", 80)
+    order.add_dish(Dish("Steak", 250))
+    order.add_dish(salad)
+    order.remove_dish(salad)
+    assert order.calculate_total() == 250
+    assert order.subtotal == 250
+    assert len(order.dishes) == 1
+
+
+def test_order_remove_last_dish_resets_total():
+    """Test that removing every dish brings the total back to exactly zero."""
+    customer = Customer("Jack")
+    order = Order(customer)
+    dish = Dish("Soup", 0.1)
+    order.add_dish(dish)
+    order.add_dish(Dish("Soup", 0.2))
+    order.remove_dish(Dish("Soup", 0.2))
+    order.remove_dish(dish)
+    assert order.calculate_total() == 0
+
+
+def test_bulk_order_discount_change_recomputes_total():
+    """Test that changing the discount after adding dishes updates the cached total."""
+    customer = Customer("Kate")
+    order = BulkOrder(customer)
+    order.add_dish(Dish("Pizza", 100))
+    assert order.calculate_total() == 90
+    order.discount_percentage = 50
+    assert order.calculate_total() == 50
+    order.add_dish(Dish("Pizza", 100))
+    assert order.calculate_total() == 100
+    assert order.subtotal == 200
+
+
+def test_total_verification_detects_stale_cache():
+    """Test that the consistency check catches dishes added behind the order's back."""
+    customer = Customer("Leo")
+    order = Order(customer)
+    order.add_dish(Dish("Pizza", 100))
+    order._items[Dish("Burger", 90)] = 1
+    with pytest.raises(AssertionError):
+        order.calculate_total()
+
+
+def test_order_add_dish_with_quantity():
+    """Test that a quantity is stored as a single line item."""
+    order = BulkOrder(Customer("Mia"))
+    sandwich = Dish("Sandwich", 5)
+    order.add_dish(sandwich, qty=300)
+    order.add_dish(Dish("Juice", 2), qty=2)
+    order.add_dish(sandwich)
+    assert order.line_items == [(sandwich, 301), (Dish("Juice", 2), 2)]
+    assert order.quantity_of(sandwich) == 301
+    assert order.subtotal == 1509
+    assert order.calculate_total() == 1509 - 150.9
+
+
+def test_order_dishes_view_expands_units():
+    """Test that order.dishes still behaves like one entry per unit."""
+    order = Order(Customer("Ned"))
+    pizza = Dish("Pizza", 150)
+    order.add_dish(pizza, qty=2)
+    order.add_dish(Dish("Salad", 80))
+    assert len(order.dishes) == 3
+    assert order.dishes[1] == pizza
+    assert order.dishes[-1].name == "Salad"
+    assert list(order.dishes) == [pizza, pizza, Dish("Salad", 80)]
+    assert order.dishes == [pizza, pizza, Dish("Salad", 80)]
+    with pytest.raises(IndexError):
+        order.dishes[3]
+
+
+def test_order_remove_dish_quantity():
+    """Test that removing part of a line item keeps the rest."""
+    order = Order(Customer("Olga"))
+    pizza = Dish("Pizza", 150)
+    order.add_dish(pizza, qty=3)
+    order.remove_dish(pizza, qty=2)
+    assert order.line_items == [(pizza, 1)]
+    assert order.calculate_total() == 150
+    with pytest.raises(ValueError):
+        order.remove_dish(pizza, qty=2)
+    with pytest.raises(ValueError):
+        order.remove_dish(Dish("Sushi", 200))
+
+
+def test_order_rejects_invalid_quantity():
+    """Test that quantities must be positive integers."""
+    order = Order(Customer("Pete"))
+    for qty in (0, -1, 1.5):
+        with pytest.raises(ValueError):
+            order.add_dish(Dish("Pizza", 150), qty=qty)
+    assert order.line_items == []
+
+
+def test_order_repr_shows_quantities():
+    """Test that repr lists each distinct dish once with its quantity."""
+    order = Order(Customer("Quinn"))
+    order.add_dish(Dish("Pizza", 150), qty=2)
+    assert repr(order) == "Order(customer=Customer(name='Quinn'), items=[Dish(name='Pizza', price=150) x2])"
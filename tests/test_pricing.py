@@ -0,0 +1,170 @@
+from datetime import datetime, time
+
+import pytest
+
+from models.bulk_order import BULK_DISCOUNT, BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.pricing import (PRICING, CompiledRules, CustomerDiscount, DishDiscount, OrderDiscount,
+                              OrderTypeDiscount, PricingEngine, QuantityTier)
+
+PIZZA = Dish("Pizza", 150)
+SALAD = Dish("Salad", 80)
+TEA = Dish("Tea", 4)
+
+
+@pytest.fixture
+def rules():
+    """Restore the global pricing rules after the test."""
+    saved = PRICING.rules
+    yield PRICING
+    PRICING.set_rules(saved)
+
+
+def make_order(order_class=Order, customer="Alice", items=((PIZZA, 1), (SALAD, 1))):
+    order = order_class(Customer(customer))
+    for dish, qty in items:
+        order.add_dish(dish, qty)
+    return order
+
+
+def test_bulk_discount_is_the_default_rule():
+    """Test that the 10% bulk discount comes from the default pricing rule."""
+    assert BULK_DISCOUNT in PRICING.rules
+    bulk = make_order(BulkOrder)
+    assert bulk.calculate_total() == 207
+    bulk.discount_percentage = 50
+    assert bulk.calculate_total() == 115
+    assert make_order().calculate_total() == 230
+
+
+def test_subclasses_inherit_order_type_rules(rules):
+    """Test that order type rules apply to subclasses unless a nearer class has its own."""
+    class VipBulk(BulkOrder):
+        __slots__ = ()
+
+    class Staff(VipBulk):
+        __slots__ = ()
+
+    assert make_order(VipBulk).calculate_total() == 207
+    rules.add_rule(OrderTypeDiscount(Staff, 50))
+    assert make_order(Staff).calculate_total() == 115
+    assert make_order(VipBulk).calculate_total() == 207
+
+
+def test_dish_discounts_and_quantity_tiers(rules):
+    """Test that each line gets the best of its dish discounts and reached quantity tiers."""
+    rules.add_rule(DishDiscount(TEA, 25))
+    rules.add_rule(QuantityTier({3: 10, 5: 50}, dish="Tea"))
+    order = make_order(items=((TEA, 2), (PIZZA, 1)))
+
+    assert order.calculate_total() == 150 + 8 * 0.75
+    order.add_dish(TEA, 3)
+    assert order.calculate_total() == 150 + 20 * 0.5
+
+
+def test_order_discounts_add_up(rules):
+    """Test that order level discounts stack and apply after line discounts."""
+    rules.add_rule(CustomerDiscount("Alice", 5))
+    rules.add_rule(OrderDiscount(5))
+    rules.add_rule(OrderTypeDiscount(BulkOrder, 10))
+    rules.add_rule(QuantityTier({2: 1, 4: 2}))
+
+    assert make_order(customer="Bob").calculate_total() == pytest.approx(230 * 0.94)
+    assert make_order(BulkOrder).calculate_total() == pytest.approx(230 * 0.69)
+
+
+def test_discount_is_capped(rules):
+    """Test that stacked order discounts never make an order negative."""
+    rules.add_rule(OrderDiscount(60))
+    rules.add_rule(CustomerDiscount("Alice", 60))
+
+    assert make_order().calculate_total() == 0
+
+
+def test_rule_changes_apply_to_orders_changed_afterwards(rules):
+    """Test that a rule change leaves existing totals alone and prices orders changed afterwards."""
+    order = make_order()
+    assert order.calculate_total() == 230
+    promotion = DishDiscount("Pizza", 100)
+    rules.add_rule(promotion)
+    assert order.calculate_total() == 230
+    assert make_order().calculate_total() == 80
+    order.add_dish(SALAD)
+    assert order.calculate_total() == 160
+    rules.remove_rule(promotion)
+    assert order.calculate_total() == 160
+
+
+def test_orders_keep_the_happy_hour_they_were_placed_in(rules):
+    """Test that an order placed during a happy hour keeps its discount after the window ends."""
+    now = [datetime(2026, 1, 1, 17, 30)]
+    saved_clock = rules.clock
+    rules.clock = lambda: now[0]
+    try:
+        rules.set_rules(rules.rules + (OrderDiscount(50, window=(time(17), time(19))),))
+        order = make_order()
+        assert order.calculate_total() == 115
+        now[0] = datetime(2026, 1, 1, 19, 30)
+        assert order.calculate_total() == 115
+        assert make_order().calculate_total() == 230
+    finally:
+        rules.clock = saved_clock
+
+
+def test_time_window_recompiles_at_boundaries():
+    """Test that a happy hour rule only applies inside its daily window."""
+    now = [datetime(2026, 1, 1, 16, 59)]
+    engine = PricingEngine([OrderDiscount(20, window=(time(17), time(19)))], clock=lambda: now[0])
+    order = make_order()
+
+    outside = engine.compiled()
+    assert engine.price(order) == 230
+    now[0] = datetime(2026, 1, 1, 17, 0)
+    assert engine.compiled() is not outside
+    assert engine.price(order) == 184
+    now[0] = datetime(2026, 1, 1, 18, 0)
+    assert engine.price(order) == 184
+    now[0] = datetime(2026, 1, 1, 19, 0)
+    assert engine.price(order) == 230
+
+
+def test_window_past_midnight():
+    """Test a window that wraps around midnight."""
+    late = OrderDiscount(10, window=(time(22), time(2)))
+    assert late.active(datetime(2026, 1, 1, 23, 30))
+    assert late.active(datetime(2026, 1, 2, 1, 0))
+    assert not late.active(datetime(2026, 1, 2, 12, 0))
+    assert late.next_change(datetime(2026, 1, 1, 23, 30)) == datetime(2026, 1, 2, 2, 0)
+
+
+def test_compiled_threshold_tables():
+    """Test the quantity threshold lookups of a compiled rule set."""
+    compiled = CompiledRules([QuantityTier({5: 10, 2: 5, 10: 8}, dish="Tea"), DishDiscount("Tea", 1)])
+
+    assert [compiled.line_percent("Tea", qty) for qty in (1, 2, 5, 10, 50)] == [1, 5, 10, 10, 10]
+    assert compiled.line_percent("Pizza", 100) == 0
+
+
+def test_price_batch_matches_single_orders(rules):
+    """Test that batch pricing gives the same totals as pricing orders one by one."""
+    rules.add_rule(QuantityTier({2: 10}, dish=SALAD))
+    orders = [make_order(BulkOrder if i % 2 else Order, items=((SALAD, 1 + i % 3), (PIZZA, 1))) for i in range(6)]
+
+    assert rules.price_batch(orders) == [order.calculate_total() for order in orders]
+    assert rules.price_batch([]) == []
+
+
+def test_columnar_totals_follow_rules(rules):
+    """Test that columnar analytics use the discounts the rules gave each stored order."""
+    pytest.importorskip("numpy")
+    from patterns.columnar import ColumnarOrderStore
+
+    rules.add_rule(DishDiscount(SALAD, 50))
+    orders = [make_order(), make_order(BulkOrder)]
+    store = ColumnarOrderStore()
+    store.extend(orders)
+
+    assert store.order_totals().tolist() == [order.calculate_total() for order in orders]
+    assert store.revenue_by_dish()[SALAD] == pytest.approx(40 + 40 * 0.9)
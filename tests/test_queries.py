@@ -0,0 +1,125 @@
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database, _TotalIndex
+from patterns.storage import LogStorage, MemoryStorage
+from tests.conftest import make_orders
+
+
+def fill(db):
+    orders = []
+    for i in range(20):
+        order = BulkOrder(Customer("Bob")) if i % 4 == 0 else Order(Customer("Alice" if i % 2 else "Carol"))
+        order.add_dish(Dish("Dish", 10 * (i + 1)))
+        db.add_order(order)
+        orders.append(order)
+    return orders
+
+
+def test_query_by_customer(db):
+    """Test that orders can be looked up by customer name."""
+    orders = fill(db)
+    assert list(db.iter_orders(customer="Alice")) == [o for o in orders if o.customer.name == "Alice"]
+    assert list(db.iter_orders(customer="Nobody")) == []
+
+
+def test_query_by_order_type(db):
+    """Test that order type filters match the exact class."""
+    orders = fill(db)
+    assert list(db.iter_orders(order_type=BulkOrder)) == [o for o in orders if isinstance(o, BulkOrder)]
+    assert all(type(o) is Order for o in db.iter_orders(order_type=Order))
+
+
+def test_query_by_total_range(db):
+    """Test that the total index returns orders in insertion order."""
+    orders = fill(db)
+    expected = [o for o in orders if 50 <= o.calculate_total() <= 120]
+    assert list(db.iter_orders(min_total=50, max_total=120)) == expected
+    assert list(db.iter_orders(min_total=195)) == [orders[-1]]
+
+
+def test_query_combined_filters(db):
+    """Test that several filters are applied together."""
+    orders = fill(db)
+    expected = [o for o in orders if o.customer.name == "Alice" and o.calculate_total() >= 100]
+    assert list(db.iter_orders(customer="Alice", min_total=100)) == expected
+
+
+def test_query_pages(db):
+    """Test that cursor-based pages cover every match exactly once."""
+    orders = fill(db)
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = db.query_page(limit=3, cursor=cursor, customer="Carol")
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert seen == [o for o in orders if o.customer.name == "Carol"]
+
+
+def test_total_range_pages_span_index_blocks(db, monkeypatch):
+    """Test paging a total range across full and partial blocks of the total index."""
+    monkeypatch.setattr(_TotalIndex, "BLOCK", 4)
+    orders = fill(db)
+    expected = [o for o in orders if 30 <= o.calculate_total() <= 150]
+    for limit in (1, 3, 5):
+        seen, cursor = [], None
+        while True:
+            page, cursor = db.query_page(limit=limit, cursor=cursor, min_total=30, max_total=150)
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert seen == expected
+    assert list(db.iter_orders(min_total=0)) == orders
+    assert list(db.iter_orders(max_total=35, after=1)) == orders[2:3]
+
+
+def test_query_page_exact_fit(db):
+    """Test that the last full page reports no further cursor."""
+    fill(db)
+    page, cursor = db.query_page(limit=20)
+    assert len(page) == 20
+    assert cursor is None
+
+
+def test_unfiltered_pages_skip_indexing(reset_database):
+    """Test that paging reopened storage without filters does not build the indexes."""
+    orders = make_orders(20)
+    storage = MemoryStorage()
+    storage.extend(orders)
+    database = Database(storage)
+    seen, cursor = [], None
+    while True:
+        page, cursor = database.query_page(limit=7, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert seen == orders
+    assert database._indexed == 0
+
+
+def test_query_page_rejects_bad_limit(db):
+    """Test that a page limit must be positive."""
+    with pytest.raises(ValueError):
+        db.query_page(limit=0)
+
+
+def test_indexes_rebuilt_from_storage(tmp_path, reset_database):
+    """Test that indexes are rebuilt when a durable backend is reopened."""
+    path = tmp_path / "orders.log"
+    db = Database(LogStorage(path))
+    fill(db)
+    db.close()
+
+    Database._instance = None
+    db = Database(LogStorage(path))
+    bulk = list(db.iter_orders(order_type=BulkOrder))
+    assert [o.calculate_total() for o in bulk] == [9.0, 45.0, 81.0, 117.0, 153.0]
+    page, cursor = db.query_page(limit=2, customer="Alice")
+    assert [o.calculate_total() for o in page] == [20, 40]
+    assert cursor == 3
+    db.close()
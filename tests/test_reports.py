@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+from patterns.pricing import PRICING, OrderDiscount
+from patterns.storage import LogStorage
+from reports.renderer import OrderRenderer, write_report
+
+
+class CountingStream(io.StringIO):
+    """A stream that counts write calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_orders():
+    standard = Order(Customer("Alice"))
+    standard.add_dish(Dish("Pizza", 150), qty=2)
+    standard.add_dish(Dish("Sushi", 200))
+    bulk = BulkOrder(Customer("Bob"))
+    bulk.add_dish(Dish("Burger", 120))
+    return [standard, bulk]
+
+
+def test_render_text_by_type():
+    """Test the plain text rendering of standard and bulk orders."""
+    renderer = OrderRenderer()
+    standard, bulk = make_orders()
+    assert renderer.render(standard) == "Order for Alice: Pizza ($150) x2, Sushi ($200)"
+    assert renderer.render(bulk) == "Bulk Order for Bob: Burger ($120) with 10% discount"
+
+
+def test_render_is_memoized_until_order_changes():
+    """Test that cached text is reused and invalidated by the order version."""
+    renderer = OrderRenderer()
+    order, bulk = make_orders()
+    first = renderer.render(order)
+    assert renderer.render(order) is first
+
+    order.add_dish(Dish("Tea", 3))
+    assert renderer.render(order).endswith("Tea ($3)")
+
+    bulk.discount_percentage = 25
+    assert renderer.render(bulk).endswith("with 25% discount")
+
+
+def test_rendered_totals_follow_the_order_not_the_rules():
+    """Test that cached totals keep the order's pricing and change only when the order does."""
+    renderer = OrderRenderer()
+    order = make_orders()[0]
+    assert json.loads(renderer.render(order, "json"))["total"] == 500
+
+    rule = OrderDiscount(50)
+    PRICING.add_rule(rule)
+    try:
+        assert json.loads(renderer.render(order, "json"))["total"] == 500
+        order.add_dish(Dish("Pizza", 150))
+        assert json.loads(renderer.render(order, "json"))["total"] == 325
+        assert renderer.render(order, "csv").endswith(",325.0")
+    finally:
+        PRICING.remove_rule(rule)
+    assert json.loads(renderer.render(order, "json"))["total"] == 325
+
+
+def test_write_text_report_in_chunks():
+    """Test that a text report is numbered and written in chunks."""
+    orders = make_orders() * 5
+    stream = CountingStream()
+
+    assert write_report(iter(orders), stream, chunk_size=4) == 10
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "1. Order for Alice: Pizza ($150) x2, Sushi ($200)"
+    assert lines[9].startswith("10. Bulk Order for Bob")
+    assert stream.writes == 3
+
+
+def test_write_csv_report():
+    """Test the CSV report columns."""
+    stream = io.StringIO()
+    write_report(make_orders(), stream, format="csv")
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert rows[0] == {"type": "standard", "customer": "Alice", "items": "Pizza x2; Sushi x1",
+                       "discount": "", "total": "500"}
+    assert rows[1]["discount"] == "10"
+    assert float(rows[1]["total"]) == 108
+
+
+def test_write_json_report():
+    """Test that the JSON report is one valid array."""
+    stream = io.StringIO()
+    write_report(make_orders(), stream, format="json")
+
+    report = json.loads(stream.getvalue())
+    assert [entry["customer"] for entry in report] == ["Alice", "Bob"]
+    assert report[0]["items"] == [["Pizza", 150, 2], ["Sushi", 200, 1]]
+    assert report[1]["total"] == 108
+
+    empty = io.StringIO()
+    write_report([], empty, format="json")
+    assert json.loads(empty.getvalue()) == []
+
+
+def test_unknown_report_format():
+    """Test that unsupported formats are rejected."""
+    with pytest.raises(ValueError):
+        write_report(make_orders(), io.StringIO(), format="xml")
+    with pytest.raises(ValueError):
+        OrderRenderer().render(make_orders()[0], format="xml")
+
+
+def test_report_streams_from_database(tmp_path):
+    """Test a report streamed from a durable Database into a file."""
+    Database._instance = None
+    db = Database(LogStorage(tmp_path / "orders.log"))
+    for order in make_orders():
+        db.add_order(order)
+    report = tmp_path / "report.txt"
+
+    with open(report, "w") as output:
+        write_report(db.iter_orders(), output)
+
+    assert report.read_text().splitlines()[1] == "2. Bulk Order for Bob: Burger ($120) with 10% discount"
+    db.close()
+    Database._instance = None
@@ -0,0 +1,128 @@
+import pytest
+
+from models.bulk_order import BulkOrder
+from patterns.event_bus import EVENT_BUS
+from patterns.observer import KitchenNotifier
+from patterns.serialization import order_from_row, order_to_row
+from patterns.sharding import ShardedDatabase
+from benchmarks import sharding as sharding_benchmark
+from benchmarks.sharding import LogStorageFactory
+from tests.conftest import describe, make_orders
+
+
+@pytest.fixture
+def sharded():
+    db = ShardedDatabase(shards=3, batch_size=4)
+    yield db
+    db.close()
+
+
+def test_list_orders_merges_shards_in_insertion_order(sharded):
+    """Test that orders spread over shards come back in the order they were added."""
+    orders = make_orders(25, customers=7)
+    for order in orders[:10]:
+        sharded.add_order(order)
+    sharded.add_orders(orders[10:])
+
+    assert [describe(order) for order in sharded.list_orders()] == [describe(order) for order in orders]
+    assert sharded.count() == 25
+
+
+def test_customers_are_routed_to_one_shard(sharded):
+    """Test that a customer's orders live on one shard and a customer query finds them."""
+    orders = make_orders(21, customers=7)
+    sharded.add_orders(orders)
+
+    assert len({sharded.shard_of(f"customer-{i}") for i in range(7)}) > 1
+    found = list(sharded.iter_orders(customer="customer-3"))
+    assert [describe(order) for order in found] == [describe(order) for order in orders if order.customer.name == "customer-3"]
+
+
+def test_filtered_queries_and_aggregates(sharded):
+    """Test order type and total filters and the merged aggregates."""
+    orders = make_orders(12, customers=7)
+    sharded.add_orders(orders)
+
+    bulk = list(sharded.iter_orders(order_type=BulkOrder))
+    assert len(bulk) == 4 and all(isinstance(order, BulkOrder) for order in bulk)
+    assert len(list(sharded.iter_orders(min_total=200))) == sum(order.calculate_total() >= 200 for order in orders)
+    stats = sharded.aggregate()
+    assert stats["orders"] == 12
+    assert stats["revenue"] == pytest.approx(sum(order.calculate_total() for order in orders))
+    assert set(stats["revenue_by_type"]) == {"standard", "bulk"}
+
+
+def test_shards_do_not_touch_coordinator_state(db):
+    """Test that shards and rebuilt orders do not notify the coordinator's subscribers or reuse its singleton."""
+    class Recorder(KitchenNotifier):
+        def __init__(self):
+            self.calls = 0
+
+        def notify(self, order):
+            self.calls += 1
+
+    orders = make_orders(5, customers=7)
+    recorder = Recorder()
+    subscription = EVENT_BUS.subscribe(recorder)
+    try:
+        with ShardedDatabase(shards=2) as sharded:
+            sharded.add_orders(orders)
+            assert len(sharded.list_orders()) == 5
+    finally:
+        EVENT_BUS.unsubscribe(subscription)
+
+    assert recorder.calls == 0
+    assert db.list_orders() == []
+
+
+def test_shards_with_durable_storage(tmp_path):
+    """Test shards that write their orders to per-shard logs."""
+    with ShardedDatabase(shards=2, storage_factory=LogStorageFactory(str(tmp_path))) as db:
+        db.add_orders(make_orders(10, customers=7))
+        db.flush()
+        assert db.count() == 10
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["shard-0.log", "shard-1.log"]
+
+
+def test_closed_database_rejects_use():
+    """Test that a closed sharded database cannot be used."""
+    db = ShardedDatabase(shards=1)
+    db.close()
+    db.close()
+    with pytest.raises(RuntimeError):
+        db.add_order(make_orders(1, customers=7)[0])
+
+
+def test_rows_round_trip_orders():
+    """Test that the compact rows sent to shards keep everything an order record keeps."""
+    orders = make_orders(6)
+    orders[3].menu_version = 7
+    assert [describe(order_from_row(order_to_row(order))) for order in orders] == [
+        describe(order) for order in orders]
+
+
+def test_sharding_benchmark_runs(capsys):
+    """Test the shard scaling benchmark on a small workload."""
+    sharding_benchmark.main(["--orders", "200", "--shards", "1", "2"])
+
+    output = capsys.readouterr().out
+    assert "in-process" in output and "2 shards" in output and "coordinator" in output
+
+
+def test_shards_recover_orders_after_restart(tmp_path):
+    """Test that reopening per-shard logs recovers their orders ahead of new ones."""
+    orders = make_orders(10, customers=7)
+    factory = LogStorageFactory(str(tmp_path))
+    with ShardedDatabase(shards=2, storage_factory=factory) as db:
+        db.add_orders(orders[:6])
+
+    with ShardedDatabase(shards=2, storage_factory=factory) as db:
+        assert db.count() == 6
+        db.add_orders(orders[6:])
+        stored = db.list_orders()
+        assert db.aggregate()["orders"] == 10
+
+    assert sorted(map(describe, stored[:6]), key=repr) == sorted(map(describe, orders[:6]), key=repr)
+    assert [describe(order) for order in stored[6:]] == [describe(order) for order in orders[6:]]
+    assert [describe(order) for order in stored if order.customer.name == "customer-1"] == \
+        [describe(order) for order in orders if order.customer.name == "customer-1"]
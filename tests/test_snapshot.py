@@ -0,0 +1,108 @@
+import os
+import threading
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.order import Order
+from patterns.database import Database
+from patterns.snapshot import SnapshotStorage, write_snapshot
+from tests.conftest import describe, make_orders
+
+
+pytestmark = pytest.mark.usefixtures("reset_database")
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that every order field survives a snapshot and restore."""
+    path = tmp_path / "orders.snap"
+    orders = make_orders() + [Order(Customer("Nobody"))]
+
+    assert write_snapshot(path, orders) == len(orders)
+    storage = SnapshotStorage(path)
+
+    assert len(storage) == len(orders)
+    assert [describe(order) for order in storage] == [describe(order) for order in orders]
+    assert repr(storage.get(1).line_items[0][0]) == "Dish(name='Pizza', price=150)"
+    storage.close()
+
+
+def test_snapshot_random_access(tmp_path):
+    """Test that single orders are hydrated straight from their records."""
+    path = tmp_path / "orders.snap"
+    orders = make_orders(100)
+    write_snapshot(path, orders)
+    storage = SnapshotStorage(path)
+
+    assert describe(storage.get(57)) == describe(orders[57])
+    assert describe(storage.get(-1)) == describe(orders[-1])
+    with pytest.raises(IndexError):
+        storage.get(100)
+    storage.close()
+
+
+def test_snapshot_accepts_new_orders(tmp_path):
+    """Test that orders added after restore go to the writable tail."""
+    path = tmp_path / "orders.snap"
+    write_snapshot(path, make_orders(3))
+    storage = SnapshotStorage(path)
+    extra = Order(Customer("Late"))
+
+    storage.append(extra)
+
+    assert len(storage) == 4
+    assert storage.get(3) is extra
+    assert list(storage)[-1] is extra
+    storage.close()
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test that a file without the snapshot header is refused."""
+    path = tmp_path / "orders.snap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        SnapshotStorage(path)
+
+
+def test_database_snapshot_while_writing(tmp_path):
+    """Test a background snapshot while another thread keeps adding orders."""
+    path = tmp_path / "orders.snap"
+    db = Database.get_instance()
+    for order in make_orders(500):
+        db.add_order(order)
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            db.add_order(Order(Customer("Concurrent")))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        written = db.snapshot(path).result(timeout=30)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert written >= 500
+    assert not os.path.exists(f"{path}.tmp")
+    restored = SnapshotStorage(path)
+    assert len(restored) == written
+    assert [describe(restored.get(i)) for i in range(500)] == [describe(order) for order in make_orders(500)]
+    restored.close()
+
+
+def test_database_restored_from_snapshot(tmp_path):
+    """Test that a Database opened on a snapshot answers queries and takes writes."""
+    path = tmp_path / "orders.snap"
+    write_snapshot(path, make_orders(12, customers=4))
+
+    db = Database(SnapshotStorage(path))
+    db.add_order(Order(Customer("customer-1")))
+
+    assert len(db.list_orders()) == 13
+    assert [o.customer.name for o in db.iter_orders(order_type=BulkOrder)] == ["customer-0", "customer-3",
+                                                                               "customer-2", "customer-1"]
+    assert len(list(db.iter_orders(customer="customer-1"))) == 4
+    db.close()
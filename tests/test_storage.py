@@ -0,0 +1,144 @@
+import os
+import time
+
+import pytest
+
+from models.bulk_order import BulkOrder
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+from patterns.storage import LogStorage, MemoryStorage, SQLiteStorage
+from tests.conftest import describe, make_orders
+
+
+def test_memory_storage_keeps_order_objects():
+    """Test that the in-memory backend returns the stored objects themselves."""
+    storage = MemoryStorage()
+    orders = make_orders(2)
+    storage.extend(orders)
+    assert list(storage) == orders
+    assert len(storage) == 2
+
+
+def test_log_storage_round_trip(tmp_path):
+    """Test that orders written to the log are read back after reopening it."""
+    path = tmp_path / "orders.log"
+    storage = LogStorage(path)
+    storage.extend(make_orders(2))
+    storage.close()
+
+    reopened = LogStorage(path)
+    assert len(reopened) == 2
+    assert [describe(order) for order in reopened] == [describe(order) for order in make_orders(2)]
+    reopened.close()
+
+
+def test_log_storage_group_commit(tmp_path, monkeypatch):
+    """Test that a group of appends shares a single fsync."""
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(fd) or real_fsync(fd))
+
+    storage = LogStorage(tmp_path / "orders.log", group_size=10)
+    for _ in range(25):
+        storage.append(Order(Customer("Carol")))
+    assert len(fsyncs) == 2
+    assert len(storage) == 25
+
+    storage.close()
+    assert len(fsyncs) == 3
+
+
+def test_log_storage_commits_idle_group_after_interval(tmp_path):
+    """Test that pending orders are committed once the interval passes, without another append."""
+    path = tmp_path / "orders.log"
+    storage = LogStorage(path, group_size=100, commit_interval=0.02)
+    storage.append(Order(Customer("Carol")))
+    deadline = time.monotonic() + 2
+    while os.path.getsize(path) == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert os.path.getsize(path) > 0
+    storage.close()
+
+
+def test_log_storage_recovers_from_truncated_tail(tmp_path):
+    """Test that a partially written last record is dropped on startup."""
+    path = tmp_path / "orders.log"
+    storage = LogStorage(path)
+    storage.extend(make_orders(2))
+    storage.close()
+    with open(path, "ab") as log:
+        log.write(b'{"type":"standard","custo')
+
+    recovered = LogStorage(path)
+    assert len(recovered) == 2
+    recovered.append(Order(Customer("Dave")))
+    recovered.close()
+
+    assert [order.customer.name for order in LogStorage(path)] == ["customer-0", "customer-1", "Dave"]
+
+
+def test_log_storage_rejects_corruption_before_tail(tmp_path):
+    """Test that damage in the middle of the log is not silently discarded."""
+    path = tmp_path / "orders.log"
+    path.write_bytes(b'{"type":"standard","customer":"A","dishes":[]}\nnot json\n'
+                     b'{"type":"standard","customer":"B","dishes":[]}\n')
+    with pytest.raises(ValueError):
+        LogStorage(path)
+
+
+def test_sqlite_storage_round_trip(tmp_path):
+    """Test that the SQLite backend batches inserts and reads orders back."""
+    path = tmp_path / "orders.db"
+    storage = SQLiteStorage(path, batch_size=2)
+    storage.extend(make_orders(2))
+    storage.append(Order(Customer("Eve")))
+    assert len(storage) == 3
+    storage.close()
+
+    reopened = SQLiteStorage(path)
+    orders = list(reopened)
+    assert [describe(order) for order in orders[:2]] == [describe(order) for order in make_orders(2)]
+    assert orders[0].discount_percentage == 10
+    assert orders[2].customer.name == "Eve"
+    reopened.close()
+
+
+def test_database_with_log_storage(tmp_path, reset_database):
+    """Test that the Database keeps its API on top of a durable backend."""
+    path = tmp_path / "orders.log"
+    db = Database(LogStorage(path))
+    assert Database.get_instance() is db
+    for order in make_orders(2):
+        db.add_order(order)
+    db.close()
+
+    Database._instance = None
+    db = Database(LogStorage(path))
+    assert [order.customer.name for order in db.list_orders()] == ["customer-0", "customer-1"]
+    db.close()
+
+
+def test_quantities_survive_round_trip(tmp_path):
+    """Test that line item quantities are stored and restored."""
+    path = tmp_path / "orders.log"
+    order = BulkOrder(Customer("Fay"))
+    order.add_dish(Dish("Sandwich", 5), qty=300)
+    storage = LogStorage(path)
+    storage.append(order)
+    storage.close()
+
+    restored = LogStorage(path).get(0)
+    assert restored.line_items == [(Dish("Sandwich", 5), 300)]
+    assert restored.calculate_total() == 1350
+
+
+def test_records_with_one_entry_per_dish_are_read(tmp_path):
+    """Test that logs written before line items existed are still readable."""
+    path = tmp_path / "orders.log"
+    path.write_bytes(b'{"type":"standard","customer":"Gus","dishes":[["Pizza",150],["Pizza",150]]}\n')
+
+    restored = LogStorage(path).get(0)
+    assert restored.line_items == [(Dish("Pizza", 150), 2)]
@@ -0,0 +1,143 @@
+import pytest
+
+from models.customer import Customer
+from models.dish import Dish
+from models.order import Order
+from patterns.database import Database
+from tests.conftest import describe, make_orders
+from patterns.tiered_storage import LINE_BYTES, ORDER_BYTES, DiskColdTier, TieredStorage
+
+
+def test_evicts_beyond_budget_and_rehydrates():
+    """Test that only `max_hot` orders stay live and evicted ones come back intact."""
+    storage = TieredStorage(max_hot=3)
+    orders = make_orders(10)
+    storage.extend(orders)
+
+    assert storage.stats["hot"] == 3
+    assert storage.stats["cold"] == 7
+    assert storage.evictions == 7
+    assert storage.get(9) is orders[9]
+    restored = storage.get(0)
+    assert restored is not orders[0]
+    assert describe(restored) == describe(orders[0])
+    assert (storage.hits, storage.misses) == (1, 1)
+
+
+def test_byte_budget_bounds_large_orders():
+    """Test that `max_hot_bytes` evicts by estimated size, so large orders take more of the budget."""
+    dishes = [Dish(f"Dish {i}", 10 + i) for i in range(300)]
+    catering = Order(Customer("Caterer"))
+    catering.add_dishes(dishes)
+    small = make_orders(4)
+    budget = sum(ORDER_BYTES + LINE_BYTES * len(order.line_items) for order in small)
+    storage = TieredStorage(max_hot=100, max_hot_bytes=budget)
+    storage.extend(small)
+
+    assert storage.stats["hot"] == 4
+    assert storage.stats["hot_bytes"] == budget
+    storage.append(catering)
+    assert storage.stats["hot"] == 0
+    assert storage.stats["hot_bytes"] == 0
+    assert describe(storage.get(4)) == describe(catering)
+    assert storage.stats["hot"] == 0
+    assert describe(storage.get(1)) == describe(small[1])
+    assert storage.stats["hot_bytes"] == ORDER_BYTES + 2 * LINE_BYTES
+
+
+def test_lru_refreshes_on_lookup():
+    """Test that a looked-up order survives eviction under the LRU policy only."""
+    lru, age = TieredStorage(max_hot=2), TieredStorage(max_hot=2, policy="age")
+    for storage in (lru, age):
+        first, second, third = make_orders(3)
+        storage.extend([first, second])
+        storage.get(0)
+        storage.append(third)
+        assert (storage.get(0) is first) == (storage is lru)
+
+
+def test_max_age_evicts_idle_orders(monkeypatch):
+    """Test that orders older than `max_age` are evicted even under budget."""
+    clock = [100.0]
+    monkeypatch.setattr("patterns.tiered_storage.time.monotonic", lambda: clock[0])
+    storage = TieredStorage(max_hot=10, max_age=60)
+    orders = make_orders(3)
+    storage.extend(orders[:2])
+
+    clock[0] = 200.0
+    storage.append(orders[2])
+
+    assert storage.stats["hot"] == 1
+    assert storage.evictions == 2
+
+
+def test_kept_orders_are_never_evicted():
+    """Test that orders matching `keep` stay live."""
+    orders = make_orders(3)
+    open_order = orders[0]
+    storage = TieredStorage(max_hot=1, keep=lambda order: order is open_order)
+    storage.extend(orders)
+
+    assert storage.get(0) is open_order
+    assert storage.stats["hot"] == 1
+
+
+def test_changes_after_rehydration_are_kept():
+    """Test that a rehydrated order changed after lookup is written back when evicted again."""
+    storage = TieredStorage(max_hot=1)
+    storage.extend(make_orders(2))
+    order = storage.get(0)
+    order.add_dish(Dish("Tea", 3))
+    storage.get(1)
+
+    assert storage.get(0).quantity_of(Dish("Tea", 3)) == 1
+
+
+def test_iteration_does_not_promote():
+    """Test that a full scan rehydrates cold orders without flushing the hot tier."""
+    storage = TieredStorage(max_hot=2)
+    orders = make_orders(6)
+    storage.extend(orders)
+
+    assert [describe(order) for order in storage] == [describe(order) for order in orders]
+    assert storage.get(5) is orders[5]
+    assert storage.evictions == 4
+
+
+def test_disk_cold_tier(tmp_path):
+    """Test evicting to and rehydrating from a scratch file on disk."""
+    path = tmp_path / "cold.bin"
+    storage = TieredStorage(max_hot=1, cold=str(path))
+    orders = make_orders(4)
+    storage.extend(orders)
+
+    assert isinstance(storage.cold, DiskColdTier)
+    assert path.exists() and storage.stats["cold_bytes"] > 0
+    assert [describe(storage.get(i)) for i in range(4)] == [describe(order) for order in orders]
+    storage.close()
+    assert not path.exists()
+
+
+def test_invalid_settings():
+    """Test that unknown policies and negative budgets are rejected."""
+    with pytest.raises(ValueError):
+        TieredStorage(policy="random")
+    with pytest.raises(ValueError):
+        TieredStorage(max_hot=-1)
+    with pytest.raises(ValueError):
+        TieredStorage(max_hot_bytes=-1)
+    with pytest.raises(IndexError):
+        TieredStorage().get(0)
+
+
+def test_database_with_memory_budget(reset_database):
+    """Test queries and listing on a Database whose storage keeps few orders live."""
+    db = Database(TieredStorage(max_hot=5), merge_threshold=1)
+    orders = make_orders(30)
+    for order in orders:
+        db.add_order(order)
+
+    assert [describe(order) for order in db.list_orders()] == [describe(order) for order in orders]
+    matches = list(db.iter_orders(customer="customer-4"))
+    assert [describe(order) for order in matches] == [describe(orders[4])]
+    assert db.storage.stats["hot"] == 5